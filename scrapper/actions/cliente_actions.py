@@ -5,6 +5,24 @@
 import random
 from typing import TypedDict
 
+from core.endpoints import (
+    CLIENTES_ACTUALIZAR,
+    CLIENTES_ELIMINAR,
+    CLIENTES_GUARDAR,
+    CLIENTES_TODOS,
+)
+from core.esperas import (
+    accion_con_respuesta,
+    esperar_angular_estable,
+    esperar_control_valido,
+    esperar_swal_cerrado,
+    respuesta_api,
+)
+from core.metricas import instrumentar_modulo
+from core.selectores import localizar
+from core.tablas import hay_fila, leer_tabla
+from core.vitales import medir_ruta
+
 
 class Cliente(TypedDict):
     cedula: str
@@ -17,16 +35,17 @@ class Cliente(TypedDict):
 # Navegación
 # ------------------------------------------------------------
 def navegar_a_clientes(page):
-    page.click("a.sidebar-link[routerlink='/app/cliente']")
-    page.wait_for_url("**/app/cliente", timeout=60000)
-    page.wait_for_selector("app-cliente", timeout=60000)
+    with medir_ruta(page, "/app/cliente"):
+        page.click("a.sidebar-link[routerlink='/app/cliente']")
+        page.wait_for_url("**/app/cliente", timeout=60000)
+        page.wait_for_selector("app-cliente", timeout=60000)
 
 
 def refrescar_modulo_clientes(page):
     page.click("a.sidebar-link[routerlink='/app/cliente']")
     page.wait_for_url("**/app/cliente", timeout=60000)
     page.wait_for_selector("input#buscar", timeout=60000)
-    page.wait_for_timeout(500)
+    esperar_angular_estable(page)
 
 
 # ------------------------------------------------------------
@@ -45,6 +64,41 @@ def generar_datos_cliente() -> Cliente:
 # ------------------------------------------------------------
 # Escritura
 # ------------------------------------------------------------
+# angular escucha input/change/blur para actualizar el control y marcarlo como touched
+_JS_EVENTOS_FORMULARIO = """
+el => {
+    for (const tipo of ['input', 'change', 'blur']) {
+        el.dispatchEvent(new Event(tipo, { bubbles: true }));
+    }
+}
+"""
+
+
+def escribir_rapido(page, selector: str, texto: str) -> bool:
+    """
+    Escribe el valor de una vez (fill), dispara los eventos de angular en un único evaluate
+    y espera a que el control termine de validarse. Retorna si el control quedó válido.
+    """
+    loc = page.locator(selector).first
+    loc.fill(texto)
+    loc.evaluate(_JS_EVENTOS_FORMULARIO)
+    return esperar_control_valido(page, loc)
+
+
+def escribir_campo(page, selector: str, texto: str, lento: bool = False) -> bool:
+    """
+    Escribe en un campo del formulario; lento=True simula tecla por tecla.
+    Retorna si el control quedó válido y avisa si no (el guardado posterior fallaría).
+    """
+    if lento:
+        escribir_lento(page, selector, texto)
+        return True
+    valido = escribir_rapido(page, selector, texto)
+    if not valido:
+        print(f"⚠ El campo {selector} quedó inválido con el valor {texto!r}")
+    return valido
+
+
 def escribir_lento(page, selector: str, texto: str, delay: float = 0.05):
     loc = page.locator(selector).first
     loc.wait_for(state="visible", timeout=5000)
@@ -55,18 +109,15 @@ def escribir_lento(page, selector: str, texto: str, delay: float = 0.05):
 
     loc.type(texto, delay=delay)
 
-    loc.evaluate("el => el.dispatchEvent(new Event('input', { bubbles: true }))")
-    loc.evaluate("el => el.dispatchEvent(new Event('change', { bubbles: true }))")
-    loc.evaluate("el => el.dispatchEvent(new Event('blur', { bubbles: true }))")
+    loc.evaluate(_JS_EVENTOS_FORMULARIO)
 
-    page.wait_for_timeout(150)
+    esperar_angular_estable(page)
 
 
 def escribir_en_busqueda(page, texto: str, delay: float = 0.05):
     page.click("input#buscar")
     page.fill("input#buscar", "")
     page.type("input#buscar", texto, delay=delay)
-    page.wait_for_timeout(300)
 
 
 # ------------------------------------------------------------
@@ -77,21 +128,28 @@ def abrir_formulario_nuevo_cliente(page):
     page.wait_for_url("**/app/cliente/nuevo", timeout=60000)
 
 
-def llenar_formulario_cliente(page, cliente: Cliente):
-    escribir_lento(page, "input[formcontrolname='cedula']", cliente["cedula"])
-    escribir_lento(page, "input[formcontrolname='nombre']", cliente["nombre"])
-    escribir_lento(page, "input[formcontrolname='direccion']", cliente["direccion"])
-    escribir_lento(page, "input[formcontrolname='correo']", cliente["correo"])
+def llenar_formulario_cliente(page, cliente: Cliente, lento: bool = False):
+    escribir_campo(page, "input[formcontrolname='cedula']", cliente["cedula"], lento)
+    escribir_campo(page, "input[formcontrolname='nombre']", cliente["nombre"], lento)
+    escribir_campo(page, "input[formcontrolname='direccion']", cliente["direccion"], lento)
+    escribir_campo(page, "input[formcontrolname='correo']", cliente["correo"], lento)
 
 
 def guardar_cliente(page, es_edicion=False):
-    page.click("button#azul")
+    """Guarda el formulario y retorna el cuerpo de la respuesta del backend."""
+    if es_edicion:
+        endpoint, metodo = CLIENTES_ACTUALIZAR, "PUT"
+    else:
+        endpoint, metodo = CLIENTES_GUARDAR, "POST"
+
+    # la escritura termina cuando el backend responde, no cuando aparece el SweetAlert
+    cuerpo = accion_con_respuesta(page, endpoint, lambda: page.click("button#azul"), metodo)
 
-    # SWEET ALERT
+    # SWEET ALERT (mensaje de éxito)
     try:
         page.wait_for_selector(".swal2-confirm", timeout=5000)
         page.click(".swal2-confirm")
-        page.wait_for_timeout(400)
+        esperar_swal_cerrado(page)
     except Exception:
         pass
 
@@ -101,18 +159,20 @@ def guardar_cliente(page, es_edicion=False):
             close_btn = page.locator("button.btn-close").first
             close_btn.wait_for(state="visible", timeout=3000)
             close_btn.click()
-            page.wait_for_timeout(600)
+            page.wait_for_selector("#editarClienteModal", state="hidden", timeout=5000)
         except Exception:
             print("⚠ No se encontró botón cerrar del modal, continuando.")
 
+    return cuerpo
+
 
-def crear_cliente(page, cliente=None):
+def crear_cliente(page, cliente=None, lento: bool = False):
     if cliente is None:
         cliente = generar_datos_cliente()
 
     navegar_a_clientes(page)
     abrir_formulario_nuevo_cliente(page)
-    llenar_formulario_cliente(page, cliente)
+    llenar_formulario_cliente(page, cliente, lento)
     guardar_cliente(page, es_edicion=False)
     refrescar_modulo_clientes(page)
 
@@ -123,101 +183,95 @@ def crear_cliente(page, cliente=None):
 # Buscar cliente
 # ------------------------------------------------------------
 def buscar_cliente(page, cedula: str):
-    escribir_en_busqueda(page, cedula, delay=0.06)
-    page.wait_for_timeout(800)
+    # cada tecla dispara una búsqueda contra /clientes/todos; basta con la primera respuesta
+    # y luego esperar a que angular termine las pendientes y pinte la tabla
+    try:
+        with respuesta_api(page, CLIENTES_TODOS, "GET"):
+            escribir_en_busqueda(page, cedula, delay=0.06)
+    except Exception:
+        pass
+    esperar_angular_estable(page)
 
 
 def validar_cliente_existe(page, cliente: Cliente) -> bool:
     buscar_cliente(page, cliente["cedula"])
-    loc = page.locator(f"text={cliente['nombre']}").first
-    try:
-        loc.wait_for(state="visible", timeout=3000)
-        return True
-    except:
-        return False
+    # la búsqueda ya terminó: la tabla se lee una vez y se revisa en memoria
+    return hay_fila(leer_tabla(page, "cliente"), cedula=cliente["cedula"], nombre=cliente["nombre"])
 
 # ------------------------------------------------------------
 # Validar que el cliente NO existe (para pruebas de eliminación)
 # ------------------------------------------------------------
 def validar_cliente_no_existe(page, cliente: Cliente) -> bool:
     buscar_cliente(page, cliente["cedula"])
-    page.wait_for_timeout(800)
 
-    # Buscar cualquier fila con la cédula del cliente
-    fila = page.locator(f"tr:has-text('{cliente['cedula']}')").first
-
-    try:
-        fila.wait_for(state="visible", timeout=2000)
-        # Si se ve → todavía existe → error
-        return False
-    except:
-        # Si NO aparece → fue eliminado
-        return True
+    # la búsqueda ya terminó: si ninguna fila tiene la cédula → fue eliminado
+    return not hay_fila(leer_tabla(page, "cliente"), cedula=cliente["cedula"])
 
 # ------------------------------------------------------------
 # Eliminar cliente
 # ------------------------------------------------------------
-def confirmar_eliminacion(page):
-    try:
-        # Espera a que aparezca el SweetAlert
-        page.wait_for_selector(".swal2-popup", timeout=5000)
+def esperar_dialogo_eliminacion(page):
+    """Espera el SweetAlert que pide confirmar la eliminación; lanza si no aparece."""
+    page.wait_for_selector(".swal2-popup", timeout=5000)
+    page.wait_for_selector(".swal2-confirm", timeout=5000, state="visible")
 
-        # Click en confirmar
-        page.click(".swal2-confirm")
 
-        # ⚠ SweetAlert desaparece RAPIDÍSIMO. Mejor usar try-catch suave.
-        try:
-            page.wait_for_selector(".swal2-popup", state="hidden", timeout=2000)
-        except:
-            pass  # Si no lo detecta ocultándose, no importa, continúa.
+def confirmar_eliminacion(page):
+    """Confirma el SweetAlert de eliminación (ya abierto, ver esperar_dialogo_eliminacion)."""
+    page.click(".swal2-confirm")
+
+# Cerrar cualquier modal visible con las clases de bootstrap
+_JS_CERRAR_MODALES = """
+    () => {
+        document.querySelectorAll('.modal.show').forEach(m => {
+            m.classList.remove('show');
+            m.setAttribute('aria-hidden', 'true');
+            m.style.display = 'none';
+        });
+
+        // Eliminar backdrop de bootstrap
+        document.querySelectorAll('.modal-backdrop').forEach(b => b.remove());
+    }
+"""
 
-        page.wait_for_timeout(300)
-    except Exception as e:
-        print(f"⚠ Error confirmando eliminación: {e}")
 
 def forzar_cierre_de_modales(page):
     try:
-        # Cerrar cualquier modal visible con las clases de bootstrap
-        page.evaluate("""
-            () => {
-                document.querySelectorAll('.modal.show').forEach(m => {
-                    m.classList.remove('show');
-                    m.setAttribute('aria-hidden', 'true');
-                    m.style.display = 'none';
-                });
-
-                // Eliminar backdrop de bootstrap
-                document.querySelectorAll('.modal-backdrop').forEach(b => b.remove());
-            }
-        """)
-        page.wait_for_timeout(400)
+        page.evaluate(_JS_CERRAR_MODALES)
     except Exception as e:
         print(f"⚠ No se pudieron cerrar modales: {e}")
 
 
 def eliminar_cliente(page, cliente: Cliente):
+    """
+    Elimina el cliente y retorna el cuerpo de la respuesta del backend.
+    Lanza si no aparece el botón o el diálogo de confirmación, o si el backend responde con error.
+    """
     navegar_a_clientes(page)
 
     # 🔥 CERRAR CUALQUIER MODAL ABIERTO QUE SE HAYA QUEDADO COLGADO
     forzar_cierre_de_modales(page)
 
     buscar_cliente(page, cliente["cedula"])
-    page.wait_for_timeout(600)
 
-    try:
-        btn = page.locator("td.eliminar button:has-text('❌')").first
-        btn.wait_for(state="visible", timeout=5000)
-        btn.evaluate("b => b.click()")
-    except Exception as e:
-        print(f"⚠ Error al hacer click en eliminar: {e}")
+    btn = page.locator("td.eliminar button:has-text('❌')").first
+    btn.wait_for(state="visible", timeout=5000)
+    btn.evaluate("b => b.click()")
+
+    # el diálogo se espera antes de armar la espera de la respuesta: si falta, se falla enseguida
+    esperar_dialogo_eliminacion(page)
+    cuerpo = accion_con_respuesta(page, CLIENTES_ELIMINAR, lambda: confirmar_eliminacion(page), "DELETE")
 
-    confirmar_eliminacion(page)
+    # ⚠ SweetAlert desaparece RAPIDÍSIMO. Si no lo detecta ocultándose, no importa, continúa.
+    esperar_swal_cerrado(page, timeout=2000)
+    esperar_angular_estable(page)
 
     #NUEVAMENTE, por si SweetAlert dejó algo
     forzar_cierre_de_modales(page)
 
     refrescar_modulo_clientes(page)
 
+    return cuerpo
 
 
 # ------------------------------------------------------------
@@ -226,29 +280,25 @@ def eliminar_cliente(page, cliente: Cliente):
 def abrir_edicion_cliente(page, nombre: str):
     row = page.locator(f"tr:has-text('{nombre}')").first
 
-    try:
-        row.locator("button.editar, button:has-text('✏️'), button:has-text('Editar')").first.click()
-    except:
-        row.locator("button:has-text('✏️'), button:has-text('Editar')").first.click()
+    localizar(row, "cliente", "editar_fila").click()
 
     page.wait_for_selector("input[formcontrolname='nombre']", timeout=60000)
-    page.wait_for_timeout(500)
+    esperar_angular_estable(page)
+
+
+_JS_CEDULA_CARGADA = """
+(cedula) => {
+    const el = document.querySelector("input[formcontrolname='cedula']");
+    return el && el.value === cedula;
+}
+"""
 
 
 def esperar_patch_value(page, cliente):
-    page.wait_for_function(
-        """
-        (cedula) => {
-            const el = document.querySelector("input[formcontrolname='cedula']");
-            return el && el.value === cedula;
-        }
-        """,
-        arg=cliente["cedula"],
-        timeout=5000
-    )
+    page.wait_for_function(_JS_CEDULA_CARGADA, arg=cliente["cedula"], timeout=5000)
 
 
-def editar_cliente(page, cliente_original: Cliente, nuevos_datos=None) -> Cliente:
+def editar_cliente(page, cliente_original: Cliente, nuevos_datos=None, lento: bool = False) -> Cliente:
     if nuevos_datos is None:
         r = random.randint(100000, 999999)
         nuevos_datos = {
@@ -267,13 +317,13 @@ def editar_cliente(page, cliente_original: Cliente, nuevos_datos=None) -> Client
     esperar_patch_value(page, cliente_original)
 
     if "nombre" in nuevos_datos:
-        escribir_lento(page, "input[formcontrolname='nombre']", nuevos_datos["nombre"])
+        escribir_campo(page, "input[formcontrolname='nombre']", nuevos_datos["nombre"], lento)
 
     if "direccion" in nuevos_datos:
-        escribir_lento(page, "input[formcontrolname='direccion']", nuevos_datos["direccion"])
+        escribir_campo(page, "input[formcontrolname='direccion']", nuevos_datos["direccion"], lento)
 
     if "correo" in nuevos_datos:
-        escribir_lento(page, "input[formcontrolname='correo']", nuevos_datos["correo"])
+        escribir_campo(page, "input[formcontrolname='correo']", nuevos_datos["correo"], lento)
 
     guardar_cliente(page, es_edicion=True)  # 👈 AQUÍ SE CIERRA EL MODAL
     refrescar_modulo_clientes(page)
@@ -282,3 +332,6 @@ def editar_cliente(page, cliente_original: Cliente, nuevos_datos=None) -> Client
     cliente_editado.update(nuevos_datos)
 
     return cliente_editado
+
+
+instrumentar_modulo(__name__)
@@ -0,0 +1,262 @@
+# ============================================================
+# ACCIONES – CLIENTE (VARIANTE ASYNCIO)
+# Mismo flujo que cliente_actions sobre playwright.async_api
+# ============================================================
+
+import random
+
+from actions.cliente_actions import (
+    _JS_CEDULA_CARGADA,
+    _JS_CERRAR_MODALES,
+    _JS_EVENTOS_FORMULARIO,
+    Cliente,
+    generar_datos_cliente,
+)
+from core.endpoints import (
+    CLIENTES_ACTUALIZAR,
+    CLIENTES_ELIMINAR,
+    CLIENTES_GUARDAR,
+    CLIENTES_TODOS,
+)
+from core.esperas_async import (
+    accion_con_respuesta,
+    esperar_angular_estable,
+    esperar_control_valido,
+    esperar_swal_cerrado,
+    respuesta_api,
+)
+from core.metricas import instrumentar_modulo
+from core.selectores_async import localizar
+from core.tablas_async import hay_fila, leer_tabla
+from core.vitales_async import medir_ruta
+
+__all__ = ["Cliente", "generar_datos_cliente"]
+
+
+# ------------------------------------------------------------
+# Navegación
+# ------------------------------------------------------------
+async def navegar_a_clientes(page):
+    async with medir_ruta(page, "/app/cliente"):
+        await page.click("a.sidebar-link[routerlink='/app/cliente']")
+        await page.wait_for_url("**/app/cliente", timeout=60000)
+        await page.wait_for_selector("app-cliente", timeout=60000)
+
+
+async def refrescar_modulo_clientes(page):
+    await page.click("a.sidebar-link[routerlink='/app/cliente']")
+    await page.wait_for_url("**/app/cliente", timeout=60000)
+    await page.wait_for_selector("input#buscar", timeout=60000)
+    await esperar_angular_estable(page)
+
+
+# ------------------------------------------------------------
+# Escritura
+# ------------------------------------------------------------
+async def escribir_rapido(page, selector: str, texto: str) -> bool:
+    loc = page.locator(selector).first
+    await loc.fill(texto)
+    await loc.evaluate(_JS_EVENTOS_FORMULARIO)
+    return await esperar_control_valido(page, loc)
+
+
+async def escribir_lento(page, selector: str, texto: str, delay: float = 0.05):
+    loc = page.locator(selector).first
+    await loc.wait_for(state="visible", timeout=5000)
+
+    await loc.click()
+    await loc.press("Control+A")
+    await loc.press("Backspace")
+
+    await loc.type(texto, delay=delay)
+
+    await loc.evaluate(_JS_EVENTOS_FORMULARIO)
+
+    await esperar_angular_estable(page)
+
+
+async def escribir_campo(page, selector: str, texto: str, lento: bool = False) -> bool:
+    if lento:
+        await escribir_lento(page, selector, texto)
+        return True
+    valido = await escribir_rapido(page, selector, texto)
+    if not valido:
+        print(f"⚠ El campo {selector} quedó inválido con el valor {texto!r}")
+    return valido
+
+
+async def escribir_en_busqueda(page, texto: str, delay: float = 0.05):
+    await page.click("input#buscar")
+    await page.fill("input#buscar", "")
+    await page.type("input#buscar", texto, delay=delay)
+
+
+# ------------------------------------------------------------
+# Crear cliente
+# ------------------------------------------------------------
+async def abrir_formulario_nuevo_cliente(page):
+    await page.click("button#nuevo")
+    await page.wait_for_url("**/app/cliente/nuevo", timeout=60000)
+
+
+async def llenar_formulario_cliente(page, cliente: Cliente, lento: bool = False):
+    await escribir_campo(page, "input[formcontrolname='cedula']", cliente["cedula"], lento)
+    await escribir_campo(page, "input[formcontrolname='nombre']", cliente["nombre"], lento)
+    await escribir_campo(page, "input[formcontrolname='direccion']", cliente["direccion"], lento)
+    await escribir_campo(page, "input[formcontrolname='correo']", cliente["correo"], lento)
+
+
+async def guardar_cliente(page, es_edicion=False):
+    """Guarda el formulario y retorna el cuerpo de la respuesta del backend."""
+    if es_edicion:
+        endpoint, metodo = CLIENTES_ACTUALIZAR, "PUT"
+    else:
+        endpoint, metodo = CLIENTES_GUARDAR, "POST"
+
+    cuerpo = await accion_con_respuesta(page, endpoint, lambda: page.click("button#azul"), metodo)
+
+    # SWEET ALERT (mensaje de éxito)
+    try:
+        await page.wait_for_selector(".swal2-confirm", timeout=5000)
+        await page.click(".swal2-confirm")
+        await esperar_swal_cerrado(page)
+    except Exception:
+        pass
+
+    if es_edicion:
+        try:
+            close_btn = page.locator("button.btn-close").first
+            await close_btn.wait_for(state="visible", timeout=3000)
+            await close_btn.click()
+            await page.wait_for_selector("#editarClienteModal", state="hidden", timeout=5000)
+        except Exception:
+            print("⚠ No se encontró botón cerrar del modal, continuando.")
+
+    return cuerpo
+
+
+async def crear_cliente(page, cliente=None, lento: bool = False):
+    if cliente is None:
+        cliente = generar_datos_cliente()
+
+    await navegar_a_clientes(page)
+    await abrir_formulario_nuevo_cliente(page)
+    await llenar_formulario_cliente(page, cliente, lento)
+    await guardar_cliente(page, es_edicion=False)
+    await refrescar_modulo_clientes(page)
+
+    return cliente
+
+
+# ------------------------------------------------------------
+# Buscar cliente
+# ------------------------------------------------------------
+async def buscar_cliente(page, cedula: str):
+    try:
+        async with respuesta_api(page, CLIENTES_TODOS, "GET"):
+            await escribir_en_busqueda(page, cedula, delay=0.06)
+    except Exception:
+        pass
+    await esperar_angular_estable(page)
+
+
+async def validar_cliente_existe(page, cliente: Cliente) -> bool:
+    await buscar_cliente(page, cliente["cedula"])
+    return hay_fila(await leer_tabla(page, "cliente"), cedula=cliente["cedula"], nombre=cliente["nombre"])
+
+
+async def validar_cliente_no_existe(page, cliente: Cliente) -> bool:
+    await buscar_cliente(page, cliente["cedula"])
+    return not hay_fila(await leer_tabla(page, "cliente"), cedula=cliente["cedula"])
+
+
+# ------------------------------------------------------------
+# Eliminar cliente
+# ------------------------------------------------------------
+async def esperar_dialogo_eliminacion(page):
+    await page.wait_for_selector(".swal2-popup", timeout=5000)
+    await page.wait_for_selector(".swal2-confirm", timeout=5000, state="visible")
+
+
+async def confirmar_eliminacion(page):
+    await page.click(".swal2-confirm")
+
+
+async def forzar_cierre_de_modales(page):
+    try:
+        await page.evaluate(_JS_CERRAR_MODALES)
+    except Exception as e:
+        print(f"⚠ No se pudieron cerrar modales: {e}")
+
+
+async def eliminar_cliente(page, cliente: Cliente):
+    """Elimina el cliente y retorna el cuerpo de la respuesta del backend; lanza si algo falla."""
+    await navegar_a_clientes(page)
+    await forzar_cierre_de_modales(page)
+    await buscar_cliente(page, cliente["cedula"])
+
+    btn = page.locator("td.eliminar button:has-text('❌')").first
+    await btn.wait_for(state="visible", timeout=5000)
+    await btn.evaluate("b => b.click()")
+
+    await esperar_dialogo_eliminacion(page)
+    cuerpo = await accion_con_respuesta(
+        page, CLIENTES_ELIMINAR, lambda: confirmar_eliminacion(page), "DELETE"
+    )
+    await esperar_swal_cerrado(page, timeout=2000)
+    await esperar_angular_estable(page)
+
+    await forzar_cierre_de_modales(page)
+    await refrescar_modulo_clientes(page)
+
+    return cuerpo
+
+
+# ------------------------------------------------------------
+# EDITAR CLIENTE
+# ------------------------------------------------------------
+async def abrir_edicion_cliente(page, nombre: str):
+    row = page.locator(f"tr:has-text('{nombre}')").first
+
+    await (await localizar(row, "cliente", "editar_fila")).click()
+
+    await page.wait_for_selector("input[formcontrolname='nombre']", timeout=60000)
+    await esperar_angular_estable(page)
+
+
+async def esperar_patch_value(page, cliente):
+    await page.wait_for_function(_JS_CEDULA_CARGADA, arg=cliente["cedula"], timeout=5000)
+
+
+async def editar_cliente(page, cliente_original: Cliente, nuevos_datos=None, lento: bool = False) -> Cliente:
+    if nuevos_datos is None:
+        r = random.randint(100000, 999999)
+        nuevos_datos = {
+            "nombre": f"Cliente EDIT {r}",
+            "direccion": f"Avenida {r}",
+        }
+
+    # SOLO TEXTO EN NOMBRE
+    if "nombre" in nuevos_datos:
+        nuevos_datos["nombre"] = "".join(c for c in nuevos_datos["nombre"] if c.isalpha() or c == " ")
+
+    await navegar_a_clientes(page)
+    await buscar_cliente(page, cliente_original["cedula"])
+    await abrir_edicion_cliente(page, cliente_original["nombre"])
+
+    await esperar_patch_value(page, cliente_original)
+
+    for campo in ("nombre", "direccion", "correo"):
+        if campo in nuevos_datos:
+            await escribir_campo(page, f"input[formcontrolname='{campo}']", nuevos_datos[campo], lento)
+
+    await guardar_cliente(page, es_edicion=True)
+    await refrescar_modulo_clientes(page)
+
+    cliente_editado = cliente_original.copy()
+    cliente_editado.update(nuevos_datos)
+
+    return cliente_editado
+
+
+instrumentar_modulo(__name__)
@@ -0,0 +1,214 @@
+"""
+Fábrica de datos de prueba en lote.
+Genera N clientes, productos y ventas, los crea por API con peticiones concurrentes
+y deja registro de todo lo creado para poder borrarlo en bloque al final.
+"""
+
+import json
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from actions.cliente_actions import Cliente, generar_datos_cliente
+from actions.producto_actions import Producto, generar_datos_producto
+from actions.seed_actions import (
+    borrar_cliente,
+    borrar_producto,
+    cancelar_venta,
+    impuesto_por_defecto,
+    sembrar_cliente,
+    sembrar_producto,
+    sembrar_venta,
+)
+from core.api import ApiBackend
+from core.ejecucion import run_id
+from core.metricas import instrumentar_modulo
+
+# Registros de lo creado, uno por ejecución y proceso: los workers de run_tests no comparten
+# archivo y limpiar() solo toca lo propio. Sobreviven a una ejecución interrumpida para
+# poder limpiarla después con `python fixtures.py limpiar` (todos los registros de .fixtures/).
+DIR_REGISTROS = Path(__file__).resolve().parent.parent / ".fixtures"
+HILOS_DEFAULT = 8
+
+_FALLO = object()
+
+
+def ruta_registro() -> Path:
+    """Registro de la ejecución actual en este proceso."""
+    return DIR_REGISTROS / f"registro-{run_id()}-{os.getpid()}.jsonl"
+
+
+def registros_guardados() -> List[Path]:
+    """Registros de todas las ejecuciones y procesos que dejaron datos sin borrar."""
+    # registro.jsonl es el archivo compartido de versiones anteriores
+    return sorted(DIR_REGISTROS.glob("registro*.jsonl"))
+
+
+class FabricaDatos:
+    """
+    Crea datos de prueba en lote y los elimina al terminar.
+    Puede usarse como context manager:
+
+        with FabricaDatos() as fabrica:
+            clientes = fabrica.crear_clientes(1000)
+    """
+
+    def __init__(self, api: ApiBackend = None, hilos: int = HILOS_DEFAULT, registro: Path = None):
+        self.hilos = hilos
+        self.api = api or ApiBackend(pool=hilos)
+        self.registro = Path(registro) if registro else ruta_registro()
+        self._lock = threading.Lock()
+        self._impuesto = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.limpiar()
+        self.api.close()
+
+    # ---------------------------------------------------------------
+    # Generación
+    # ---------------------------------------------------------------
+    @staticmethod
+    def generar_clientes(n: int) -> List[Cliente]:
+        """Genera n clientes con cédulas distintas entre sí."""
+        clientes: Dict[str, Cliente] = {}
+        while len(clientes) < n:
+            cliente = generar_datos_cliente()
+            clientes[cliente["cedula"]] = cliente
+        return list(clientes.values())
+
+    @staticmethod
+    def generar_productos(n: int) -> List[Producto]:
+        """
+        Genera n productos con códigos distintos entre sí.
+        El código aleatorio de generar_datos_producto choca con facilidad en lotes grandes,
+        así que se reemplaza por un prefijo del lote más un consecutivo.
+        """
+        lote = random.randint(1000, 9999)
+        productos = []
+        for i in range(n):
+            producto = generar_datos_producto()
+            producto["codigo"] = f"QF{lote}{i:06d}"
+            producto["nombre"] = f"Producto QA AUT {producto['codigo']}"
+            productos.append(producto)
+        return productos
+
+    # ---------------------------------------------------------------
+    # Creación concurrente
+    # ---------------------------------------------------------------
+    def _registrar(self, tipo: str, datos) -> None:
+        with self._lock:
+            self.registro.parent.mkdir(parents=True, exist_ok=True)
+            with self.registro.open("a", encoding="utf-8") as f:
+                f.write(json.dumps({"tipo": tipo, "datos": datos}) + "\n")
+
+    def _en_paralelo(self, funcion, elementos) -> list:
+        """Aplica la función a cada elemento con el pool de hilos; descarta (y reporta) los fallos."""
+        def _seguro(elemento):
+            try:
+                return funcion(elemento)
+            except Exception as e:
+                print(f"⚠ {funcion.__name__} falló: {e}")
+                return _FALLO
+
+        with ThreadPoolExecutor(max_workers=self.hilos) as pool:
+            return [r for r in pool.map(_seguro, elementos) if r is not _FALLO]
+
+    def _crear_cliente(self, cliente: Cliente) -> Cliente:
+        sembrar_cliente(self.api, cliente)
+        self._registrar("cliente", cliente)
+        return cliente
+
+    def _crear_producto(self, producto: Producto) -> Producto:
+        sembrar_producto(self.api, producto, impuesto=self._impuesto)
+        self._registrar("producto", producto)
+        return producto
+
+    def _crear_venta(self, par) -> Optional[int]:
+        cliente, producto = par
+        id_venta = sembrar_venta(self.api, cliente, producto)
+        # Sin ID no se puede cancelar después; se cuenta como creada pero no queda registrada
+        if id_venta is not None:
+            self._registrar("venta", id_venta)
+        return id_venta
+
+    def registrar_venta(self, id_venta: int) -> None:
+        """Registra una venta creada por fuera de la fábrica (p. ej. por la UI) para cancelarla en limpiar()."""
+        self._registrar("venta", id_venta)
+
+    def crear_clientes(self, n: int) -> List[Cliente]:
+        return self._en_paralelo(self._crear_cliente, self.generar_clientes(n))
+
+    def crear_productos(self, n: int) -> List[Producto]:
+        if self._impuesto is None:
+            self._impuesto = impuesto_por_defecto(self.api)
+        return self._en_paralelo(self._crear_producto, self.generar_productos(n))
+
+    def crear_ventas(self, n: int, clientes: List[Cliente], productos: List[Producto]) -> List[Optional[int]]:
+        """
+        Crea n ventas de una unidad repartidas entre los clientes y productos dados.
+        Retorna los IDs de las ventas creadas (None si el backend no devolvió uno).
+        """
+        if not clientes or not productos:
+            raise ValueError("Se necesitan clientes y productos para crear ventas")
+        pares = [(clientes[i % len(clientes)], productos[i % len(productos)]) for i in range(n)]
+        return self._en_paralelo(self._crear_venta, pares)
+
+    # ---------------------------------------------------------------
+    # Limpieza
+    # ---------------------------------------------------------------
+    def _leer_registro(self) -> List[dict]:
+        if not self.registro.exists():
+            return []
+        with self.registro.open(encoding="utf-8") as f:
+            return [json.loads(linea) for linea in f if linea.strip()]
+
+    def _borrar(self, entrada: dict):
+        tipo, datos = entrada["tipo"], entrada["datos"]
+        try:
+            if tipo == "venta":
+                cancelar_venta(self.api, datos)
+            elif tipo == "producto":
+                borrar_producto(self.api, datos)
+            elif tipo == "cliente":
+                borrar_cliente(self.api, datos)
+            return None
+        except Exception as e:
+            print(f"⚠ No se pudo borrar {tipo} {datos}: {e}")
+            return entrada
+
+    def limpiar(self) -> int:
+        """
+        Borra lo registrado por esta fábrica (su archivo de registro; no toca el de otras
+        ejecuciones ni el de otros workers). Las ventas se cancelan antes de borrar productos
+        y clientes. Lo que no se pudo borrar queda en el registro. Retorna la cantidad borrada.
+        """
+        with self._lock:
+            pendientes = self._leer_registro()
+        fallidos = []
+        for tipo in ("venta", "producto", "cliente"):
+            del_tipo = [e for e in pendientes if e["tipo"] == tipo]
+            with ThreadPoolExecutor(max_workers=self.hilos) as pool:
+                fallidos.extend(r for r in pool.map(self._borrar, del_tipo) if r is not None)
+
+        with self._lock:
+            # Lo registrado mientras se limpiaba (otro hilo de este proceso) se conserva
+            restantes = fallidos + self._leer_registro()[len(pendientes):]
+            if restantes:
+                self.registro.write_text(
+                    "".join(json.dumps(e) + "\n" for e in restantes), encoding="utf-8"
+                )
+            elif self.registro.exists():
+                self.registro.unlink()
+        return len(pendientes) - len(fallidos)
+
+
+instrumentar_modulo(__name__, pasos=[
+    "FabricaDatos.crear_clientes", "FabricaDatos.crear_productos",
+    "FabricaDatos.crear_ventas", "FabricaDatos.limpiar",
+])
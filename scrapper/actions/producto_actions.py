@@ -7,6 +7,27 @@ from datetime import datetime, timedelta
 import random
 from typing import TypedDict
 
+from core.endpoints import (
+    PRODUCTOS_ACTUALIZAR,
+    PRODUCTOS_ELIMINAR,
+    PRODUCTOS_GUARDAR,
+    PRODUCTOS_TODOS,
+)
+from core.esperas import (
+    accion_con_respuesta,
+    contar_elementos,
+    esperar_angular_estable,
+    esperar_cambio_conteo,
+    esperar_fila,
+    esperar_swal_cerrado,
+    primero_de,
+    respuesta_api,
+)
+from core.metricas import instrumentar_modulo
+from core.selectores import localizar
+from core.tablas import hay_fila, leer_tabla
+from core.vitales import medir_ruta
+
 
 class Producto(TypedDict):
     """Estructura de datos para un producto."""
@@ -21,18 +42,19 @@ class Producto(TypedDict):
 # -------------------------------------------------------------------
 def navegar_a_productos(page) -> None:
     """Navega al módulo de productos desde cualquier pantalla."""
-    page.click("a.sidebar-link[routerlink='/app/producto']")
-    page.wait_for_url("**/app/producto", timeout=60000)
-    page.wait_for_selector("app-producto")
+    with medir_ruta(page, "/app/producto"):
+        page.click("a.sidebar-link[routerlink='/app/producto']")
+        page.wait_for_url("**/app/producto", timeout=60000)
+        page.wait_for_selector("app-producto")
 
 
 def refrescar_modulo_productos(page) -> None:
     """Recarga el módulo Angular para actualizar la tabla."""
     page.click("a.sidebar-link[routerlink='/app/producto']")
     page.wait_for_url("**/app/producto", timeout=60000)
-    # Esperar el campo de escaneo/búsqueda y dar un poco más de tiempo para que la tabla se actualice
+    # Esperar el campo de escaneo/búsqueda y a que la tabla termine de cargarse
     page.wait_for_selector("input[placeholder*='Escanear']", timeout=60000)
-    page.wait_for_timeout(500)  # Reduced from 1500ms to 500ms
+    esperar_angular_estable(page)
 
 
 # -------------------------------------------------------------------
@@ -76,20 +98,35 @@ def llenar_formulario_producto(page, producto: Producto) -> None:
     page.select_option("select[formcontrolname='impuesto']", "0")
 
 
-def guardar_producto(page) -> None:
-    """Guarda el producto y confirma el diálogo de éxito."""
-    page.click("button#azul")
-    # Manejar ambos comportamientos: swal2 o cierre directo de modal/dialog
-    try:
-        page.wait_for_selector(".swal2-confirm", timeout=5000)
-        page.click(".swal2-confirm")
-        page.wait_for_timeout(500)  # Reduced from 1000ms to 500ms
-    except Exception:
-        # Si no aparece swal, esperar cierre del modal o un pequeño retardo
-        try:
-            page.wait_for_selector("app-editar-producto, .modal", state="hidden", timeout=5000)
-        except Exception:
-            page.wait_for_timeout(500)  # Reduced from 1200ms to 500ms
+# Diálogo de edición abierto, y la condición de que ya no haya ninguno (para primero_de)
+DIALOGO_EDICION = "app-editar-producto, .modal.show"
+DIALOGO_CERRADO = "body:not(:has(app-editar-producto)):not(:has(.modal.show))"
+
+
+def guardar_producto(page, es_edicion: bool = False):
+    """
+    Guarda el producto y confirma el diálogo de éxito.
+    Retorna el cuerpo de la respuesta del backend.
+    """
+    if es_edicion:
+        endpoint, metodo = PRODUCTOS_ACTUALIZAR, "PUT"
+    else:
+        endpoint, metodo = PRODUCTOS_GUARDAR, "POST"
+    con_dialogo = page.locator(DIALOGO_EDICION).first.is_visible()
+    cuerpo = accion_con_respuesta(page, endpoint, lambda: page.click("button#azul"), metodo)
+    # Manejar ambos comportamientos: swal2 o cierre directo de modal/dialog, esperando los dos a la vez.
+    # Sin diálogo abierto (creación) "cerrado" se cumpliría de inmediato: solo se espera el swal
+    candidatos = {"swal": ".swal2-confirm"}
+    if con_dialogo:
+        candidatos["cerrado"] = DIALOGO_CERRADO
+    if primero_de(page, candidatos, timeout=5000) != "swal":
+        # El diálogo se cerró (o no pasó nada): el swal puede abrirse justo después del cierre
+        esperar_angular_estable(page)
+        if not page.locator(".swal2-confirm").first.is_visible():
+            return cuerpo
+    page.click(".swal2-confirm")
+    esperar_swal_cerrado(page)
+    return cuerpo
 
 
 def crear_producto(page, producto: Producto = None) -> Producto:
@@ -114,8 +151,14 @@ def crear_producto(page, producto: Producto = None) -> Producto:
 # -------------------------------------------------------------------
 def buscar_producto(page, codigo: str) -> None:
     """Busca un producto por su código utilizando el campo de escaneo."""
-    page.fill("input[placeholder*='Escanear']", codigo)
-    page.wait_for_timeout(1000)  # Give time for table to filter
+    # La búsqueda consulta /productos/todos y filtra en el cliente
+    try:
+        with respuesta_api(page, PRODUCTOS_TODOS, "GET"):
+            page.fill("input[placeholder*='Escanear']", codigo)
+    except Exception:
+        pass
+    # Esperar a que angular pinte la tabla filtrada
+    esperar_angular_estable(page)
 
 
 def validar_producto_existe(page, producto: Producto) -> bool:
@@ -125,13 +168,8 @@ def validar_producto_existe(page, producto: Producto) -> bool:
     """
     navegar_a_productos(page)
     buscar_producto(page, producto["codigo"])
-    # Esperar explícitamente a que el nombre aparezca en la tabla (evita falsos negativos por asincronía)
-    locator = page.locator(f"text={producto['nombre']}").first
-    try:
-        locator.wait_for(state="visible", timeout=3000)
-        return True
-    except:
-        return False
+    # buscar_producto espera a que angular pinte la tabla filtrada: basta una lectura
+    return hay_fila(leer_tabla(page, "producto"), codigo=producto["codigo"], nombre=producto["nombre"])
 
 
 # -------------------------------------------------------------------
@@ -148,61 +186,45 @@ def seleccionar_producto_en_tabla(page, nombre: str) -> None:
     delete_button.wait_for(state="visible", timeout=5000)
     # Usar JavaScript para disparar el click, que es más confiable con Angular
     delete_button.evaluate("button => button.click()")
-    # Esperar un momento para que Angular procese el evento
-    page.wait_for_timeout(500)
+
+
+def esperar_dialogo_eliminacion(page) -> None:
+    """Espera el diálogo de eliminación de SweetAlert2 con su botón de confirmar; lanza si no aparece."""
+    page.wait_for_selector(".swal2-popup", timeout=10000, state="visible")
+    page.wait_for_selector(".swal2-confirm", timeout=5000, state="visible")
 
 
 def confirmar_eliminacion(page) -> None:
-    """Confirma el diálogo de eliminación de SweetAlert2."""
-    # Esperar a que aparezca el diálogo de SweetAlert2 y hacer clic en el botón de confirmación
-    try:
-        # Esperar a que el modal de SweetAlert2 esté visible
-        page.wait_for_selector(".swal2-popup", timeout=10000, state="visible")
-        # Esperar al botón de confirmación específicamente
-        page.wait_for_selector(".swal2-confirm", timeout=5000, state="visible")
-        # Pequeño delay para asegurar que el botón sea interactuable
-        page.wait_for_timeout(500)
-        # Hacer clic en el botón de confirmación
-        page.click(".swal2-confirm")
-        # Esperar a que el diálogo desaparezca
-        page.wait_for_selector(".swal2-popup", timeout=5000, state="hidden")
-        # Dar tiempo para que la eliminación se procese
-        page.wait_for_timeout(1000)
-    except Exception as e:
-        # Si el diálogo no aparece o hay algún error, registrarlo pero continuar
-        print(f"⚠ Advertencia al confirmar eliminación: {e}")
-        page.wait_for_timeout(1000)
-
-
-def eliminar_producto(page, producto: Producto) -> None:
+    """Confirma el diálogo de eliminación de SweetAlert2 (ya abierto, ver esperar_dialogo_eliminacion)."""
+    # click espera a que la animación termine
+    page.click(".swal2-confirm")
+
+
+def eliminar_producto(page, producto: Producto):
     """
     Flujo completo para eliminar un producto.
     Requiere que el producto ya exista en el sistema.
+    Retorna el cuerpo de la respuesta del backend. Lanza si no aparece el botón o el diálogo
+    de confirmación, o si el backend responde con error.
     """
     navegar_a_productos(page)
     buscar_producto(page, producto["codigo"])
-    # Esperar a que la tabla se actualice después de la búsqueda
-    page.wait_for_timeout(1000)
     # Después de buscar por código, el producto debería ser el único/primero en la tabla
     # Simplemente hacer clic en el primer botón de eliminar que aparezca
-    try:
-        # Buscar el primer botón de eliminar en la tabla filtrada
-        first_delete_button = page.locator("button:has-text('❌')").first
-        first_delete_button.wait_for(state="visible", timeout=5000)
-        # Usar JavaScript para hacer click
-        first_delete_button.evaluate("button => button.click()")
-        page.wait_for_timeout(500)
-    except Exception as e:
-        print(f"⚠ Error al hacer clic en botón eliminar: {e}")
-    
-    confirmar_eliminacion(page)
+    first_delete_button = page.locator("button:has-text('❌')").first
+    first_delete_button.wait_for(state="visible", timeout=5000)
+    # Usar JavaScript para hacer click
+    first_delete_button.evaluate("button => button.click()")
+
+    # El diálogo se espera antes de armar la espera de la respuesta: si falta, se falla enseguida
+    esperar_dialogo_eliminacion(page)
+    cuerpo = accion_con_respuesta(page, PRODUCTOS_ELIMINAR, lambda: confirmar_eliminacion(page), "DELETE")
+    esperar_swal_cerrado(page)
+    esperar_angular_estable(page)
     # Esperar que la fila del producto (por código) sea removida del DOM
-    try:
-        row = page.locator(f"tr:has-text('{producto['codigo']}')").first
-        row.wait_for(state="hidden", timeout=5000)
-    except Exception:
-        pass
+    esperar_fila(page, producto["codigo"], presente=False, timeout=5000)
     refrescar_modulo_productos(page)
+    return cuerpo
 
 
 def validar_producto_no_existe(page, producto: Producto) -> bool:
@@ -212,16 +234,8 @@ def validar_producto_no_existe(page, producto: Producto) -> bool:
     """
     navegar_a_productos(page)
     buscar_producto(page, producto["codigo"])
-    # Buscar la fila por código (más estable) y esperar que desaparezca
-    row = page.locator(f"tr:has-text('{producto['codigo']}')").first
-    try:
-        row.wait_for(state="hidden", timeout=3000)
-        return True
-    except Exception:
-        try:
-            return not row.is_visible()
-        except Exception:
-            return True
+    # Buscar la fila por código (más estable)
+    return not hay_fila(leer_tabla(page, "producto"), codigo=producto["codigo"])
 
 
 # -------------------------------------------------------------------
@@ -231,15 +245,12 @@ def abrir_edicion_producto(page, nombre: str) -> None:
     """Abre el formulario de edición de un producto desde la tabla."""
     row = page.locator(f"tr:has-text('{nombre}')").first
     # En la UI actual el botón de editar tiene un emoji (✏️) y/o la clase "editar". Abrir modal/dialog y esperar al componente.
-    try:
-        row.locator("button.editar, button:has-text('✏️'), button:has-text('Editar')").first.click()
-    except:
-        row.locator("button:has-text('✏️'), button:has-text('Editar')").first.click()
+    localizar(row, "producto", "editar_fila").click()
 
     # Esperar por el componente de edición (MatDialog) o por inputs del formulario
     page.wait_for_selector("app-editar-producto, input[formcontrolname='nombre'], input[id='codigo']", timeout=60000)
-    # Dar tiempo adicional para que el formulario se cargue completamente
-    page.wait_for_timeout(1500)
+    # Esperar a que el producto completo llegue del backend y se cargue en el formulario
+    esperar_angular_estable(page)
 
 
 def editar_producto(page, producto_original: Producto, nuevos_datos: dict = None) -> Producto:
@@ -307,9 +318,11 @@ def editar_producto(page, producto_original: Producto, nuevos_datos: dict = None
     if "agregar_forma_venta" in nuevos_datos:
         # Buscar y hacer clic en el botón para agregar forma de venta
         try:
-            agregar_btn = page.locator("button:has-text('Agregar forma'), button:has-text('Agregar'), button[title*='Agregar']").first
+            selector_nombres = "div[formarrayname='formasVenta'] input[formcontrolname='nombre']"
+            previas = contar_elementos(page, selector_nombres)
+            agregar_btn = localizar(page, "producto", "agregar_forma")
             agregar_btn.click()
-            page.wait_for_timeout(800)
+            esperar_cambio_conteo(page, previas, selector_nombres)
             
             # Llenar la nueva forma de venta (será la última)
             formas = page.locator("div[formarrayname='formasVenta']")
@@ -330,7 +343,7 @@ def editar_producto(page, producto_original: Producto, nuevos_datos: dict = None
         except Exception as e:
             print(f"⚠ Advertencia al agregar forma de venta: {e}")
     
-    guardar_producto(page)
+    guardar_producto(page, es_edicion=True)
     # Refrescar la vista de productos para asegurarnos de que la tabla esté actualizada
     refrescar_modulo_productos(page)
     
@@ -339,3 +352,6 @@ def editar_producto(page, producto_original: Producto, nuevos_datos: dict = None
     producto_editado.update(nuevos_datos)
     
     return producto_editado
+
+
+instrumentar_modulo(__name__)
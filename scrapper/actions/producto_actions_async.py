@@ -0,0 +1,237 @@
+"""
+Variante asyncio de las acciones del módulo de Productos.
+Mismo flujo que producto_actions sobre playwright.async_api; los tipos y la
+generación de datos se reutilizan del módulo síncrono.
+"""
+
+import random
+
+from actions.producto_actions import DIALOGO_CERRADO, DIALOGO_EDICION, Producto, generar_datos_producto
+from core.endpoints import (
+    PRODUCTOS_ACTUALIZAR,
+    PRODUCTOS_ELIMINAR,
+    PRODUCTOS_GUARDAR,
+    PRODUCTOS_TODOS,
+)
+from core.esperas_async import (
+    accion_con_respuesta,
+    contar_elementos,
+    esperar_angular_estable,
+    esperar_cambio_conteo,
+    esperar_fila,
+    esperar_swal_cerrado,
+    primero_de,
+    respuesta_api,
+)
+from core.metricas import instrumentar_modulo
+from core.selectores_async import localizar
+from core.tablas_async import hay_fila, leer_tabla
+from core.vitales_async import medir_ruta
+
+__all__ = ["Producto", "generar_datos_producto"]
+
+
+# -------------------------------------------------------------------
+# Navegación
+# -------------------------------------------------------------------
+async def navegar_a_productos(page) -> None:
+    async with medir_ruta(page, "/app/producto"):
+        await page.click("a.sidebar-link[routerlink='/app/producto']")
+        await page.wait_for_url("**/app/producto", timeout=60000)
+        await page.wait_for_selector("app-producto")
+
+
+async def refrescar_modulo_productos(page) -> None:
+    await page.click("a.sidebar-link[routerlink='/app/producto']")
+    await page.wait_for_url("**/app/producto", timeout=60000)
+    await page.wait_for_selector("input[placeholder*='Escanear']", timeout=60000)
+    await esperar_angular_estable(page)
+
+
+# -------------------------------------------------------------------
+# Crear producto
+# -------------------------------------------------------------------
+async def abrir_formulario_nuevo_producto(page) -> None:
+    await page.click("button#nuevo")
+    await page.wait_for_selector("h1.nota:has-text('Registro de productos')")
+
+
+async def llenar_formulario_producto(page, producto: Producto) -> None:
+    await page.fill("input[formcontrolname='codigo']", producto["codigo"])
+    await page.fill("input[formcontrolname='nombre']", producto["nombre"])
+    await page.fill("input[formcontrolname='fecha_vencimiento']", producto["fecha_vencimiento"])
+    await page.fill("input[formcontrolname='lote']", producto["lote"])
+
+    # Configurar primera forma de venta
+    formas = page.locator("div[formarrayname='formasVenta']")
+    await formas.locator("input[formcontrolname='nombre']").first.fill("Unidad")
+    await formas.locator("input[formcontrolname='precioCompra']").first.fill("1000")
+    await formas.locator("input[formcontrolname='precioVenta']").first.fill("1500")
+    await formas.locator("input[formcontrolname='cantidad']").first.fill("50")
+
+    # Seleccionar impuesto 0
+    await page.select_option("select[formcontrolname='impuesto']", "0")
+
+
+async def guardar_producto(page, es_edicion: bool = False):
+    """Guarda el producto y retorna el cuerpo de la respuesta del backend."""
+    if es_edicion:
+        endpoint, metodo = PRODUCTOS_ACTUALIZAR, "PUT"
+    else:
+        endpoint, metodo = PRODUCTOS_GUARDAR, "POST"
+    con_dialogo = await page.locator(DIALOGO_EDICION).first.is_visible()
+    cuerpo = await accion_con_respuesta(page, endpoint, lambda: page.click("button#azul"), metodo)
+    candidatos = {"swal": ".swal2-confirm"}
+    if con_dialogo:
+        candidatos["cerrado"] = DIALOGO_CERRADO
+    if await primero_de(page, candidatos, timeout=5000) != "swal":
+        await esperar_angular_estable(page)
+        if not await page.locator(".swal2-confirm").first.is_visible():
+            return cuerpo
+    await page.click(".swal2-confirm")
+    await esperar_swal_cerrado(page)
+    return cuerpo
+
+
+async def crear_producto(page, producto: Producto = None) -> Producto:
+    if producto is None:
+        producto = generar_datos_producto()
+
+    await navegar_a_productos(page)
+    await abrir_formulario_nuevo_producto(page)
+    await llenar_formulario_producto(page, producto)
+    await guardar_producto(page)
+
+    return producto
+
+
+# -------------------------------------------------------------------
+# Buscar producto
+# -------------------------------------------------------------------
+async def buscar_producto(page, codigo: str) -> None:
+    try:
+        async with respuesta_api(page, PRODUCTOS_TODOS, "GET"):
+            await page.fill("input[placeholder*='Escanear']", codigo)
+    except Exception:
+        pass
+    await esperar_angular_estable(page)
+
+
+async def validar_producto_existe(page, producto: Producto) -> bool:
+    await navegar_a_productos(page)
+    await buscar_producto(page, producto["codigo"])
+    return hay_fila(await leer_tabla(page, "producto"), codigo=producto["codigo"], nombre=producto["nombre"])
+
+
+# -------------------------------------------------------------------
+# Eliminar producto
+# -------------------------------------------------------------------
+async def esperar_dialogo_eliminacion(page) -> None:
+    await page.wait_for_selector(".swal2-popup", timeout=10000, state="visible")
+    await page.wait_for_selector(".swal2-confirm", timeout=5000, state="visible")
+
+
+async def confirmar_eliminacion(page) -> None:
+    await page.click(".swal2-confirm")
+
+
+async def eliminar_producto(page, producto: Producto):
+    """Elimina el producto y retorna el cuerpo de la respuesta del backend; lanza si algo falla."""
+    await navegar_a_productos(page)
+    await buscar_producto(page, producto["codigo"])
+    first_delete_button = page.locator("button:has-text('❌')").first
+    await first_delete_button.wait_for(state="visible", timeout=5000)
+    await first_delete_button.evaluate("button => button.click()")
+
+    await esperar_dialogo_eliminacion(page)
+    cuerpo = await accion_con_respuesta(
+        page, PRODUCTOS_ELIMINAR, lambda: confirmar_eliminacion(page), "DELETE"
+    )
+    await esperar_swal_cerrado(page)
+    await esperar_angular_estable(page)
+    await esperar_fila(page, producto["codigo"], presente=False, timeout=5000)
+    await refrescar_modulo_productos(page)
+    return cuerpo
+
+
+async def validar_producto_no_existe(page, producto: Producto) -> bool:
+    await navegar_a_productos(page)
+    await buscar_producto(page, producto["codigo"])
+    return not hay_fila(await leer_tabla(page, "producto"), codigo=producto["codigo"])
+
+
+# -------------------------------------------------------------------
+# Editar producto
+# -------------------------------------------------------------------
+async def abrir_edicion_producto(page, nombre: str) -> None:
+    row = page.locator(f"tr:has-text('{nombre}')").first
+    await (await localizar(row, "producto", "editar_fila")).click()
+
+    await page.wait_for_selector("app-editar-producto, input[formcontrolname='nombre'], input[id='codigo']", timeout=60000)
+    await esperar_angular_estable(page)
+
+
+async def _reemplazar_valor(locator, valor) -> None:
+    await locator.fill("")
+    await locator.fill(str(valor))
+
+
+async def editar_producto(page, producto_original: Producto, nuevos_datos: dict = None) -> Producto:
+    """Mismos nuevos_datos que producto_actions.editar_producto."""
+    if nuevos_datos is None:
+        r = random.randint(10000, 99999)
+        nuevos_datos = {
+            "nombre": f"Producto QA EDITADO {r}",
+            "lote": f"LOTE-EDIT-{r}",
+        }
+
+    await navegar_a_productos(page)
+    await buscar_producto(page, producto_original["codigo"])
+    await abrir_edicion_producto(page, producto_original["nombre"])
+
+    if "nombre" in nuevos_datos:
+        nombre_input = page.locator("input[formcontrolname='nombre']").first
+        await nombre_input.wait_for(state="visible", timeout=10000)
+        await _reemplazar_valor(nombre_input, nuevos_datos["nombre"])
+
+    for campo in ("lote", "fecha_vencimiento"):
+        if campo in nuevos_datos:
+            await _reemplazar_valor(page.locator(f"input[formcontrolname='{campo}']").first, nuevos_datos[campo])
+
+    campos_forma = ("nombre", "precioCompra", "precioVenta", "cantidad")
+    formas = page.locator("div[formarrayname='formasVenta']")
+
+    if "formas_venta" in nuevos_datos:
+        for idx, forma in enumerate(nuevos_datos["formas_venta"]):
+            for campo in campos_forma:
+                if campo in forma:
+                    await _reemplazar_valor(
+                        formas.locator(f"input[formcontrolname='{campo}']").nth(idx), forma[campo]
+                    )
+
+    if "agregar_forma_venta" in nuevos_datos:
+        try:
+            selector_nombres = "div[formarrayname='formasVenta'] input[formcontrolname='nombre']"
+            previas = await contar_elementos(page, selector_nombres)
+            agregar_btn = await localizar(page, "producto", "agregar_forma")
+            await agregar_btn.click()
+            await esperar_cambio_conteo(page, previas, selector_nombres)
+
+            nueva_forma = nuevos_datos["agregar_forma_venta"]
+            last_idx = await formas.locator("input[formcontrolname='nombre']").count() - 1
+            for campo in campos_forma:
+                if campo in nueva_forma:
+                    await formas.locator(f"input[formcontrolname='{campo}']").nth(last_idx).fill(str(nueva_forma[campo]))
+        except Exception as e:
+            print(f"⚠ Advertencia al agregar forma de venta: {e}")
+
+    await guardar_producto(page, es_edicion=True)
+    await refrescar_modulo_productos(page)
+
+    producto_editado = producto_original.copy()
+    producto_editado.update(nuevos_datos)
+
+    return producto_editado
+
+
+instrumentar_modulo(__name__)
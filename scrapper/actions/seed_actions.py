@@ -0,0 +1,135 @@
+"""
+Creación de datos de prueba directamente contra la API del backend.
+Sirve para preparar las precondiciones de un flujo (cliente, producto) sin pasar por la UI,
+de modo que solo el flujo bajo prueba se ejecute en el navegador.
+"""
+
+from datetime import datetime
+
+from actions.cliente_actions import Cliente, generar_datos_cliente
+from actions.producto_actions import Producto, generar_datos_producto
+from actions.venta_actions import id_de_venta
+from core.api import ApiBackend
+from core.endpoints import (
+    CLIENTES_ELIMINAR,
+    CLIENTES_GUARDAR,
+    CLIENTES_POR_CEDULA,
+    PRODUCTOS_ELIMINAR,
+    PRODUCTOS_GUARDAR,
+    PRODUCTOS_TIPOS_IMPUESTOS,
+    VENTA_CANCELAR,
+    VENTA_GUARDAR,
+)
+from core.metricas import instrumentar_modulo
+
+# Misma forma de venta que llena llenar_formulario_producto en la UI
+FORMA_VENTA_DEFAULT = {
+    "nombre": "Unidad",
+    "precioCompra": 1000,
+    "precioVenta": 1500,
+    "cantidad": 50,
+    "minimoStock": 0,
+}
+
+
+# -------------------------------------------------------------------
+# Payloads (mismos DTOs que arma el frontend)
+# -------------------------------------------------------------------
+def payload_cliente(cliente: Cliente) -> dict:
+    """CrearClienteDTO."""
+    return {
+        "cedula": cliente["cedula"],
+        "nombre": cliente["nombre"],
+        "direccion": cliente["direccion"],
+        "correo": cliente["correo"],
+    }
+
+
+def payload_producto(producto: Producto, impuesto: str) -> dict:
+    """CrearProductoDTO."""
+    fecha = producto.get("fecha_vencimiento")
+    return {
+        "codigo": producto["codigo"],
+        "nombre": producto["nombre"],
+        "fechaVencimiento": datetime.strptime(fecha, "%Y-%m-%d").isoformat() + ".000Z" if fecha else None,
+        "lote": producto.get("lote") or None,
+        "impuesto": impuesto,
+        "precioCompra": FORMA_VENTA_DEFAULT["precioCompra"],
+        "formasVenta": [dict(FORMA_VENTA_DEFAULT)],
+        "minimoStock": 0,
+    }
+
+
+def impuesto_por_defecto(api: ApiBackend) -> str:
+    """Primer tipo de impuesto, el mismo que selecciona la UI con el índice 0."""
+    tipos = api.get(PRODUCTOS_TIPOS_IMPUESTOS) or [""]
+    return tipos[0]
+
+
+# -------------------------------------------------------------------
+# Crear
+# -------------------------------------------------------------------
+def sembrar_cliente(api: ApiBackend, cliente: Cliente = None) -> Cliente:
+    """Crea un cliente por API. Si no se proporciona, genera uno aleatorio."""
+    if cliente is None:
+        cliente = generar_datos_cliente()
+    api.post(CLIENTES_GUARDAR, json=payload_cliente(cliente))
+    return cliente
+
+
+def sembrar_producto(api: ApiBackend, producto: Producto = None, impuesto: str = None) -> Producto:
+    """Crea un producto por API. Si no se proporciona, genera uno aleatorio."""
+    if producto is None:
+        producto = generar_datos_producto()
+    if impuesto is None:
+        impuesto = impuesto_por_defecto(api)
+    api.post(PRODUCTOS_GUARDAR, json=payload_producto(producto, impuesto))
+    return producto
+
+
+def sembrar_venta(api: ApiBackend, cliente: Cliente, producto: Producto, cantidad: int = 1):
+    """
+    Registra por API una venta del producto (forma de venta por defecto) al cliente.
+    Retorna el ID de la venta, o None si el backend no devolvió uno reconocible.
+    """
+    cuerpo = api.post(VENTA_GUARDAR, json={
+        "cliente": cliente["cedula"],
+        "listDetalleVenta": [{
+            "cantidad": cantidad,
+            "codigoProducto": producto["codigo"],
+            "nombreformaVenta": FORMA_VENTA_DEFAULT["nombre"],
+        }],
+        "usuario": api.usuario_id,
+        "dineroRecibido": FORMA_VENTA_DEFAULT["precioVenta"] * cantidad,
+        "cambio": 0,
+        "descuento": 0,
+    })
+    id_venta = id_de_venta(cuerpo)
+    if id_venta is None:
+        print(f"⚠ /venta/guardar no devolvió un ID reconocible: {cuerpo!r}")
+    return id_venta
+
+
+# -------------------------------------------------------------------
+# Eliminar
+# -------------------------------------------------------------------
+def borrar_cliente(api: ApiBackend, cliente: Cliente) -> None:
+    """Elimina un cliente por API (el endpoint de borrado usa el id interno, no la cédula)."""
+    dto = api.get(f"{CLIENTES_POR_CEDULA}{cliente['cedula']}")
+    api.delete(f"{CLIENTES_ELIMINAR}{dto['id']}")
+
+
+def borrar_producto(api: ApiBackend, producto: Producto) -> None:
+    """Elimina un producto por API."""
+    api.delete(f"{PRODUCTOS_ELIMINAR}{producto['codigo']}")
+
+
+def cancelar_venta(api: ApiBackend, id_venta: int) -> None:
+    """Cancela (elimina) una venta por API."""
+    api.delete(f"{VENTA_CANCELAR}{id_venta}")
+
+
+instrumentar_modulo(__name__, pasos=[
+    "sembrar_cliente", "sembrar_producto", "sembrar_venta",
+    "borrar_cliente", "borrar_producto", "cancelar_venta",
+])
@@ -3,7 +3,14 @@ Acciones reutilizables para el módulo de Ventas.
 Cada función representa una acción atómica que puede ser utilizada en diferentes flujos.
 """
 
-from typing import TypedDict, List
+from typing import TypedDict, List, Optional
+
+from core.endpoints import VENTA_CANCELAR, VENTA_GUARDAR
+from core.esperas import accion_con_respuesta, esperar_angular_estable, esperar_swal_cerrado, primero_de
+from core.metricas import instrumentar_modulo
+from core.selectores import cadena, localizar, resolver
+from core.tablas import hay_fila_que_contiene, leer_tabla
+from core.vitales import medir_ruta
 
 
 class ItemVenta(TypedDict):
@@ -16,6 +23,7 @@ class ItemVenta(TypedDict):
 
 class Venta(TypedDict):
     """Estructura de datos para una venta."""
+    id: Optional[int]
     cliente_cedula: str
     items: List[ItemVenta]
     total: float
@@ -30,21 +38,33 @@ class Factura(TypedDict):
     numero_factura: str
 
 
+def id_de_venta(cuerpo) -> Optional[int]:
+    """Extrae el ID de la venta de la respuesta de /venta/guardar (número u objeto con id)."""
+    if isinstance(cuerpo, dict):
+        cuerpo = cuerpo.get("id", cuerpo.get("idVenta"))
+    try:
+        return int(cuerpo)
+    except (TypeError, ValueError):
+        return None
+
+
 # -------------------------------------------------------------------
 # Navegación
 # -------------------------------------------------------------------
 def navegar_a_ventas(page) -> None:
     """Navega al módulo de ventas desde cualquier pantalla."""
-    page.click("a.sidebar-link[routerlink='/app/venta']")
-    page.wait_for_url("**/app/venta", timeout=60000)
-    page.wait_for_selector("app-venta", timeout=10000)
+    with medir_ruta(page, "/app/venta"):
+        page.click("a.sidebar-link[routerlink='/app/venta']")
+        page.wait_for_url("**/app/venta", timeout=60000)
+        page.wait_for_selector("app-venta", timeout=10000)
 
 
 def navegar_a_lista_ventas(page) -> None:
     """Navega a la lista de ventas desde cualquier pantalla."""
-    page.click("a.sidebar-link[routerlink='/app/lista-ventas']")
-    page.wait_for_url("**/app/lista-ventas", timeout=60000)
-    page.wait_for_selector("app-lista-ventas", timeout=10000)
+    with medir_ruta(page, "/app/lista-ventas"):
+        page.click("a.sidebar-link[routerlink='/app/lista-ventas']")
+        page.wait_for_url("**/app/lista-ventas", timeout=60000)
+        page.wait_for_selector("app-lista-ventas", timeout=10000)
 
 
 # -------------------------------------------------------------------
@@ -54,20 +74,19 @@ def seleccionar_cliente_venta(page, cedula: str) -> None:
     """Selecciona un cliente para la venta usando su cédula."""
     # Buscar campo de cliente (puede variar según implementación)
     try:
-        campo_cliente = page.locator("input[placeholder*='Cliente' i], input[formcontrolname='cliente'], input[placeholder*='Cédula' i]").first
-        campo_cliente.wait_for(state="visible", timeout=10000)
+        campo_cliente = localizar(page, "venta", "cliente")
         campo_cliente.fill(cedula)
-        page.wait_for_timeout(1500)
+        esperar_angular_estable(page)
         
-        # Si hay un dropdown de sugerencias, seleccionar el primero
-        try:
-            page.wait_for_selector("mat-option, li.suggestion", timeout=3000)
-            page.click("mat-option:first-child, li.suggestion:first-child")
-            page.wait_for_timeout(500)
-        except:
+        # Si hay un dropdown de sugerencias, seleccionar el primero. Compite con el campo
+        # de producto, que siempre está visible: sin sugerencias no se espera en vano
+        candidatos = {"sugerencia": cadena("venta", "sugerencia"), "formulario": cadena("venta", "producto")}
+        if primero_de(page, candidatos, timeout=3000) == "sugerencia":
+            localizar(page, "venta", "sugerencia").click()
+        else:
             # Intentar presionar Enter para confirmar
             page.keyboard.press("Enter")
-            page.wait_for_timeout(500)
+        esperar_angular_estable(page)
     except Exception as e:
         print(f"⚠ Advertencia al seleccionar cliente: {e}")
 
@@ -79,25 +98,22 @@ def agregar_producto_a_venta(page, codigo_producto: str, cantidad: int = 1) -> N
     """Agrega un producto a la venta escaneando o escribiendo el código."""
     # Buscar campo de escaneo/búsqueda de producto
     try:
-        campo_producto = page.locator("input[placeholder*='Escanear' i], input[placeholder*='Código' i], input[placeholder*='Producto' i]").first
-        campo_producto.wait_for(state="visible", timeout=10000)
+        campo_producto = localizar(page, "venta", "producto")
         
         # Escribir código del producto
         campo_producto.fill(codigo_producto)
         page.keyboard.press("Enter")
-        page.wait_for_timeout(1500)
+        # El producto se consulta al backend y se agrega al carrito
+        esperar_angular_estable(page)
         
-        # Si hay campo de cantidad, ajustarla
-        if cantidad > 1:
-            try:
-                campo_cantidad = page.locator("input[formcontrolname='cantidad'], input[placeholder*='Cantidad' i]").last
-                campo_cantidad.wait_for(state="visible", timeout=3000)
-                campo_cantidad.fill("")
-                campo_cantidad.fill(str(cantidad))
-                page.keyboard.press("Enter")
-                page.wait_for_timeout(500)
-            except:
-                pass  # Cantidad por defecto es 1
+        # Si hay campo de cantidad, ajustarla (sin campo, la cantidad por defecto es 1)
+        candidatos = {"cantidad": cadena("venta", "cantidad"), "formulario": cadena("venta", "producto")}
+        if cantidad > 1 and primero_de(page, candidatos, timeout=3000) == "cantidad":
+            campo_cantidad = page.locator(resolver(page, "venta", "cantidad")).last
+            campo_cantidad.fill("")
+            campo_cantidad.fill(str(cantidad))
+            page.keyboard.press("Enter")
+            esperar_angular_estable(page)
     except Exception as e:
         print(f"⚠ Advertencia al agregar producto: {e}")
 
@@ -105,37 +121,50 @@ def agregar_producto_a_venta(page, codigo_producto: str, cantidad: int = 1) -> N
 # -------------------------------------------------------------------
 # Finalizar venta
 # -------------------------------------------------------------------
-def finalizar_venta(page, metodo_pago: str = "efectivo") -> None:
+# Elemento del registro (core.selectores) con la opción de cada método de pago
+_ELEMENTO_PAGO = {
+    "efectivo": "pago_efectivo",
+    "tarjeta": "pago_tarjeta",
+}
+
+
+def finalizar_venta(page, metodo_pago: str = "efectivo"):
     """
     Finaliza la venta y procesa el pago.
     metodo_pago: 'efectivo', 'tarjeta', 'transferencia', etc.
+    Retorna el cuerpo de la respuesta de /venta/guardar. Lanza si no aparecen los botones
+    de finalizar o confirmar, o si el backend responde con error.
     """
     # Click en botón de finalizar/cobrar
-    try:
-        boton_finalizar = page.locator("button:has-text('Finalizar'), button:has-text('Cobrar'), button#finalizar, button#cobrar").first
-        boton_finalizar.wait_for(state="visible", timeout=10000)
-        boton_finalizar.click()
-        page.wait_for_timeout(1500)
-    except Exception as e:
-        print(f"⚠ Advertencia al hacer clic en finalizar: {e}")
-    
-    # Seleccionar método de pago si hay opciones
-    try:
-        if metodo_pago == "efectivo":
-            page.click("button:has-text('Efectivo'), input[value='efectivo'], label:has-text('Efectivo')", timeout=3000)
-        elif metodo_pago == "tarjeta":
-            page.click("button:has-text('Tarjeta'), input[value='tarjeta'], label:has-text('Tarjeta')", timeout=3000)
-        page.wait_for_timeout(500)
-    except:
-        pass  # No hay selector de método de pago o ya está seleccionado
-    
-    # Confirmar venta
-    try:
-        page.wait_for_selector(".swal2-confirm, button:has-text('Confirmar'), button#confirmar", timeout=60000)
-        page.click(".swal2-confirm, button:has-text('Confirmar'), button#confirmar")
-        page.wait_for_timeout(2000)
-    except Exception as e:
-        print(f"⚠ Advertencia al confirmar venta: {e}")
+    boton_finalizar = localizar(page, "venta", "finalizar")
+    boton_finalizar.click()
+    esperar_angular_estable(page)
+
+    # Si la app pide el método de pago, la opción aparece antes (o junto) que el botón de confirmar;
+    # se esperan ambos a la vez y sin opción de pago se confirma directamente
+    pago = _ELEMENTO_PAGO.get(metodo_pago)
+    candidatos = {"confirmar": cadena("venta", "confirmar")}
+    if pago:
+        candidatos = {"pago": cadena("venta", pago), **candidatos}
+    siguiente = primero_de(page, candidatos, timeout=60000)
+    if siguiente is None:
+        raise TimeoutError("no apareció el botón de confirmar")
+    if siguiente == "pago":
+        localizar(page, "venta", pago).click()
+        esperar_angular_estable(page)
+
+    # Confirmar venta: el botón se localiza antes de armar la espera de la respuesta
+    boton_confirmar = localizar(page, "venta", "confirmar", timeout=60000)
+    # La venta queda registrada cuando el backend responde a /venta/guardar
+    cuerpo = accion_con_respuesta(
+        page,
+        VENTA_GUARDAR,
+        boton_confirmar.click,
+        "POST",
+    )
+    esperar_angular_estable(page)
+
+    return cuerpo
 
 
 def cerrar_dialogo_venta_exitosa(page) -> None:
@@ -143,7 +172,7 @@ def cerrar_dialogo_venta_exitosa(page) -> None:
     try:
         page.wait_for_selector(".swal2-confirm", timeout=5000)
         page.click(".swal2-confirm")
-        page.wait_for_timeout(1000)
+        esperar_swal_cerrado(page)
     except:
         pass  # No hay diálogo o ya se cerró
 
@@ -157,7 +186,7 @@ def crear_venta(page, cliente_cedula: str, items: List[ItemVenta]) -> Venta:
     Retorna los datos de la venta creada.
     """
     navegar_a_ventas(page)
-    page.wait_for_timeout(1000)
+    esperar_angular_estable(page)
     
     # Seleccionar cliente
     if cliente_cedula:
@@ -170,10 +199,11 @@ def crear_venta(page, cliente_cedula: str, items: List[ItemVenta]) -> Venta:
         total += item["precio"] * item["cantidad"]
     
     # Finalizar venta
-    finalizar_venta(page)
+    cuerpo = finalizar_venta(page)
     cerrar_dialogo_venta_exitosa(page)
     
     venta = {
+        "id": id_de_venta(cuerpo),
         "cliente_cedula": cliente_cedula,
         "items": items,
         "total": total
@@ -185,87 +215,84 @@ def crear_venta(page, cliente_cedula: str, items: List[ItemVenta]) -> Venta:
 # -------------------------------------------------------------------
 # Validar venta
 # -------------------------------------------------------------------
-def validar_venta_en_lista(page, cliente_cedula: str) -> bool:
+def validar_venta_en_lista(page, cliente_cedula: str, cliente_nombre: str = None) -> bool:
     """
     Valida que existe una venta para el cliente en la lista de ventas.
+    La columna "Nombre cliente" muestra lo que mande el backend (la cédula o el nombre),
+    así que se busca por la cédula y, si no aparece, por el nombre.
     Retorna True si encuentra al menos una venta, False en caso contrario.
     """
     navegar_a_lista_ventas(page)
-    page.wait_for_timeout(2000)
-    
-    # Buscar por cédula del cliente
-    try:
-        campo_busqueda = page.locator("input[placeholder*='Buscar' i]").first
-        campo_busqueda.fill(cliente_cedula)
-        page.wait_for_timeout(1500)
-    except:
-        pass
-    
-    # Verificar si hay resultados en la tabla
-    try:
-        return page.locator(f"td:has-text('{cliente_cedula}'), tr:has-text('{cliente_cedula}')").first.is_visible(timeout=3000)
-    except:
-        return False
+    # Esperar a que la lista de ventas llegue del backend
+    esperar_angular_estable(page)
+
+    for termino in filter(None, (cliente_cedula, cliente_nombre)):
+        try:
+            campo_busqueda = localizar(page, "lista-ventas", "buscar")
+            campo_busqueda.fill(termino)
+            esperar_angular_estable(page)
+        except:
+            pass
+        if hay_fila_que_contiene(leer_tabla(page, "lista-ventas"), cliente=termino):
+            return True
+    return False
 
 
 # -------------------------------------------------------------------
 # Eliminar venta
 # -------------------------------------------------------------------
-def eliminar_venta(page, cliente_cedula: str = None, index: int = 0) -> None:
+def eliminar_venta(page, cliente_cedula: str = None, index: int = 0):
     """
     Elimina una venta desde la lista de ventas.
     Si se proporciona cliente_cedula, busca primero por ese cliente.
     index: posición de la venta en la tabla (0 = primera)
+    Retorna el cuerpo de la respuesta de /venta/cancelar. Lanza si no aparece la fila o el
+    diálogo de confirmación, o si el backend responde con error.
     """
     navegar_a_lista_ventas(page)
-    page.wait_for_timeout(2000)
+    # Esperar a que la lista de ventas llegue del backend
+    esperar_angular_estable(page)
     
     # Si se proporciona cédula, filtrar primero
     if cliente_cedula:
         try:
-            campo_busqueda = page.locator("input[placeholder*='Buscar' i]").first
+            campo_busqueda = localizar(page, "lista-ventas", "buscar")
             campo_busqueda.fill(cliente_cedula)
-            page.wait_for_timeout(1500)
+            esperar_angular_estable(page)
         except:
             pass
     
     # Buscar botón de eliminar en la fila correspondiente
+    filas = page.locator(resolver(page, "lista-ventas", "filas"))
+    # Contar filas de datos (excluyendo header)
+    fila = filas.nth(index)
+
+    # Buscar el botón de eliminar (puede ser ❌ o un botón con texto); si no se reconoce,
+    # el último botón de la fila suele ser eliminar
+    candidatos = {"eliminar": cadena("lista-ventas", "eliminar_fila"), "otro": "button"}
+    if primero_de(fila, candidatos) == "eliminar":
+        localizar(fila, "lista-ventas", "eliminar_fila").click()
+    else:
+        fila.locator("button").last.click()
+
+    # Confirmar eliminación en el diálogo (se espera antes de armar la espera de la respuesta)
+    page.wait_for_selector(".swal2-popup", timeout=10000, state="visible")
+    page.wait_for_selector(".swal2-confirm", timeout=5000, state="visible")
+    cuerpo = accion_con_respuesta(page, VENTA_CANCELAR, lambda: page.click(".swal2-confirm"), "DELETE")
+    esperar_swal_cerrado(page)
+    # Esperar el refresco de la lista
+    esperar_angular_estable(page)
+
+    # Manejar alerta de éxito si aparece
     try:
-        filas = page.locator("tbody tr, table tr")
-        # Contar filas de datos (excluyendo header)
-        fila = filas.nth(index)
-        
-        # Buscar el botón de eliminar (puede ser ❌ o un botón con texto)
-        try:
-            fila.locator("button:has-text('❌'), button:has-text('Eliminar'), button.eliminar").first.click()
-        except:
-            fila.locator("button").last.click()  # Último botón suele ser eliminar
-        
-        page.wait_for_timeout(1000)
-        
-        # Confirmar eliminación en el diálogo
-        try:
-            page.wait_for_selector(".swal2-popup", timeout=10000, state="visible")
-            page.wait_for_selector(".swal2-confirm", timeout=5000, state="visible")
-            page.wait_for_timeout(500)
-            page.click(".swal2-confirm")
-            page.wait_for_selector(".swal2-popup", timeout=5000, state="hidden")
-            page.wait_for_timeout(1000)
-            
-            # Manejar alerta de éxito si aparece
-            try:
-                page.wait_for_selector(".swal2-popup", timeout=5000, state="visible")
-                page.wait_for_selector(".swal2-confirm", timeout=3000, state="visible")
-                page.wait_for_timeout(300)
-                page.click(".swal2-confirm")
-                page.wait_for_selector(".swal2-popup", timeout=5000, state="hidden")
-                page.wait_for_timeout(500)
-            except:
-                pass
-        except Exception as e:
-            print(f"⚠ Advertencia al confirmar eliminación de venta: {e}")
-    except Exception as e:
-        print(f"⚠ Error al eliminar venta: {e}")
+        page.wait_for_selector(".swal2-popup", timeout=5000, state="visible")
+        page.wait_for_selector(".swal2-confirm", timeout=3000, state="visible")
+        page.click(".swal2-confirm")
+        page.wait_for_selector(".swal2-popup", timeout=5000, state="hidden")
+    except:
+        pass
+
+    return cuerpo
 
 
 # -------------------------------------------------------------------
@@ -289,7 +316,7 @@ def crear_factura(page, tipo_factura: str, cliente_cedula: str, items: List[Item
     Retorna los datos de la factura creada.
     """
     navegar_a_ventas(page)
-    page.wait_for_timeout(1000)
+    esperar_angular_estable(page)
     
     # Seleccionar cliente
     if cliente_cedula:
@@ -301,36 +328,27 @@ def crear_factura(page, tipo_factura: str, cliente_cedula: str, items: List[Item
         agregar_producto_a_venta(page, item["codigo"], item["cantidad"])
         total += item["precio"] * item["cantidad"]
     
-    # Seleccionar tipo de factura antes de finalizar
+    # Seleccionar tipo de factura antes de finalizar: checkbox, radio o toggle.
+    # Compite con el botón de finalizar, así que si la app no lo ofrece no se espera en vano
+    electronica = tipo_factura.lower() == "electronica"
+    tipo = "factura_electronica" if electronica else "factura_fisica"
     try:
-        if tipo_factura.lower() == "electronica":
-            # Buscar checkbox, radio o toggle para factura electrónica
-            page.click("input[value='electronica'], label:has-text('Electrónica'), button:has-text('Electrónica')", timeout=5000)
-        else:
-            # Factura física (puede ser el default)
-            try:
-                page.click("input[value='fisica'], label:has-text('Física'), button:has-text('Física')", timeout=3000)
-            except:
-                pass  # Física puede ser el valor por defecto
-        page.wait_for_timeout(500)
+        candidatos = {"tipo": cadena("venta", tipo), "finalizar": cadena("venta", "finalizar")}
+        if primero_de(page, candidatos, timeout=5000) == "tipo":
+            localizar(page, "venta", tipo).click()
+            esperar_angular_estable(page)
+        elif electronica:
+            print("⚠ Advertencia al seleccionar tipo de factura: no se encontró la opción de factura electrónica")
+        # Física puede ser el valor por defecto
     except Exception as e:
         print(f"⚠ Advertencia al seleccionar tipo de factura: {e}")
     
     # Finalizar venta/factura
-    finalizar_venta(page)
+    cuerpo = finalizar_venta(page)
     
-    # Intentar obtener número de factura del diálogo de éxito
-    numero_factura = "N/A"
-    try:
-        # Buscar el número en el diálogo de éxito
-        texto_dialogo = page.locator(".swal2-content, .swal2-html-container").first.text_content(timeout=3000)
-        # Intentar extraer número de factura del texto
-        import re
-        match = re.search(r'(?:factura|número|no\.?)\s*:?\s*(\d+)', texto_dialogo, re.IGNORECASE)
-        if match:
-            numero_factura = match.group(1)
-    except:
-        pass
+    # El número de factura es el ID de la venta que devuelve el backend
+    id_venta = id_de_venta(cuerpo)
+    numero_factura = str(id_venta) if id_venta is not None else "N/A"
     
     cerrar_dialogo_venta_exitosa(page)
     
@@ -359,3 +377,6 @@ def crear_factura_electronica(page, cliente_cedula: str, items: List[ItemVenta])
     Retorna los datos de la factura creada.
     """
     return crear_factura(page, "electronica", cliente_cedula, items)
+
+
+instrumentar_modulo(__name__)
@@ -0,0 +1,253 @@
+"""
+Variante asyncio de las acciones del módulo de Ventas.
+Mismo flujo que venta_actions sobre playwright.async_api; los tipos y
+id_de_venta se reutilizan del módulo síncrono.
+"""
+
+from typing import List
+
+from actions.venta_actions import _ELEMENTO_PAGO, Factura, ItemVenta, Venta, id_de_venta
+from core.endpoints import VENTA_CANCELAR, VENTA_GUARDAR
+from core.esperas_async import accion_con_respuesta, esperar_angular_estable, esperar_swal_cerrado, primero_de
+from core.metricas import instrumentar_modulo
+from core.selectores_async import cadena, localizar, resolver
+from core.tablas_async import hay_fila_que_contiene, leer_tabla
+from core.vitales_async import medir_ruta
+
+__all__ = ["Factura", "ItemVenta", "Venta", "id_de_venta"]
+
+
+# -------------------------------------------------------------------
+# Navegación
+# -------------------------------------------------------------------
+async def navegar_a_ventas(page) -> None:
+    async with medir_ruta(page, "/app/venta"):
+        await page.click("a.sidebar-link[routerlink='/app/venta']")
+        await page.wait_for_url("**/app/venta", timeout=60000)
+        await page.wait_for_selector("app-venta", timeout=10000)
+
+
+async def navegar_a_lista_ventas(page) -> None:
+    async with medir_ruta(page, "/app/lista-ventas"):
+        await page.click("a.sidebar-link[routerlink='/app/lista-ventas']")
+        await page.wait_for_url("**/app/lista-ventas", timeout=60000)
+        await page.wait_for_selector("app-lista-ventas", timeout=10000)
+
+
+# -------------------------------------------------------------------
+# Seleccionar cliente
+# -------------------------------------------------------------------
+async def seleccionar_cliente_venta(page, cedula: str) -> None:
+    try:
+        campo_cliente = await localizar(page, "venta", "cliente")
+        await campo_cliente.fill(cedula)
+        await esperar_angular_estable(page)
+
+        candidatos = {"sugerencia": cadena("venta", "sugerencia"), "formulario": cadena("venta", "producto")}
+        if await primero_de(page, candidatos, timeout=3000) == "sugerencia":
+            await (await localizar(page, "venta", "sugerencia")).click()
+        else:
+            await page.keyboard.press("Enter")
+        await esperar_angular_estable(page)
+    except Exception as e:
+        print(f"⚠ Advertencia al seleccionar cliente: {e}")
+
+
+# -------------------------------------------------------------------
+# Agregar productos
+# -------------------------------------------------------------------
+async def agregar_producto_a_venta(page, codigo_producto: str, cantidad: int = 1) -> None:
+    try:
+        campo_producto = await localizar(page, "venta", "producto")
+
+        await campo_producto.fill(codigo_producto)
+        await page.keyboard.press("Enter")
+        await esperar_angular_estable(page)
+
+        candidatos = {"cantidad": cadena("venta", "cantidad"), "formulario": cadena("venta", "producto")}
+        if cantidad > 1 and await primero_de(page, candidatos, timeout=3000) == "cantidad":
+            campo_cantidad = page.locator(await resolver(page, "venta", "cantidad")).last
+            await campo_cantidad.fill("")
+            await campo_cantidad.fill(str(cantidad))
+            await page.keyboard.press("Enter")
+            await esperar_angular_estable(page)
+    except Exception as e:
+        print(f"⚠ Advertencia al agregar producto: {e}")
+
+
+# -------------------------------------------------------------------
+# Finalizar venta
+# -------------------------------------------------------------------
+async def finalizar_venta(page, metodo_pago: str = "efectivo"):
+    """Finaliza la venta y retorna el cuerpo de /venta/guardar; lanza si algo falla."""
+    boton_finalizar = await localizar(page, "venta", "finalizar")
+    await boton_finalizar.click()
+    await esperar_angular_estable(page)
+
+    pago = _ELEMENTO_PAGO.get(metodo_pago)
+    candidatos = {"confirmar": cadena("venta", "confirmar")}
+    if pago:
+        candidatos = {"pago": cadena("venta", pago), **candidatos}
+    siguiente = await primero_de(page, candidatos, timeout=60000)
+    if siguiente is None:
+        raise TimeoutError("no apareció el botón de confirmar")
+    if siguiente == "pago":
+        await (await localizar(page, "venta", pago)).click()
+        await esperar_angular_estable(page)
+
+    boton_confirmar = await localizar(page, "venta", "confirmar", timeout=60000)
+    cuerpo = await accion_con_respuesta(
+        page,
+        VENTA_GUARDAR,
+        boton_confirmar.click,
+        "POST",
+    )
+    await esperar_angular_estable(page)
+
+    return cuerpo
+
+
+async def cerrar_dialogo_venta_exitosa(page) -> None:
+    try:
+        await page.wait_for_selector(".swal2-confirm", timeout=5000)
+        await page.click(".swal2-confirm")
+        await esperar_swal_cerrado(page)
+    except Exception:
+        pass  # No hay diálogo o ya se cerró
+
+
+# -------------------------------------------------------------------
+# Crear venta completa
+# -------------------------------------------------------------------
+async def _preparar_venta(page, cliente_cedula: str, items: List[ItemVenta]) -> float:
+    """Abre el módulo de ventas, selecciona el cliente y agrega los items. Retorna el total."""
+    await navegar_a_ventas(page)
+    await esperar_angular_estable(page)
+
+    if cliente_cedula:
+        await seleccionar_cliente_venta(page, cliente_cedula)
+
+    total = 0.0
+    for item in items:
+        await agregar_producto_a_venta(page, item["codigo"], item["cantidad"])
+        total += item["precio"] * item["cantidad"]
+    return total
+
+
+async def crear_venta(page, cliente_cedula: str, items: List[ItemVenta]) -> Venta:
+    total = await _preparar_venta(page, cliente_cedula, items)
+
+    cuerpo = await finalizar_venta(page)
+    await cerrar_dialogo_venta_exitosa(page)
+
+    return {
+        "id": id_de_venta(cuerpo),
+        "cliente_cedula": cliente_cedula,
+        "items": items,
+        "total": total
+    }
+
+
+# -------------------------------------------------------------------
+# Validar venta
+# -------------------------------------------------------------------
+async def _filtrar_lista_ventas(page, termino: str) -> None:
+    try:
+        campo_busqueda = await localizar(page, "lista-ventas", "buscar")
+        await campo_busqueda.fill(termino)
+        await esperar_angular_estable(page)
+    except Exception:
+        pass
+
+
+async def validar_venta_en_lista(page, cliente_cedula: str, cliente_nombre: str = None) -> bool:
+    await navegar_a_lista_ventas(page)
+    await esperar_angular_estable(page)
+
+    for termino in filter(None, (cliente_cedula, cliente_nombre)):
+        await _filtrar_lista_ventas(page, termino)
+        if hay_fila_que_contiene(await leer_tabla(page, "lista-ventas"), cliente=termino):
+            return True
+    return False
+
+
+# -------------------------------------------------------------------
+# Eliminar venta
+# -------------------------------------------------------------------
+async def eliminar_venta(page, cliente_cedula: str = None, index: int = 0):
+    """Elimina una venta de la lista y retorna el cuerpo de /venta/cancelar; lanza si algo falla."""
+    await navegar_a_lista_ventas(page)
+    await esperar_angular_estable(page)
+
+    if cliente_cedula:
+        await _filtrar_lista_ventas(page, cliente_cedula)
+
+    fila = page.locator(await resolver(page, "lista-ventas", "filas")).nth(index)
+
+    candidatos = {"eliminar": cadena("lista-ventas", "eliminar_fila"), "otro": "button"}
+    if await primero_de(fila, candidatos) == "eliminar":
+        await (await localizar(fila, "lista-ventas", "eliminar_fila")).click()
+    else:
+        await fila.locator("button").last.click()  # Último botón suele ser eliminar
+
+    await page.wait_for_selector(".swal2-popup", timeout=10000, state="visible")
+    await page.wait_for_selector(".swal2-confirm", timeout=5000, state="visible")
+    cuerpo = await accion_con_respuesta(page, VENTA_CANCELAR, lambda: page.click(".swal2-confirm"), "DELETE")
+    await esperar_swal_cerrado(page)
+    await esperar_angular_estable(page)
+
+    try:
+        await page.wait_for_selector(".swal2-popup", timeout=5000, state="visible")
+        await page.wait_for_selector(".swal2-confirm", timeout=3000, state="visible")
+        await page.click(".swal2-confirm")
+        await page.wait_for_selector(".swal2-popup", timeout=5000, state="hidden")
+    except Exception:
+        pass
+
+    return cuerpo
+
+
+# -------------------------------------------------------------------
+# Crear factura
+# -------------------------------------------------------------------
+async def crear_factura(page, tipo_factura: str, cliente_cedula: str, items: List[ItemVenta]) -> Factura:
+    total = await _preparar_venta(page, cliente_cedula, items)
+
+    electronica = tipo_factura.lower() == "electronica"
+    tipo = "factura_electronica" if electronica else "factura_fisica"
+    try:
+        candidatos = {"tipo": cadena("venta", tipo), "finalizar": cadena("venta", "finalizar")}
+        if await primero_de(page, candidatos, timeout=5000) == "tipo":
+            await (await localizar(page, "venta", tipo)).click()
+            await esperar_angular_estable(page)
+        elif electronica:
+            print("⚠ Advertencia al seleccionar tipo de factura: no se encontró la opción de factura electrónica")
+        # Física puede ser el valor por defecto
+    except Exception as e:
+        print(f"⚠ Advertencia al seleccionar tipo de factura: {e}")
+
+    cuerpo = await finalizar_venta(page)
+
+    id_venta = id_de_venta(cuerpo)
+    numero_factura = str(id_venta) if id_venta is not None else "N/A"
+
+    await cerrar_dialogo_venta_exitosa(page)
+
+    return {
+        "tipo": tipo_factura,
+        "cliente_cedula": cliente_cedula,
+        "items": items,
+        "total": total,
+        "numero_factura": numero_factura
+    }
+
+
+async def crear_factura_fisica(page, cliente_cedula: str, items: List[ItemVenta]) -> Factura:
+    return await crear_factura(page, "fisica", cliente_cedula, items)
+
+
+async def crear_factura_electronica(page, cliente_cedula: str, items: List[ItemVenta]) -> Factura:
+    return await crear_factura(page, "electronica", cliente_cedula, items)
+
+
+instrumentar_modulo(__name__)
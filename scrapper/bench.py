@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los flujos de negocio con comparación contra una línea base histórica.
+
+Cada flujo se ejecuta K veces en el navegador. Las precondiciones (clientes, productos,
+ventas) se siembran por API y se limpian al terminar cada iteración, fuera del tiempo medido.
+Los resultados se agregan a .bench/historial.jsonl; la línea base de cada flujo es la última
+ejecución aprobada contra la misma BASE_URL. Si la mediana de un flujo empeora más que el
+umbral, el benchmark termina con código 1.
+
+Uso:
+    python bench.py                                # Todos los flujos, 5 iteraciones
+    python bench.py crear_venta login -k 10        # Solo algunos flujos
+    python bench.py --umbral 0.3                   # Tolerar hasta 30% de empeoramiento
+    python bench.py --list
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TypedDict
+
+from actions.cliente_actions import crear_cliente, editar_cliente, eliminar_cliente, generar_datos_cliente
+from actions.producto_actions import crear_producto, editar_producto, eliminar_producto, generar_datos_producto
+from actions.seed_actions import (
+    FORMA_VENTA_DEFAULT,
+    borrar_cliente,
+    borrar_producto,
+    cancelar_venta,
+    sembrar_cliente,
+    sembrar_producto,
+    sembrar_venta,
+)
+from actions.venta_actions import (
+    crear_factura_electronica,
+    crear_factura_fisica,
+    crear_venta,
+    eliminar_venta,
+    id_de_venta,
+)
+from core.api import ApiBackend
+from core.browser import get_page
+from core.estadisticas import percentil
+from core.login import load_env, login, login_ui
+
+RUTA_HISTORIAL = Path(__file__).resolve().parent / ".bench" / "historial.jsonl"
+K_DEFAULT = 5
+UMBRAL_DEFAULT = 0.20  # 20% más lento que la línea base
+
+
+class Flujo(TypedDict):
+    """Un flujo medible: preparar y limpiar quedan fuera del tiempo medido."""
+    preparar: Callable  # (api, page) -> dict con los datos de la iteración
+    ejecutar: Callable  # (page, datos) -> None; actualiza datos con lo que haya que limpiar
+    limpiar: Callable  # (api, datos) -> None
+
+
+# -------------------------------------------------------------------
+# Flujos
+# -------------------------------------------------------------------
+def _sin_error(descripcion: str, funcion, *args) -> None:
+    try:
+        funcion(*args)
+    except Exception as e:
+        print(f"⚠ No se pudo restablecer {descripcion}: {e}")
+
+
+def _nada(*_args) -> dict:
+    return {}
+
+
+def _item(producto) -> list:
+    return [{
+        "codigo": producto["codigo"],
+        "nombre": producto["nombre"],
+        "cantidad": 1,
+        "precio": float(FORMA_VENTA_DEFAULT["precioVenta"]),
+    }]
+
+
+# login: sesión nueva por UI en un contexto limpio
+def _preparar_login(_api, page) -> dict:
+    contexto = page.context.browser.new_context()
+    return {"contexto": contexto, "pagina": contexto.new_page()}
+
+
+def _ejecutar_login(_page, datos) -> None:
+    login_ui(datos["pagina"], *load_env())
+
+
+def _limpiar_login(_api, datos) -> None:
+    if "contexto" in datos:
+        datos["contexto"].close()
+
+
+# clientes
+def _preparar_cliente_sembrado(api, _page) -> dict:
+    return {"cliente": sembrar_cliente(api)}
+
+
+def _ejecutar_crear_cliente(page, datos) -> None:
+    datos["cliente"] = crear_cliente(page, generar_datos_cliente())
+
+
+def _ejecutar_editar_cliente(page, datos) -> None:
+    editar_cliente(page, datos["cliente"])
+
+
+def _ejecutar_eliminar_cliente(page, datos) -> None:
+    eliminar_cliente(page, datos["cliente"])
+    datos.pop("cliente")
+
+
+def _limpiar_cliente(api, datos) -> None:
+    if "cliente" in datos:
+        _sin_error("el cliente", borrar_cliente, api, datos["cliente"])
+
+
+# productos
+def _preparar_producto_sembrado(api, _page) -> dict:
+    return {"producto": sembrar_producto(api)}
+
+
+def _ejecutar_crear_producto(page, datos) -> None:
+    datos["producto"] = crear_producto(page, generar_datos_producto())
+
+
+def _ejecutar_editar_producto(page, datos) -> None:
+    editar_producto(page, datos["producto"])
+
+
+def _ejecutar_eliminar_producto(page, datos) -> None:
+    eliminar_producto(page, datos["producto"])
+    datos.pop("producto")
+
+
+def _limpiar_producto(api, datos) -> None:
+    if "producto" in datos:
+        _sin_error("el producto", borrar_producto, api, datos["producto"])
+
+
+# ventas
+def _preparar_venta(api, _page) -> dict:
+    return {"cliente": sembrar_cliente(api), "producto": sembrar_producto(api)}
+
+
+def _preparar_venta_sembrada(api, page) -> dict:
+    datos = _preparar_venta(api, page)
+    datos["id_venta"] = sembrar_venta(api, datos["cliente"], datos["producto"])
+    return datos
+
+
+def _ejecutar_crear_venta(page, datos) -> None:
+    venta = crear_venta(page, datos["cliente"]["cedula"], _item(datos["producto"]))
+    datos["id_venta"] = venta["id"]
+
+
+def _ejecutar_factura(crear_factura) -> Callable:
+    def ejecutar(page, datos) -> None:
+        factura = crear_factura(page, datos["cliente"]["cedula"], _item(datos["producto"]))
+        datos["id_venta"] = id_de_venta(factura["numero_factura"])
+    return ejecutar
+
+
+def _ejecutar_eliminar_venta(page, datos) -> None:
+    eliminar_venta(page, cliente_cedula=datos["cliente"]["cedula"])
+    datos.pop("id_venta")
+
+
+def _limpiar_venta(api, datos) -> None:
+    if datos.get("id_venta") is not None:
+        _sin_error("la venta", cancelar_venta, api, datos["id_venta"])
+    _limpiar_producto(api, datos)
+    _limpiar_cliente(api, datos)
+
+
+FLUJOS: Dict[str, Flujo] = {
+    "login": {"preparar": _preparar_login, "ejecutar": _ejecutar_login, "limpiar": _limpiar_login},
+    "crear_cliente": {"preparar": _nada, "ejecutar": _ejecutar_crear_cliente, "limpiar": _limpiar_cliente},
+    "editar_cliente": {
+        "preparar": _preparar_cliente_sembrado, "ejecutar": _ejecutar_editar_cliente, "limpiar": _limpiar_cliente,
+    },
+    "eliminar_cliente": {
+        "preparar": _preparar_cliente_sembrado, "ejecutar": _ejecutar_eliminar_cliente, "limpiar": _limpiar_cliente,
+    },
+    "crear_producto": {"preparar": _nada, "ejecutar": _ejecutar_crear_producto, "limpiar": _limpiar_producto},
+    "editar_producto": {
+        "preparar": _preparar_producto_sembrado, "ejecutar": _ejecutar_editar_producto, "limpiar": _limpiar_producto,
+    },
+    "eliminar_producto": {
+        "preparar": _preparar_producto_sembrado, "ejecutar": _ejecutar_eliminar_producto, "limpiar": _limpiar_producto,
+    },
+    "crear_venta": {"preparar": _preparar_venta, "ejecutar": _ejecutar_crear_venta, "limpiar": _limpiar_venta},
+    "factura_fisica": {
+        "preparar": _preparar_venta, "ejecutar": _ejecutar_factura(crear_factura_fisica), "limpiar": _limpiar_venta,
+    },
+    "factura_electronica": {
+        "preparar": _preparar_venta, "ejecutar": _ejecutar_factura(crear_factura_electronica),
+        "limpiar": _limpiar_venta,
+    },
+    "eliminar_venta": {
+        "preparar": _preparar_venta_sembrada, "ejecutar": _ejecutar_eliminar_venta, "limpiar": _limpiar_venta,
+    },
+}
+
+
+# -------------------------------------------------------------------
+# Medición
+# -------------------------------------------------------------------
+def medir_flujo(nombre: str, page, api: ApiBackend, k: int, calentamiento: int, base_url: str) -> dict:
+    """Ejecuta el flujo calentamiento + k veces y retorna sus estadísticas (en segundos)."""
+    flujo = FLUJOS[nombre]
+    duraciones: List[float] = []
+    errores = 0
+    for i in range(calentamiento + k):
+        datos = {}
+        try:
+            datos = flujo["preparar"](api, page)
+            inicio = time.perf_counter()
+            flujo["ejecutar"](page, datos)
+            duracion = time.perf_counter() - inicio
+            if i >= calentamiento:
+                duraciones.append(duracion)
+        except Exception as e:
+            print(f"  ✗ {nombre} #{i + 1}: {str(e).splitlines()[0] if str(e) else type(e).__name__}")
+            if i >= calentamiento:
+                errores += 1
+            # Volver a un estado conocido para la siguiente iteración
+            _sin_error("el estado de la página", page.goto, f"{base_url}/app/principal")
+        finally:
+            flujo["limpiar"](api, datos)
+
+    return {
+        "n": len(duraciones),
+        "errores": errores,
+        "min": round(min(duraciones), 3) if duraciones else None,
+        "mediana": round(statistics.median(duraciones), 3) if duraciones else None,
+        "p95": round(percentil(duraciones, 95), 3) if duraciones else None,
+    }
+
+
+# -------------------------------------------------------------------
+# Historial
+# -------------------------------------------------------------------
+def leer_historial(ruta: Path = RUTA_HISTORIAL) -> List[dict]:
+    if not ruta.exists():
+        return []
+    with ruta.open(encoding="utf-8") as f:
+        return [json.loads(linea) for linea in f if linea.strip()]
+
+
+def linea_base(historial: List[dict], base_url: str, flujo: str) -> Optional[dict]:
+    """Estadísticas del flujo en la última ejecución aprobada contra la misma BASE_URL."""
+    for ejecucion in reversed(historial):
+        if ejecucion.get("aprobado") and ejecucion.get("base_url") == base_url:
+            stats = ejecucion["flujos"].get(flujo)
+            if stats and stats.get("mediana") is not None:
+                return stats
+    return None
+
+
+def guardar_ejecucion(ejecucion: dict, ruta: Path = RUTA_HISTORIAL) -> None:
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    with ruta.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(ejecucion, ensure_ascii=False) + "\n")
+
+
+# -------------------------------------------------------------------
+# Entrada
+# -------------------------------------------------------------------
+def parse_args():
+    """Interpreta los argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Mide los flujos de negocio y los compara con la línea base.")
+    parser.add_argument("flujos", nargs="*", help="Flujos a medir (por defecto todos)")
+    parser.add_argument("--list", action="store_true", help="Lista los flujos disponibles")
+    parser.add_argument("-k", type=int, default=K_DEFAULT, help=f"Iteraciones medidas por flujo (por defecto {K_DEFAULT})")
+    parser.add_argument("--calentamiento", type=int, default=1, help="Iteraciones previas no medidas (por defecto 1)")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_DEFAULT,
+                        help=f"Empeoramiento tolerado de la mediana (por defecto {UMBRAL_DEFAULT:.0%})")
+    parser.add_argument("--no-guardar", action="store_true", help="No agregar esta ejecución al historial")
+    parser.add_argument("--headless", action="store_true", help="Ejecutar sin mostrar el navegador")
+    args = parser.parse_args()
+    desconocidos = [f for f in args.flujos if f not in FLUJOS]
+    if desconocidos:
+        parser.error(f"Flujos desconocidos: {', '.join(desconocidos)} (usa --list)")
+    if args.k < 1:
+        parser.error("-k debe ser al menos 1")
+    return args
+
+
+def main():
+    """Función principal."""
+    args = parse_args()
+    if args.list:
+        for nombre in FLUJOS:
+            print(f"  • {nombre}")
+        return
+
+    nombres = args.flujos or list(FLUJOS)
+    base_url = load_env()[0]
+    historial = leer_historial()
+
+    # Los tiempos se comparan contra la línea base: siempre con la carga completa de la página
+    playwright, browser, context, page = get_page(headless=args.headless, filtro="full-fidelity")
+    api = None
+    resultados = {}
+    try:
+        login(page)
+        api = ApiBackend()
+        for nombre in nombres:
+            print(f"→ Midiendo {nombre} ({args.k} iteraciones)...")
+            resultados[nombre] = medir_flujo(nombre, page, api, args.k, args.calentamiento, base_url)
+    finally:
+        if api is not None:
+            api.close()
+        browser.close()
+        playwright.stop()
+
+    # Comparación
+    print("\n" + "=" * 78)
+    print("📊 BENCHMARK (segundos)")
+    print("=" * 78)
+    print(f"{'Flujo':<22}{'min':>8}{'mediana':>9}{'p95':>8}{'base':>9}{'cambio':>9}  Estado")
+    regresiones = []
+    fallidos = []
+    for nombre, stats in resultados.items():
+        base = linea_base(historial, base_url, nombre)
+        cambio = None
+        estado = "✓"
+        if stats["mediana"] is None:
+            estado = "✗ sin iteraciones exitosas"
+            fallidos.append(nombre)
+        else:
+            if base is not None:
+                cambio = stats["mediana"] / base["mediana"] - 1
+                if cambio > args.umbral:
+                    estado = "✗ REGRESIÓN"
+                    regresiones.append(nombre)
+            if stats["errores"]:
+                estado += f" ({stats['errores']} errores)"
+                fallidos.append(nombre)
+        print(
+            f"{nombre:<22}"
+            f"{stats['min'] if stats['min'] is not None else '-':>8}"
+            f"{stats['mediana'] if stats['mediana'] is not None else '-':>9}"
+            f"{stats['p95'] if stats['p95'] is not None else '-':>8}"
+            f"{base['mediana'] if base else '-':>9}"
+            f"{f'{cambio:+.0%}' if cambio is not None else '-':>9}  {estado}"
+        )
+    print("=" * 78)
+
+    aprobado = not regresiones and not fallidos
+    if not args.no_guardar:
+        guardar_ejecucion({
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "base_url": base_url,
+            "k": args.k,
+            "aprobado": aprobado,
+            "flujos": resultados,
+        })
+        print(f"Resultados agregados a {RUTA_HISTORIAL}")
+
+    if regresiones:
+        print(f"✗ Regresiones sobre el {args.umbral:.0%}: {', '.join(regresiones)}")
+    if fallidos:
+        print(f"✗ Flujos con errores: {', '.join(fallidos)}")
+    sys.exit(0 if aprobado else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Modo carga: varios cajeros simulados registrando ventas a la vez en /app/venta.
+
+Cada cajero es una página aislada (contexto propio) sobre un único navegador,
+todas manejadas desde un solo event loop con las acciones asyncio.
+Las llegadas de clientes siguen un proceso de Poisson con la tasa indicada;
+si todos los cajeros están ocupados, las ventas esperan en cola.
+
+Uso:
+    python carga.py --cajeros 10 --tasa 60 --duracion 300
+    python carga.py --cajeros 4 --tasa 0 --duracion 120          # Sin pausa: cada cajero encadena ventas
+    python carga.py --flujo mixto --base-url http://staging:4200 --api-url http://staging:8086
+    python carga.py --stub --latencia 'POST /venta/guardar=300-900'  # Contra el backend en memoria
+"""
+
+import argparse
+import asyncio
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from typing import List, Optional, TypedDict
+
+from actions.fabrica_actions import FabricaDatos
+from actions.seed_actions import FORMA_VENTA_DEFAULT
+from actions.venta_actions import ItemVenta
+from actions.venta_actions_async import (
+    crear_factura_electronica,
+    crear_factura_fisica,
+    crear_venta,
+)
+from core.browser_async import get_page, new_page
+from core.estadisticas import resumen
+from core.login import load_env
+from core.login_async import login
+from core.stub import agregar_argumentos as agregar_argumentos_stub
+from core.stub import servidor_desde_args
+
+FLUJOS = {
+    "venta": crear_venta,
+    "fisica": crear_factura_fisica,
+    "electronica": crear_factura_electronica,
+}
+
+# Unidades vendibles por producto sembrado, con margen para no agotar el stock
+VENTAS_POR_PRODUCTO = FORMA_VENTA_DEFAULT["cantidad"] - 10
+
+
+class ResultadoVenta(TypedDict):
+    """Resultado de una venta registrada por un cajero."""
+    cajero: int
+    flujo: str
+    espera: float  # segundos en cola antes de que un cajero la atendiera
+    duracion: float  # segundos desde que el cajero empieza hasta que la venta queda registrada
+    ok: bool
+    error: Optional[str]
+
+
+# -------------------------------------------------------------------
+# Llegadas
+# -------------------------------------------------------------------
+async def generar_llegadas(cola: asyncio.Queue, tasa: float, fin: float) -> None:
+    """Encola la hora de llegada de cada cliente (tasa en ventas/min) hasta `fin`."""
+    while True:
+        await asyncio.sleep(random.expovariate(tasa / 60))
+        ahora = time.perf_counter()
+        if ahora >= fin:
+            return
+        cola.put_nowait(ahora)
+
+
+async def siguiente_turno(cola: Optional[asyncio.Queue], fin: float) -> Optional[float]:
+    """
+    Hora de llegada de la próxima venta a atender, o None si terminó la prueba.
+    Sin cola (tasa 0) el cajero atiende de inmediato mientras dure la prueba.
+    """
+    if cola is None:
+        ahora = time.perf_counter()
+        return ahora if ahora < fin else None
+    return await cola.get()
+
+
+# -------------------------------------------------------------------
+# Cajeros
+# -------------------------------------------------------------------
+async def cajero(numero: int, page, cola, fin: float, flujo: str, cliente, productos, turnos,
+                 fabrica: FabricaDatos, resultados: List[ResultadoVenta], base_url: str) -> None:
+    """Atiende ventas hasta que se acaben los turnos."""
+    while True:
+        llegada = await siguiente_turno(cola, fin)
+        if llegada is None:
+            return
+
+        nombre_flujo = random.choice(list(FLUJOS)) if flujo == "mixto" else flujo
+        producto = productos[next(turnos) % len(productos)]
+        items: List[ItemVenta] = [{
+            "codigo": producto["codigo"],
+            "nombre": producto["nombre"],
+            "cantidad": 1,
+            "precio": float(FORMA_VENTA_DEFAULT["precioVenta"]),
+        }]
+
+        inicio = time.perf_counter()
+        error = None
+        try:
+            registro = await FLUJOS[nombre_flujo](page, cliente["cedula"], items)
+            id_venta = registro["id"] if nombre_flujo == "venta" else registro["numero_factura"]
+            if id_venta in (None, "N/A"):
+                error = "el backend no confirmó la venta"
+            else:
+                fabrica.registrar_venta(int(id_venta))
+        except Exception as e:
+            error = str(e).splitlines()[0] if str(e) else type(e).__name__
+            # Volver a un estado conocido para la siguiente venta
+            try:
+                await page.goto(f"{base_url}/app/principal")
+            except Exception:
+                pass
+        fin_venta = time.perf_counter()
+
+        resultados.append({
+            "cajero": numero,
+            "flujo": nombre_flujo,
+            "espera": inicio - llegada,
+            "duracion": fin_venta - inicio,
+            "ok": error is None,
+            "error": error,
+        })
+        marca = "✓" if error is None else f"✗ {error}"
+        print(f"[cajero {numero}] {nombre_flujo} {fin_venta - inicio:.2f}s {marca}")
+
+
+async def ejecutar_carga(args, cliente, productos, fabrica: FabricaDatos):
+    """Abre un contexto por cajero, inicia sesión y corre la prueba. Retorna (resultados, segundos, pendientes)."""
+    base_url = load_env()[0]
+    p, browser, context, page = await get_page(headless=not args.ver)
+    paginas = [page]
+    contextos = [context]
+    try:
+        for _ in range(args.cajeros - 1):
+            ctx, pag = await new_page(browser)
+            contextos.append(ctx)
+            paginas.append(pag)
+
+        # El primer login deja la sesión en cache; los demás la reutilizan
+        await login(paginas[0])
+        await asyncio.gather(*(login(pag) for pag in paginas[1:]))
+        print(f"✓ {args.cajeros} cajeros con sesión iniciada")
+
+        resultados: List[ResultadoVenta] = []
+        turnos = itertools.count()
+        inicio = time.perf_counter()
+        fin = inicio + args.duracion
+        cola = asyncio.Queue() if args.tasa > 0 else None
+
+        cajeros = [
+            asyncio.create_task(cajero(i + 1, pag, cola, fin, args.flujo, cliente, productos, turnos,
+                                       fabrica, resultados, base_url))
+            for i, pag in enumerate(paginas)
+        ]
+
+        pendientes = 0
+        if cola is not None:
+            await generar_llegadas(cola, args.tasa, fin)
+            # Las llegadas que nadie alcanzó a atender no cuentan como ventas
+            while not cola.empty():
+                cola.get_nowait()
+                pendientes += 1
+            for _ in cajeros:
+                cola.put_nowait(None)
+
+        await asyncio.gather(*cajeros)
+        return resultados, time.perf_counter() - inicio, pendientes
+    finally:
+        for ctx in contextos:
+            await ctx.close()
+        await browser.close()
+        await p.stop()
+
+
+# -------------------------------------------------------------------
+# Reporte
+# -------------------------------------------------------------------
+def imprimir_reporte(resultados: List[ResultadoVenta], segundos: float, pendientes: int, cajeros: int) -> None:
+    exitosas = [r for r in resultados if r["ok"]]
+    errores = len(resultados) - len(exitosas)
+    tasa_error = errores / len(resultados) * 100 if resultados else 0.0
+    latencia = resumen([r["duracion"] for r in exitosas])
+    espera = resumen([r["espera"] for r in resultados])
+
+    print("\n" + "=" * 60)
+    print("📊 RESUMEN DE CARGA")
+    print("=" * 60)
+    print(f"Duración: {segundos:.1f}s | Cajeros: {cajeros}")
+    print(f"Ventas atendidas: {len(resultados)} | Sin atender al terminar: {pendientes}")
+    print(f"✓ Exitosas: {len(exitosas)} | ✗ Errores: {errores} ({tasa_error:.1f}%)")
+    print(f"Throughput: {len(exitosas) / (segundos / 60):.1f} ventas/min")
+    print(
+        f"Latencia por venta (s): p50 {latencia['p50']:.2f} | p95 {latencia['p95']:.2f} | "
+        f"p99 {latencia['p99']:.2f} | max {latencia['max']:.2f}"
+    )
+    print(f"Espera en cola (s): p50 {espera['p50']:.2f} | p95 {espera['p95']:.2f}")
+
+    motivos = {}
+    for r in resultados:
+        if not r["ok"]:
+            motivos[r["error"]] = motivos.get(r["error"], 0) + 1
+    for motivo, cantidad in sorted(motivos.items(), key=lambda m: -m[1]):
+        print(f"  {cantidad:>4} × {motivo}")
+    print("=" * 60)
+
+
+# -------------------------------------------------------------------
+# Entrada
+# -------------------------------------------------------------------
+def parse_args():
+    """Interpreta los argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Simula varios cajeros registrando ventas a la vez.")
+    parser.add_argument("--cajeros", type=int, default=5, help="Cajeros simultáneos (por defecto 5)")
+    parser.add_argument("--tasa", type=float, default=30,
+                        help="Llegadas de clientes por minuto entre todos los cajeros; 0 = sin pausa")
+    parser.add_argument("--duracion", type=float, default=120, help="Segundos de prueba (por defecto 120)")
+    parser.add_argument("--flujo", choices=[*FLUJOS, "mixto"], default="venta")
+    parser.add_argument("--base-url", help="URL del frontend; reemplaza BASE_URL del .env")
+    parser.add_argument("--api-url", help="URL del backend; reemplaza API_URL del .env")
+    parser.add_argument("--ver", action="store_true", help="Mostrar el navegador")
+    agregar_argumentos_stub(parser)
+    args = parser.parse_args()
+    if args.cajeros < 1:
+        parser.error("--cajeros debe ser al menos 1")
+    if not args.stub and (args.latencia or args.falla):
+        parser.error("--latencia y --falla requieren --stub")
+    return args
+
+
+def productos_necesarios(args) -> int:
+    """Productos a sembrar para que el stock alcance para toda la prueba."""
+    if args.tasa > 0:
+        esperadas = args.tasa * args.duracion / 60
+    else:
+        # Sin pausa: estimación generosa de una venta cada 5 s por cajero
+        esperadas = args.cajeros * args.duracion / 5
+    return max(args.cajeros, math.ceil(esperadas * 1.5 / VENTAS_POR_PRODUCTO))
+
+
+def main():
+    """Función principal."""
+    args = parse_args()
+    # load_dotenv no pisa variables ya definidas, así que estas tienen prioridad sobre el .env
+    if args.base_url:
+        os.environ["BASE_URL"] = args.base_url
+    if args.api_url:
+        os.environ["API_URL"] = args.api_url
+    stub = servidor_desde_args(args)
+    if stub is not None:
+        print(f"✓ Backend stub escuchando en {stub.url}")
+
+    fabrica = None
+    try:
+        fabrica = FabricaDatos()
+        cliente = fabrica.crear_clientes(1)
+        productos = fabrica.crear_productos(productos_necesarios(args))
+        if not cliente or not productos:
+            raise RuntimeError("No se pudieron sembrar los datos de la prueba")
+        print(f"✓ Sembrados 1 cliente y {len(productos)} productos")
+
+        resultados, segundos, pendientes = asyncio.run(ejecutar_carga(args, cliente[0], productos, fabrica))
+        imprimir_reporte(resultados, segundos, pendientes, args.cajeros)
+    except KeyboardInterrupt:
+        print("\n⚠ Prueba interrumpida")
+        sys.exit(130)
+    except Exception as e:
+        print(f"✗ ERROR: {e}")
+        sys.exit(1)
+    finally:
+        if fabrica is not None:
+            borrados = fabrica.limpiar()
+            print(f"Limpieza: {borrados} registros eliminados")
+            fabrica.api.close()
+        if stub is not None:
+            stub.detener()
+
+
+if __name__ == "__main__":
+    main()
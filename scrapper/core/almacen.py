@@ -0,0 +1,313 @@
+"""
+Historial de ejecuciones en SQLite (.metricas/historial.db): runs, tests, pasos, red y vitales.
+
+Los archivos JSONL de cada ejecución (core.metricas, core.red, core.vitales) siguen siendo
+la fuente del reporte de esa ejecución; esta base los acumula entre ejecuciones para consultas como
+
+    percentil_paso("crear_venta", 95, ultimas=30)    # p95 de un paso en las últimas 30 ejecuciones
+    pasos_mas_lentos(dias=7)                         # pasos cuya mediana empeoró esta semana
+
+Cada proceso junta los registros en memoria y los escribe de a TAMANO_LOTE en una sola
+transacción (y lo pendiente al terminar el proceso). La base está en modo WAL, así que los
+workers de run_tests escriben a la vez sin bloquear a quien consulta.
+Con SCRAPPER_ALMACEN=0 no se registra nada.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import statistics
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from core.estadisticas import percentil
+
+ENV_ALMACEN = "SCRAPPER_ALMACEN"
+RUTA_ALMACEN = Path(__file__).resolve().parent.parent / ".metricas" / "historial.db"
+TAMANO_LOTE = 200
+# Espera máxima por el lock de escritura cuando otro worker está confirmando su lote
+TIMEOUT_BLOQUEO_S = 30
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run TEXT PRIMARY KEY,
+    inicio REAL,
+    total INTEGER,
+    pasaron INTEGER,
+    fallaron INTEGER,
+    errores INTEGER,
+    omitidos INTEGER,
+    duracion_s REAL  -- tiempo de reloj de la ejecución completa (no la suma de los tests)
+);
+CREATE TABLE IF NOT EXISTS tests (
+    run TEXT NOT NULL,
+    test TEXT NOT NULL,  -- ruta relativa a scrapper/ (core.ejecucion.test_actual), igual en todas las tablas
+    estado TEXT NOT NULL,
+    inicio REAL,
+    duracion_s REAL,
+    motivo TEXT,
+    PRIMARY KEY (run, test)
+);
+CREATE TABLE IF NOT EXISTS pasos (
+    run TEXT NOT NULL,
+    test TEXT,
+    paso TEXT NOT NULL,  -- módulo.función
+    funcion TEXT,  -- solo el nombre de la función, para buscar un paso sin su módulo
+    padre TEXT,
+    profundidad INTEGER,
+    inicio REAL,
+    duracion_s REAL,
+    llamadas_playwright INTEGER,
+    espera_fija_s REAL,
+    peticiones INTEGER,
+    ok INTEGER,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS red (
+    run TEXT NOT NULL,
+    test TEXT,
+    metodo TEXT,
+    endpoint TEXT,
+    url TEXT,
+    estado INTEGER,
+    error TEXT,
+    dns_ms REAL,
+    conexion_ms REAL,
+    tls_ms REAL,
+    espera_ms REAL,
+    descarga_ms REAL,
+    total_ms REAL,
+    bytes_enviados INTEGER,
+    bytes_recibidos INTEGER
+);
+CREATE TABLE IF NOT EXISTS vitales (
+    run TEXT NOT NULL,
+    test TEXT,
+    ruta TEXT,
+    tipo TEXT,
+    inicio REAL,
+    duracion_s REAL,
+    fcp_ms REAL,
+    lcp_ms REAL,
+    navegacion TEXT,  -- JSON
+    cls REAL,
+    tareas_largas INTEGER,
+    ms_tareas_largas REAL,
+    heap_mb REAL
+);
+CREATE INDEX IF NOT EXISTS pasos_por_nombre ON pasos (paso, inicio);
+CREATE INDEX IF NOT EXISTS pasos_por_inicio ON pasos (inicio);
+CREATE INDEX IF NOT EXISTS pasos_por_run ON pasos (run);
+CREATE INDEX IF NOT EXISTS red_por_endpoint ON red (endpoint, run);
+CREATE INDEX IF NOT EXISTS vitales_por_ruta ON vitales (ruta, inicio);
+"""
+
+# Columnas de cada tabla que se llenan desde los registros (las claves de más se ignoran)
+_COLUMNAS: Dict[str, Tuple[str, ...]] = {
+    "pasos": ("run", "test", "paso", "funcion", "padre", "profundidad", "inicio", "duracion_s",
+              "llamadas_playwright", "espera_fija_s", "peticiones", "ok", "error"),
+    "red": ("run", "test", "metodo", "endpoint", "url", "estado", "error", "dns_ms", "conexion_ms",
+            "tls_ms", "espera_ms", "descarga_ms", "total_ms", "bytes_enviados", "bytes_recibidos"),
+    "vitales": ("run", "test", "ruta", "tipo", "inicio", "duracion_s", "fcp_ms", "lcp_ms", "navegacion",
+                "cls", "tareas_largas", "ms_tareas_largas", "heap_mb"),
+}
+
+_lock_lote = threading.Lock()
+# tabla -> filas pendientes de escribir
+_pendientes: Dict[str, List[tuple]] = defaultdict(list)
+_esquema_creado = set()
+
+
+def habilitado() -> bool:
+    return os.getenv(ENV_ALMACEN, "1") != "0"
+
+
+def funcion_de_paso(paso: str) -> str:
+    """'actions.venta_actions.crear_venta' -> 'crear_venta'."""
+    return paso.rsplit(".", 1)[-1]
+
+
+def _migrar(conexion: sqlite3.Connection) -> None:
+    """Agrega a una base de versiones anteriores la columna pasos.funcion (y la llena)."""
+    columnas = {fila[1] for fila in conexion.execute("PRAGMA table_info(pasos)")}
+    with conexion:
+        if "funcion" not in columnas:
+            conexion.execute("ALTER TABLE pasos ADD COLUMN funcion TEXT")
+            conexion.executemany(
+                "UPDATE pasos SET funcion = ? WHERE paso = ?",
+                [(funcion_de_paso(paso), paso) for (paso,) in conexion.execute("SELECT DISTINCT paso FROM pasos")],
+            )
+        # Después de la columna: en una base vieja no existe hasta el ALTER
+        conexion.execute("CREATE INDEX IF NOT EXISTS pasos_por_funcion ON pasos (funcion, inicio)")
+
+
+def conectar(ruta: Path = None) -> sqlite3.Connection:
+    """Conexión a la base (la crea si no existe) en modo WAL."""
+    ruta = ruta or RUTA_ALMACEN
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    conexion = sqlite3.connect(ruta, timeout=TIMEOUT_BLOQUEO_S)
+    conexion.execute("PRAGMA journal_mode=WAL")
+    # En WAL, NORMAL no pierde consistencia ante un corte; solo las últimas transacciones
+    conexion.execute("PRAGMA synchronous=NORMAL")
+    if ruta not in _esquema_creado:
+        conexion.executescript(_ESQUEMA)
+        _migrar(conexion)
+        _esquema_creado.add(ruta)
+    return conexion
+
+
+def _valor(valor):
+    return json.dumps(valor, ensure_ascii=False) if isinstance(valor, (dict, list)) else valor
+
+
+# -------------------------------------------------------------------
+# Escritura por lotes
+# -------------------------------------------------------------------
+def registrar(tabla: str, registro: dict) -> None:
+    """Encola un registro de pasos, red o vitales; se escribe con el lote."""
+    if not habilitado():
+        return
+    if tabla == "pasos":
+        registro = {**registro, "funcion": funcion_de_paso(registro["paso"])}
+    fila = tuple(_valor(registro.get(columna)) for columna in _COLUMNAS[tabla])
+    with _lock_lote:
+        _pendientes[tabla].append(fila)
+        lleno = sum(len(filas) for filas in _pendientes.values()) >= TAMANO_LOTE
+    if lleno:
+        vaciar()
+
+
+def vaciar() -> None:
+    """Escribe lo pendiente en una transacción. Un error se avisa y descarta el lote (quedan los JSONL)."""
+    with _lock_lote:
+        lote = {tabla: filas for tabla, filas in _pendientes.items() if filas}
+        _pendientes.clear()
+    if not lote:
+        return
+    try:
+        conexion = conectar()
+        try:
+            with conexion:
+                for tabla, filas in lote.items():
+                    columnas = _COLUMNAS[tabla]
+                    conexion.executemany(
+                        f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({', '.join('?' * len(columnas))})",
+                        filas,
+                    )
+        finally:
+            conexion.close()
+    except sqlite3.Error as e:
+        print(f"⚠ No se pudo escribir el historial ({sum(map(len, lote.values()))} registros): {e}")
+
+
+atexit.register(vaciar)
+
+
+def guardar_ejecucion(id_ejecucion: str, resultados: List[dict], duracion_s: float = None) -> None:
+    """
+    Registra la ejecución y el resultado de cada test (core.resultados) en una transacción.
+    `duracion_s` es el tiempo de reloj de la ejecución; sin él se toma desde el primer test
+    que arrancó hasta el último que terminó (con workers en paralelo, no es la suma de los tests).
+    """
+    if not habilitado():
+        return
+    inicios = [r["inicio"] for r in resultados if r.get("inicio")]
+    if duracion_s is None:
+        finales = [r["inicio"] + r["duracion_s"] for r in resultados if r.get("inicio")]
+        duracion_s = max(finales) - min(inicios) if inicios else 0.0
+    try:
+        conexion = conectar()
+        try:
+            with conexion:
+                conexion.execute(
+                    "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        id_ejecucion,
+                        min(inicios) if inicios else time.time(),
+                        len(resultados),
+                        sum(r["estado"] == "paso" for r in resultados),
+                        sum(r["estado"] == "fallo" for r in resultados),
+                        sum(r["estado"] == "error" for r in resultados),
+                        sum(r["estado"] == "omitido" for r in resultados),
+                        round(duracion_s, 3),
+                    ),
+                )
+                conexion.executemany(
+                    "INSERT OR REPLACE INTO tests VALUES (?, ?, ?, ?, ?, ?)",
+                    [(id_ejecucion, r["test"], r["estado"], r.get("inicio"), r["duracion_s"], r.get("motivo"))
+                     for r in resultados],
+                )
+        finally:
+            conexion.close()
+    except sqlite3.Error as e:
+        print(f"⚠ No se pudo guardar la ejecución en el historial: {e}")
+
+
+# -------------------------------------------------------------------
+# Consultas
+# -------------------------------------------------------------------
+def _nombre_paso(paso: str) -> Tuple[str, tuple]:
+    """
+    Condición para buscar un paso por nombre completo (módulo.función) o solo por el de la función.
+    Las dos son igualdades sobre columnas indexadas (pasos_por_nombre, pasos_por_funcion).
+    """
+    if "." in paso:
+        return "paso = ?", (paso,)
+    return "funcion = ?", (paso,)
+
+
+def percentil_paso(paso: str, p: float = 95, ultimas: int = 30, ruta: Path = None) -> Optional[float]:
+    """Percentil p de la duración de un paso exitoso en las últimas `ultimas` ejecuciones que lo usaron."""
+    condicion, parametros = _nombre_paso(paso)
+    conexion = conectar(ruta)
+    try:
+        duraciones = [fila[0] for fila in conexion.execute(
+            f"""
+            SELECT duracion_s FROM pasos
+            WHERE {condicion} AND ok = 1 AND run IN (
+                SELECT run FROM pasos WHERE {condicion}
+                GROUP BY run ORDER BY MAX(inicio) DESC LIMIT ?
+            )
+            """,
+            (*parametros, *parametros, ultimas),
+        )]
+    finally:
+        conexion.close()
+    return percentil(duraciones, p) if duraciones else None
+
+
+def pasos_mas_lentos(dias: int = 7, minimo: int = 5, ruta: Path = None) -> List[dict]:
+    """
+    Pasos cuya mediana en los últimos `dias` empeoró respecto de los `dias` anteriores,
+    del que más empeoró al que menos. Solo pasos exitosos con al menos `minimo` muestras por período.
+    """
+    corte = time.time() - dias * 86400
+    muestras = defaultdict(lambda: ([], []))
+    conexion = conectar(ruta)
+    try:
+        for paso, duracion, reciente in conexion.execute(
+            "SELECT paso, duracion_s, inicio >= ? FROM pasos WHERE inicio >= ? AND ok = 1",
+            (corte, corte - dias * 86400),
+        ):
+            muestras[paso][1 if reciente else 0].append(duracion)
+    finally:
+        conexion.close()
+
+    empeorados = []
+    for paso, (antes, ahora) in muestras.items():
+        if len(antes) < minimo or len(ahora) < minimo:
+            continue
+        mediana_antes, mediana_ahora = statistics.median(antes), statistics.median(ahora)
+        if mediana_antes > 0 and mediana_ahora > mediana_antes:
+            empeorados.append({
+                "paso": paso,
+                "antes_s": round(mediana_antes, 4),
+                "ahora_s": round(mediana_ahora, 4),
+                "cambio": round(mediana_ahora / mediana_antes - 1, 4),
+                "muestras": len(ahora),
+            })
+    return sorted(empeorados, key=lambda e: e["cambio"], reverse=True)
@@ -0,0 +1,128 @@
+"""
+Cliente HTTP autenticado contra el backend.
+Usa el mismo JWT que la UI: el de la sesión cacheada por core.login si sigue vigente,
+o uno nuevo obtenido con POST /usuarios/login.
+Con SCRAPPER_STUB las peticiones van al backend local de core.stub en lugar de API_URL.
+"""
+
+import json
+import os
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from core.endpoints import USUARIOS_LOGIN
+from core.login import cargar_sesion, load_env, token_de_estado
+from core.stub import url_stub
+
+TIMEOUT_HTTP = 30
+
+
+def load_api_url() -> str:
+    """Lee la URL del backend (API_URL) desde el .env."""
+    load_dotenv()
+    api_url = os.getenv("API_URL")
+    if not api_url:
+        raise RuntimeError("Falta variable en .env: API_URL")
+    return api_url.rstrip("/")
+
+
+def _usuario_de_estado(estado: dict):
+    """El frontend guarda el id del usuario en localStorage bajo la clave 'id'."""
+    for origen in estado.get("origins", []):
+        for item in origen.get("localStorage", []):
+            if item.get("name") == "id":
+                try:
+                    return int(json.loads(item["value"]))
+                except (TypeError, ValueError):
+                    return None
+    return None
+
+
+def obtener_credenciales(api_url: str):
+    """
+    Retorna (token, id_usuario).
+    Reutiliza la sesión cacheada por el login de la UI si sigue vigente.
+    """
+    base_url, username, password = load_env()
+
+    estado = cargar_sesion(base_url, username)
+    if estado is not None:
+        token = token_de_estado(estado)
+        if token:
+            return token, _usuario_de_estado(estado)
+
+    resp = requests.post(
+        f"{api_url}{USUARIOS_LOGIN}",
+        json={"email": username, "contrasena": password},
+        timeout=TIMEOUT_HTTP,
+    )
+    if not resp.ok:
+        raise RuntimeError(f"Login por API falló ({resp.status_code}): {resp.text}")
+    usuario = resp.json()
+    if not usuario.get("token"):
+        raise RuntimeError("El login por API no devolvió token")
+    return usuario["token"], usuario.get("id")
+
+
+class ApiBackend:
+    """Sesión HTTP autenticada (con pool de conexiones) contra la API del backend."""
+
+    def __init__(self, api_url: str = None, token: str = None, usuario_id: int = None, pool: int = 10):
+        # Import diferido: core.har depende de este módulo
+        from core.har import GrabacionApi
+
+        self.api_url = (api_url or url_stub() or load_api_url()).rstrip("/")
+        # Respuestas grabadas o por grabar (SCRAPPER_HAR); None en una ejecución normal
+        self.grabacion = GrabacionApi.desde_entorno()
+        if self.grabacion is not None and self.grabacion.reproduciendo:
+            token = token or "reproduccion"
+            usuario_id = usuario_id or self.grabacion.usuario_id
+        elif token is None:
+            token, usuario_id = obtener_credenciales(self.api_url)
+        self.usuario_id = usuario_id
+
+        self.session = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=pool, pool_maxsize=pool)
+        self.session.mount("http://", adaptador)
+        self.session.mount("https://", adaptador)
+        self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def request(self, metodo: str, ruta: str, **kwargs):
+        """
+        Ejecuta la petición y retorna el cuerpo parseado (JSON, texto o None si está vacío).
+        Lanza RuntimeError si el backend responde con un estado de error.
+        """
+        if self.grabacion is not None and self.grabacion.reproduciendo:
+            return self.grabacion.responder(metodo, ruta)
+
+        kwargs.setdefault("timeout", TIMEOUT_HTTP)
+        resp = self.session.request(metodo, f"{self.api_url}{ruta}", **kwargs)
+        if not resp.ok:
+            raise RuntimeError(f"{metodo} {ruta} respondió {resp.status_code}: {resp.text}")
+        cuerpo = None
+        if resp.content:
+            try:
+                cuerpo = resp.json()
+            except ValueError:
+                cuerpo = resp.text
+
+        if self.grabacion is not None:
+            self.grabacion.registrar(metodo, ruta, cuerpo, self.usuario_id)
+        return cuerpo
+
+    def get(self, ruta: str, **kwargs):
+        return self.request("GET", ruta, **kwargs)
+
+    def post(self, ruta: str, **kwargs):
+        return self.request("POST", ruta, **kwargs)
+
+    def put(self, ruta: str, **kwargs):
+        return self.request("PUT", ruta, **kwargs)
+
+    def delete(self, ruta: str, **kwargs):
+        return self.request("DELETE", ruta, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
@@ -1,10 +1,56 @@
+import os
+import socket
+
 from playwright.sync_api import sync_playwright
 
+from core.filtros import instalar_filtro
+from core.har import opciones_contexto, preparar_contexto
+from core.red import instalar_grabador
+from core.stub import redirigir_api
+from core.vitales import instalar_vitales
+
+# endpoint CDP de un chromium compartido; lo publica run_tests.py con --browser-server
+ENV_BROWSER_ENDPOINT = "SCRAPPER_BROWSER_ENDPOINT"
+
+
 # crea contexto y devuelve page
+# si hay un chromium compartido se conecta a él y solo crea un contexto nuevo (aislado)
+# filtro: preset de core.filtros ("crud-only", "full-fidelity"); por defecto el de SCRAPPER_FILTRO
 
-def get_page(headless: bool = False):
+def get_page(headless: bool = False, filtro=None):
     p = sync_playwright().start()
-    browser = p.chromium.launch(headless=headless)
-    context = browser.new_context()
+    endpoint = os.getenv(ENV_BROWSER_ENDPOINT)
+    if endpoint:
+        # browser.close() sobre un navegador conectado cierra sus contextos y se desconecta,
+        # el proceso compartido sigue vivo para los demás tests
+        browser = p.chromium.connect_over_cdp(endpoint)
+    else:
+        browser = p.chromium.launch(headless=headless)
+    context = browser.new_context(**opciones_contexto())
+    redirigir_api(context)
+    preparar_contexto(context)
+    instalar_filtro(context, filtro)
+    instalar_vitales(context)
+    instalar_grabador(context)
     page = context.new_page()
     return p, browser, context, page
+
+
+def _puerto_libre() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# lanza un chromium que se comparte entre procesos y devuelve su endpoint CDP
+# quien lo lanza debe cerrarlo con browser.close() y p.stop()
+
+def lanzar_navegador_compartido(headless: bool = False, puerto: int = 0):
+    puerto = puerto or _puerto_libre()
+    p = sync_playwright().start()
+    browser = p.chromium.launch(
+        headless=headless,
+        args=[f"--remote-debugging-port={puerto}", "--remote-debugging-address=127.0.0.1"],
+    )
+    endpoint = f"http://127.0.0.1:{puerto}"
+    return p, browser, endpoint
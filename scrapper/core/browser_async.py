@@ -0,0 +1,76 @@
+import os
+
+from playwright.async_api import async_playwright
+
+from core.browser import ENV_BROWSER_ENDPOINT
+from core.filtros import criterio_de_bloqueo
+from core.har import ENV_HAR, modo, opciones_contexto
+from core.har_async import preparar_contexto
+from core.red_async import instalar_grabador
+from core.stub import patron_redireccion, url_redirigida
+from core.vitales_async import instalar_vitales
+
+
+# variante asyncio de core.browser: permite manejar muchas páginas en un solo event loop
+
+# desvía al stub (SCRAPPER_STUB) las peticiones de la app a API_URL, como core.stub.redirigir_api
+async def _redirigir_api(context):
+    patron = patron_redireccion()
+    if patron is None:
+        return
+
+    async def desviar(route):
+        await route.continue_(url=url_redirigida(route.request.url))
+
+    await context.route(patron, desviar)
+
+
+# aborta las peticiones del preset de core.filtros, como core.filtros.instalar_filtro
+async def _instalar_filtro(context, filtro):
+    bloquear = criterio_de_bloqueo(filtro)
+    if bloquear is None:
+        return
+
+    async def filtrar(route):
+        if bloquear(route.request):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    await context.route("**/*", filtrar)
+
+
+# contexto con los mismos ganchos que core.browser.get_page: stub, HAR, filtro, vitales y grabador de red
+async def _nuevo_contexto(browser, filtro):
+    context = await browser.new_context(**opciones_contexto())
+    await _redirigir_api(context)
+    await preparar_contexto(context)
+    await _instalar_filtro(context, filtro)
+    await instalar_vitales(context)
+    instalar_grabador(context)
+    return context
+
+
+# crea contexto y devuelve page
+async def get_page(headless: bool = False, filtro=None):
+    p = await async_playwright().start()
+    endpoint = os.getenv(ENV_BROWSER_ENDPOINT)
+    if endpoint:
+        browser = await p.chromium.connect_over_cdp(endpoint)
+    else:
+        browser = await p.chromium.launch(headless=headless)
+    context = await _nuevo_contexto(browser, filtro)
+    page = await context.new_page()
+    return p, browser, context, page
+
+
+# abre una página más (con su propio contexto aislado) sobre un navegador ya lanzado;
+# es lo que permite simular varios usuarios sin un proceso por usuario
+async def new_page(browser, filtro=None):
+    # cada contexto que graba escribe .har/<test>.har al cerrarse: varios se pisarían entre sí
+    if modo() == "grabar":
+        raise RuntimeError(f"{ENV_HAR}=grabar solo admite un contexto por proceso (get_page); "
+                           "graba con un test de un solo usuario y reproduce aquí")
+    context = await _nuevo_contexto(browser, filtro)
+    page = await context.new_page()
+    return context, page
@@ -0,0 +1,57 @@
+"""
+Identificador de la ejecución y archivos de .metricas/ compartidos por los tests y run_tests.
+
+Solo usa la biblioteca estándar: run_tests escribe los reportes de resultados sin Playwright
+en su proceso. core.metricas (que sí instrumenta Playwright) reexporta estos nombres.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ENV_RUN_ID = "SCRAPPER_RUN_ID"
+ENV_METRICAS = "SCRAPPER_METRICAS"
+# Las rutas de los tests se guardan relativas a scrapper/, igual que en run_tests.TESTS
+DIR_BASE = Path(__file__).resolve().parent.parent
+DIR_METRICAS = DIR_BASE / ".metricas"
+
+
+def habilitadas() -> bool:
+    return os.getenv(ENV_METRICAS, "1") != "0"
+
+
+def run_id() -> str:
+    """Identificador de la ejecución; se fija en el entorno para que lo hereden los subprocesos."""
+    valor = os.getenv(ENV_RUN_ID)
+    if not valor:
+        valor = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        os.environ[ENV_RUN_ID] = valor
+    return valor
+
+
+def ruta_test(ruta: str) -> str:
+    """Ruta de un script de test relativa a scrapper/ (como la lista run_tests)."""
+    absoluta = Path(ruta).resolve()
+    try:
+        return absoluta.relative_to(DIR_BASE).as_posix()
+    except ValueError:
+        return absoluta.as_posix()
+
+
+def test_actual() -> str:
+    """
+    Test del proceso actual, con la misma clave en todos los registros (resultados, pasos,
+    red, vitales) para poder cruzarlos en el historial.
+    """
+    return ruta_test(sys.argv[0])
+
+
+def leer_jsonl(ruta: Path) -> List[dict]:
+    """Registros de un archivo JSONL de .metricas/ (lista vacía si no existe)."""
+    if not ruta.exists():
+        return []
+    with ruta.open(encoding="utf-8") as f:
+        return [json.loads(linea) for linea in f if linea.strip()]
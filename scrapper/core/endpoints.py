@@ -0,0 +1,102 @@
+"""
+Endpoints del backend que consumen los flujos del scrapper.
+Un fragmento que termina en "/" es un prefijo (el resto de la ruta es un ID);
+los demás deben coincidir con el final de la ruta.
+"""
+
+import re
+from urllib.parse import urlparse
+
+# Login
+USUARIOS_LOGIN = "/usuarios/login"
+
+# Clientes
+CLIENTES_GUARDAR = "/clientes/guardar"
+CLIENTES_ACTUALIZAR = "/clientes/actualizar/"
+CLIENTES_ELIMINAR = "/clientes/eliminar/"
+CLIENTES_TODOS = "/clientes/todos"
+CLIENTES_POR_CEDULA = "/clientes/"  # + cédula; solo para peticiones directas a la API
+CLIENTES_PAGINA = "/clientes"  # ?page=&size=; Page<ClienteDTO>
+CLIENTES_VERIFICAR_CAMBIOS = "/clientes/verificar-cambios"
+CLIENTES_VERIFICAR = "/clientes/verificar-cliente/"  # + cédula
+CLIENTES_VERIFICAR_ELIMINADO = "/clientes/verificar-eliminado/"  # + cédula
+CLIENTES_RECUPERAR = "/clientes/recuperar-cliente/"  # + cédula
+
+# Productos
+PRODUCTOS_GUARDAR = "/productos/guardar"
+PRODUCTOS_ACTUALIZAR = "/productos/actualizar"
+PRODUCTOS_ELIMINAR = "/productos/eliminar/"
+PRODUCTOS_TODOS = "/productos/todos"
+PRODUCTOS_TIPOS_IMPUESTOS = "/productos/tipos-impuestos"
+PRODUCTOS_OBTENER = "/productos/obtener-producto/"
+PRODUCTOS_PAGINA = "/productos"  # ?page=&size=; Page<ProductoDTO>
+PRODUCTOS_VERIFICAR_CAMBIOS = "/productos/verificar-cambios"
+PRODUCTOS_VERIFICAR_CODIGO = "/productos/verificar-cod-producto/"  # + código
+PRODUCTOS_VERIFICAR_CANTIDAD = "/productos/verificar-cantidad/"  # + cantidad/código/forma de venta
+PRODUCTOS_FUE_ELIMINADO = "/productos/fue-eliminado/"  # + código
+PRODUCTOS_RECUPERAR = "/productos/recuperar-producto/"  # + código
+PRODUCTOS_OBTENER_COMPLETO = "/productos/obtener-producto-completo/"  # + código
+PRODUCTOS_FORMAS_VENTA = "/productos/obtener-formas-venta/"  # + código
+PRODUCTOS_ELIMINAR_FORMA_VENTA = "/productos/eliminar-forma-venta/"  # + código/nombre de la forma
+
+# Ventas y facturas
+VENTA_GUARDAR = "/venta/guardar"
+VENTA_OBTENER = "/venta/obtener-ventas"
+VENTA_CANCELAR = "/venta/cancelar/"
+VENTA_SIGUIENTE_ID = "/venta/siguiente-id"
+FACTURA_GUARDAR = "/factura/guardar"
+EFACTURA_GUARDAR = "/efactura/guardar"
+
+# Endpoints sin ID que comparten prefijo con una ruta que sí lo lleva (/clientes/<cédula>)
+_ENDPOINTS_FIJOS = (
+    CLIENTES_GUARDAR,
+    CLIENTES_TODOS,
+    CLIENTES_VERIFICAR_CAMBIOS,
+)
+# Prefijos cuyos segmentos siguientes son IDs (o códigos, cédulas, nombres) y no parte del endpoint.
+# CLIENTES_POR_CEDULA va al final: es prefijo de todas las rutas de clientes.
+_PREFIJOS_CON_ID = (
+    CLIENTES_ACTUALIZAR,
+    CLIENTES_ELIMINAR,
+    CLIENTES_VERIFICAR,
+    CLIENTES_VERIFICAR_ELIMINADO,
+    CLIENTES_RECUPERAR,
+    PRODUCTOS_ELIMINAR,
+    PRODUCTOS_OBTENER,
+    PRODUCTOS_OBTENER_COMPLETO,
+    PRODUCTOS_VERIFICAR_CODIGO,
+    PRODUCTOS_VERIFICAR_CANTIDAD,
+    PRODUCTOS_FUE_ELIMINADO,
+    PRODUCTOS_RECUPERAR,
+    PRODUCTOS_FORMAS_VENTA,
+    PRODUCTOS_ELIMINAR_FORMA_VENTA,
+    VENTA_CANCELAR,
+    CLIENTES_POR_CEDULA,
+)
+_SEGMENTO_NUMERICO = re.compile(r"/\d+(?=/|$)")
+
+
+def coincide_endpoint(url: str, fragmento: str) -> bool:
+    """Indica si la URL de una petición corresponde al endpoint."""
+    ruta = urlparse(url).path
+    if fragmento.endswith("/"):
+        return fragmento in ruta
+    return ruta.endswith(fragmento)
+
+
+def normalizar_endpoint(url: str) -> str:
+    """
+    Ruta de la petición sin query string y con los IDs reemplazados por {id},
+    para agrupar todas las llamadas a un mismo endpoint:
+    /productos/obtener-producto/Q123 -> /productos/obtener-producto/{id}
+    /productos/verificar-cantidad/2/Q123/Unidad -> /productos/verificar-cantidad/{id}/{id}/{id}
+    """
+    ruta = urlparse(url).path
+    if any(ruta.endswith(fijo) for fijo in _ENDPOINTS_FIJOS):
+        return ruta
+    for prefijo in _PREFIJOS_CON_ID:
+        posicion = ruta.find(prefijo)
+        if posicion != -1 and len(ruta) > posicion + len(prefijo):
+            segmentos = ruta[posicion + len(prefijo):].count("/") + 1
+            return ruta[:posicion] + prefijo + "/".join(["{id}"] * segmentos)
+    return _SEGMENTO_NUMERICO.sub("/{id}", ruta)
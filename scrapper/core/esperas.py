@@ -0,0 +1,202 @@
+"""
+Esperas basadas en señales reales de la aplicación.
+Reemplazan las pausas fijas (wait_for_timeout) por condiciones observables:
+respuestas del backend, cambios en las filas de una tabla o estabilidad de Angular.
+"""
+
+import json
+from functools import reduce
+from typing import Dict, Optional
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from core.endpoints import coincide_endpoint
+
+TIMEOUT_RED = 30000
+TIMEOUT_UI = 10000
+
+# Angular (con zone.js) expone sus Testability en window: una app es estable
+# cuando no tiene XHR, timers ni tareas pendientes dentro de la zona.
+_JS_ANGULAR_ESTABLE = """
+() => {
+    const testabilidades = window.getAllAngularTestabilities
+        ? window.getAllAngularTestabilities()
+        : [];
+    if (testabilidades.length === 0) return document.readyState === 'complete';
+    return testabilidades.every(t => t.isStable());
+}
+"""
+
+_JS_CONTEO_DISTINTO = """
+([selector, previo]) => document.querySelectorAll(selector).length !== previo
+"""
+
+_JS_FILA_CON_TEXTO = """
+([selector, texto, presente]) => {
+    const hay = Array.from(document.querySelectorAll(selector))
+        .some(fila => fila.textContent.includes(texto));
+    return hay === presente;
+}
+"""
+
+
+# -------------------------------------------------------------------
+# Angular
+# -------------------------------------------------------------------
+def esperar_angular_estable(page, timeout: int = TIMEOUT_UI) -> bool:
+    """
+    Espera a que Angular no tenga trabajo pendiente (peticiones HTTP, timers, renderizado).
+    Retorna False si no se estabilizó dentro del timeout, sin lanzar excepción.
+    """
+    try:
+        page.wait_for_function(_JS_ANGULAR_ESTABLE, timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+# -------------------------------------------------------------------
+# Red
+# -------------------------------------------------------------------
+def respuesta_api(page, fragmento: str, metodo: str = None, timeout: int = TIMEOUT_RED):
+    """
+    Context manager que espera la respuesta de un endpoint del backend
+    (ver core.endpoints para la regla de coincidencia).
+    La acción que dispara la petición debe ejecutarse dentro del bloque:
+
+        with respuesta_api(page, "/clientes/guardar", "POST") as info:
+            page.click("button#azul")
+        respuesta = info.value
+    """
+    metodo = metodo.upper() if metodo else None
+
+    def _coincide(respuesta) -> bool:
+        if not coincide_endpoint(respuesta.url, fragmento):
+            return False
+        return metodo is None or respuesta.request.method == metodo
+
+    return page.expect_response(_coincide, timeout=timeout)
+
+
+def cuerpo_respuesta(respuesta):
+    """Parsea el cuerpo de una respuesta: JSON si es posible, texto si no, None si está vacío."""
+    try:
+        texto = respuesta.text()
+    except Exception:
+        return None
+    return _parsear_cuerpo(texto)
+
+
+def _parsear_cuerpo(texto: str):
+    if not texto:
+        return None
+    try:
+        return json.loads(texto)
+    except ValueError:
+        return texto
+
+
+def accion_con_respuesta(page, fragmento: str, accion, metodo: str = None, timeout: int = TIMEOUT_RED):
+    """
+    Ejecuta `accion` (callable sin argumentos) y espera la respuesta del endpoint que dispara.
+    Retorna el cuerpo parseado de la respuesta.
+    Lanza RuntimeError si el backend responde con un estado de error.
+    """
+    with respuesta_api(page, fragmento, metodo, timeout) as info:
+        accion()
+    respuesta = info.value
+    cuerpo = cuerpo_respuesta(respuesta)
+    if not respuesta.ok:
+        raise RuntimeError(
+            f"{respuesta.request.method} {respuesta.url} respondió {respuesta.status}: {cuerpo}"
+        )
+    return cuerpo
+
+
+# -------------------------------------------------------------------
+# Formularios
+# -------------------------------------------------------------------
+_JS_CONTROL_RESUELTO = "el => !el.classList.contains('ng-pending')"
+
+
+def esperar_control_valido(page, locator, timeout: int = TIMEOUT_UI) -> bool:
+    """
+    Espera a que un control de formulario de Angular termine sus validaciones
+    (incluidas las asíncronas, clase ng-pending) y retorna si quedó válido.
+    Un elemento sin clases de Angular se considera válido.
+    """
+    handle = locator.element_handle(timeout=timeout)
+    try:
+        page.wait_for_function(_JS_CONTROL_RESUELTO, arg=handle, timeout=timeout)
+        return handle.evaluate("el => !el.classList.contains('ng-invalid')")
+    except PlaywrightTimeoutError:
+        return False
+    finally:
+        handle.dispose()
+
+
+# -------------------------------------------------------------------
+# Tablas y DOM
+# -------------------------------------------------------------------
+def contar_elementos(page, selector: str = "tbody tr") -> int:
+    """Cuenta los elementos que coinciden con el selector en este momento."""
+    return page.locator(selector).count()
+
+
+def esperar_cambio_conteo(page, previo: int, selector: str = "tbody tr", timeout: int = TIMEOUT_UI) -> bool:
+    """Espera a que la cantidad de elementos del selector sea distinta de `previo`."""
+    try:
+        page.wait_for_function(_JS_CONTEO_DISTINTO, arg=[selector, previo], timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+def esperar_fila(page, texto: str, presente: bool = True, selector: str = "tbody tr",
+                 timeout: int = TIMEOUT_UI) -> bool:
+    """
+    Espera a que exista (presente=True) o deje de existir (presente=False)
+    una fila de la tabla que contenga el texto.
+    """
+    try:
+        page.wait_for_function(_JS_FILA_CON_TEXTO, arg=[selector, texto, presente], timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+def esperar_swal_cerrado(page, timeout: int = 5000) -> bool:
+    """Espera a que el popup de SweetAlert2 desaparezca."""
+    try:
+        page.wait_for_selector(".swal2-popup", state="hidden", timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+# -------------------------------------------------------------------
+# Alternativas
+# -------------------------------------------------------------------
+def _visible(raiz, selector: str):
+    return raiz.locator(f"{selector} >> visible=true")
+
+
+def primero_de(raiz, candidatos: Dict[str, str], timeout: int = TIMEOUT_UI) -> Optional[str]:
+    """
+    Espera a la vez a todos los selectores candidatos (bajo una página o un locator)
+    y retorna la clave del que se hizo visible; si hay varios visibles, el primero
+    en el orden de `candidatos`. Retorna None si ninguno aparece en `timeout`.
+
+    Reemplaza las cadenas de try/except en las que cada alternativa agotaba su propio
+    timeout antes de probar la siguiente: el peor caso cuesta lo mismo que el mejor.
+    """
+    visibles = {clave: _visible(raiz, selector) for clave, selector in candidatos.items()}
+    carrera = reduce(lambda a, b: a.or_(b), visibles.values())
+    try:
+        carrera.first.wait_for(state="attached", timeout=timeout)
+    except PlaywrightTimeoutError:
+        return None
+    for clave, locator in visibles.items():
+        if locator.count() > 0:
+            return clave
+    return None
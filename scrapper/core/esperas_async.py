@@ -0,0 +1,142 @@
+"""
+Variante asyncio de core.esperas.
+Mismas condiciones de espera (scripts y reglas de coincidencia compartidos) sobre playwright.async_api.
+"""
+
+from functools import reduce
+from typing import Dict, Optional
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from core.endpoints import coincide_endpoint
+from core.esperas import (
+    TIMEOUT_RED,
+    TIMEOUT_UI,
+    _JS_ANGULAR_ESTABLE,
+    _JS_CONTEO_DISTINTO,
+    _JS_CONTROL_RESUELTO,
+    _JS_FILA_CON_TEXTO,
+    _parsear_cuerpo,
+    _visible,
+)
+
+
+# -------------------------------------------------------------------
+# Angular
+# -------------------------------------------------------------------
+async def esperar_angular_estable(page, timeout: int = TIMEOUT_UI) -> bool:
+    """Espera a que Angular no tenga trabajo pendiente. Retorna False si no se estabilizó."""
+    try:
+        await page.wait_for_function(_JS_ANGULAR_ESTABLE, timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+# -------------------------------------------------------------------
+# Red
+# -------------------------------------------------------------------
+def respuesta_api(page, fragmento: str, metodo: str = None, timeout: int = TIMEOUT_RED):
+    """
+    Context manager asíncrono que espera la respuesta de un endpoint del backend:
+
+        async with respuesta_api(page, "/clientes/guardar", "POST") as info:
+            await page.click("button#azul")
+        respuesta = await info.value
+    """
+    metodo = metodo.upper() if metodo else None
+
+    def _coincide(respuesta) -> bool:
+        if not coincide_endpoint(respuesta.url, fragmento):
+            return False
+        return metodo is None or respuesta.request.method == metodo
+
+    return page.expect_response(_coincide, timeout=timeout)
+
+
+async def cuerpo_respuesta(respuesta):
+    """Parsea el cuerpo de una respuesta: JSON si es posible, texto si no, None si está vacío."""
+    try:
+        texto = await respuesta.text()
+    except Exception:
+        return None
+    return _parsear_cuerpo(texto)
+
+
+async def accion_con_respuesta(page, fragmento: str, accion, metodo: str = None, timeout: int = TIMEOUT_RED):
+    """
+    Ejecuta `accion` (función async sin argumentos) y espera la respuesta del endpoint que dispara.
+    Retorna el cuerpo parseado. Lanza RuntimeError si el backend responde con un estado de error.
+    """
+    async with respuesta_api(page, fragmento, metodo, timeout) as info:
+        await accion()
+    respuesta = await info.value
+    cuerpo = await cuerpo_respuesta(respuesta)
+    if not respuesta.ok:
+        raise RuntimeError(
+            f"{respuesta.request.method} {respuesta.url} respondió {respuesta.status}: {cuerpo}"
+        )
+    return cuerpo
+
+
+# -------------------------------------------------------------------
+# Formularios
+# -------------------------------------------------------------------
+async def esperar_control_valido(page, locator, timeout: int = TIMEOUT_UI) -> bool:
+    """Espera a que un control de Angular termine sus validaciones y retorna si quedó válido."""
+    handle = await locator.element_handle(timeout=timeout)
+    try:
+        await page.wait_for_function(_JS_CONTROL_RESUELTO, arg=handle, timeout=timeout)
+        return await handle.evaluate("el => !el.classList.contains('ng-invalid')")
+    except PlaywrightTimeoutError:
+        return False
+    finally:
+        await handle.dispose()
+
+
+# -------------------------------------------------------------------
+# Tablas y DOM
+# -------------------------------------------------------------------
+async def contar_elementos(page, selector: str = "tbody tr") -> int:
+    return await page.locator(selector).count()
+
+
+async def esperar_cambio_conteo(page, previo: int, selector: str = "tbody tr", timeout: int = TIMEOUT_UI) -> bool:
+    try:
+        await page.wait_for_function(_JS_CONTEO_DISTINTO, arg=[selector, previo], timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def esperar_fila(page, texto: str, presente: bool = True, selector: str = "tbody tr",
+                       timeout: int = TIMEOUT_UI) -> bool:
+    try:
+        await page.wait_for_function(_JS_FILA_CON_TEXTO, arg=[selector, texto, presente], timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+async def esperar_swal_cerrado(page, timeout: int = 5000) -> bool:
+    try:
+        await page.wait_for_selector(".swal2-popup", state="hidden", timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+# -------------------------------------------------------------------
+# Alternativas
+# -------------------------------------------------------------------
+async def primero_de(raiz, candidatos: Dict[str, str], timeout: int = TIMEOUT_UI) -> Optional[str]:
+    visibles = {clave: _visible(raiz, selector) for clave, selector in candidatos.items()}
+    carrera = reduce(lambda a, b: a.or_(b), visibles.values())
+    try:
+        await carrera.first.wait_for(state="attached", timeout=timeout)
+    except PlaywrightTimeoutError:
+        return None
+    for clave, locator in visibles.items():
+        if await locator.count() > 0:
+            return clave
+    return None
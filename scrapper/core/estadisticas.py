@@ -0,0 +1,26 @@
+"""
+Estadísticas simples sobre listas de duraciones (percentiles, resumen).
+"""
+
+import math
+from typing import Dict, List
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil p (0-100) por el método del rango más cercano. 0.0 si no hay valores."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    rango = max(1, math.ceil(p / 100 * len(ordenados)))
+    return ordenados[rango - 1]
+
+
+def resumen(valores: List[float]) -> Dict[str, float]:
+    """min, p50, p95, p99 y max de los valores."""
+    return {
+        "min": min(valores) if valores else 0.0,
+        "p50": percentil(valores, 50),
+        "p95": percentil(valores, 95),
+        "p99": percentil(valores, 99),
+        "max": max(valores) if valores else 0.0,
+    }
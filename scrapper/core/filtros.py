@@ -0,0 +1,81 @@
+"""
+Filtro de peticiones del navegador por tipo de recurso y patrón de URL.
+
+Presets (get_page(filtro=...) o SCRAPPER_FILTRO):
+    full-fidelity  carga todo lo que pide la SPA; es el de por defecto y el que se usa para medir rendimiento
+    crud-only      aborta imágenes, fuentes, multimedia y scripts de terceros (Google Sign-In, analítica),
+                   que no intervienen en los flujos CRUD; la suite funcional carga más rápido y con menos bytes
+
+Los estilos no se bloquean: cambian el layout y con él la visibilidad de los elementos que usan los flujos.
+Interceptar peticiones desactiva la caché HTTP del contexto, por eso full-fidelity no registra ninguna ruta.
+"""
+
+import os
+import re
+from typing import Callable, Optional, Tuple, TypedDict, Union
+
+ENV_FILTRO = "SCRAPPER_FILTRO"
+
+
+class Preset(TypedDict):
+    """Peticiones que se abortan."""
+    tipos: Tuple[str, ...]  # request.resource_type
+    patrones: Tuple[str, ...]  # expresiones regulares sobre la URL
+
+
+PRESETS = {
+    "full-fidelity": {"tipos": (), "patrones": ()},
+    "crud-only": {
+        "tipos": ("image", "font", "media"),
+        "patrones": (
+            r"^https://accounts\.google\.com/gsi/",
+            r"google-analytics\.com",
+            r"googletagmanager\.com",
+        ),
+    },
+}
+PRESET_POR_DEFECTO = "full-fidelity"
+
+
+def preset_activo(filtro: Union[str, Preset, None] = None) -> Preset:
+    """Preset indicado (nombre o Preset propio), o el de SCRAPPER_FILTRO, o full-fidelity."""
+    if isinstance(filtro, dict):
+        return filtro
+    nombre = filtro or os.getenv(ENV_FILTRO) or PRESET_POR_DEFECTO
+    if nombre not in PRESETS:
+        raise RuntimeError(f"Filtro desconocido {nombre!r}; opciones: {', '.join(PRESETS)}")
+    return PRESETS[nombre]
+
+
+def _compilar(preset: Preset):
+    return set(preset["tipos"]), [re.compile(p) for p in preset["patrones"]]
+
+
+def criterio_de_bloqueo(filtro: Union[str, Preset, None] = None) -> Optional[Callable]:
+    """Función request -> bool que indica si abortar la petición, o None si el preset no bloquea nada."""
+    tipos, patrones = _compilar(preset_activo(filtro))
+    if not tipos and not patrones:
+        return None
+
+    def bloquear(request) -> bool:
+        return request.resource_type in tipos or any(p.search(request.url) for p in patrones)
+
+    return bloquear
+
+
+def instalar_filtro(context, filtro: Union[str, Preset, None] = None) -> None:
+    """
+    Aborta en todas las páginas del contexto las peticiones del preset.
+    Debe registrarse después de las demás rutas (stub, HAR): las que no bloquea siguen hacia ellas.
+    """
+    bloquear = criterio_de_bloqueo(filtro)
+    if bloquear is None:
+        return
+
+    def filtrar(route):
+        if bloquear(route.request):
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    context.route("**/*", filtrar)
@@ -0,0 +1,167 @@
+"""
+Grabación y reproducción del tráfico con el backend (SCRAPPER_HAR=grabar | reproducir).
+
+grabar:     get_page graba en .har/<test>.har las respuestas de la API que recibe el navegador,
+            y ApiBackend guarda las suyas en .har/<test>.api.json.
+reproducir: el navegador recibe las respuestas del HAR (context.route_from_har) y ApiBackend
+            las del .api.json, sin tocar el backend. Lo que no esté grabado (normalmente
+            escrituras con datos distintos) lo responde un stub local.
+
+En ambos modos la semilla de `random` se fija con el nombre del test, así los datos
+generados (cédulas, códigos) son los mismos al grabar y al reproducir.
+"""
+
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+from core.api import load_api_url
+from core.endpoints import VENTA_CANCELAR, VENTA_GUARDAR, coincide_endpoint
+
+ENV_HAR = "SCRAPPER_HAR"
+DIR_HAR = Path(__file__).resolve().parent.parent / ".har"
+MODOS = ("grabar", "reproducir")
+
+# IDs de venta inventados por el stub; altos para no confundirse con ventas reales
+_ids_stub = itertools.count(900000000)
+
+
+def modo() -> Optional[str]:
+    valor = os.getenv(ENV_HAR)
+    if valor and valor not in MODOS:
+        raise RuntimeError(f"{ENV_HAR} debe ser uno de {MODOS}, no {valor!r}")
+    return valor or None
+
+
+def nombre_test() -> str:
+    return Path(sys.argv[0]).stem
+
+
+def ruta_har(nombre: str = None) -> Path:
+    return DIR_HAR / f"{nombre or nombre_test()}.har"
+
+
+def ruta_api(nombre: str = None) -> Path:
+    return DIR_HAR / f"{nombre or nombre_test()}.api.json"
+
+
+def patron_api() -> str:
+    """Patrón (glob) de las URLs del backend; todo lo demás (la app Angular) va a la red."""
+    return f"{load_api_url()}/**"
+
+
+# -------------------------------------------------------------------
+# Stub de respaldo
+# -------------------------------------------------------------------
+def respuesta_stub(metodo: str, url: str):
+    """
+    Cuerpo que devuelve el stub para una petición que no está en la grabación.
+    Solo responde escrituras; una lectura sin grabar es un error de la grabación.
+    """
+    if metodo == "GET":
+        raise LookupError(f"GET {url} no está en la grabación")
+    if coincide_endpoint(url, VENTA_GUARDAR):
+        return next(_ids_stub)
+    if coincide_endpoint(url, VENTA_CANCELAR):
+        return True
+    return {"mensaje": "respuesta del stub de reproducción"}
+
+
+def respuesta_de_stub(request) -> tuple:
+    """(estado HTTP, cuerpo JSON) con que se responde una petición del navegador que no está grabada."""
+    try:
+        return 200, respuesta_stub(request.method, request.url)
+    except LookupError as e:
+        return 404, {"mensaje": str(e)}
+
+
+def _responder_con_stub(route) -> None:
+    estado, cuerpo = respuesta_de_stub(route.request)
+    route.fulfill(status=estado, json=cuerpo)
+
+
+# -------------------------------------------------------------------
+# Navegador
+# -------------------------------------------------------------------
+def opciones_contexto() -> dict:
+    """Argumentos extra de browser.new_context para el modo actual."""
+    if modo() != "grabar":
+        return {}
+    DIR_HAR.mkdir(parents=True, exist_ok=True)
+    return {
+        "record_har_path": str(ruta_har()),
+        "record_har_url_filter": patron_api(),
+        "record_har_content": "embed",
+    }
+
+
+def preparar_contexto(context) -> None:
+    """
+    Con grabación activa fija la semilla de los datos generados; en modo reproducir además
+    sirve la API desde el HAR, con el stub para lo que no esté grabado.
+    El HAR grabado se escribe al cerrar el contexto (context.close()).
+    """
+    actual = modo()
+    if actual is None:
+        return
+    random.seed(nombre_test())
+    if actual != "reproducir":
+        return
+    har = ruta_har()
+    if not har.exists():
+        raise RuntimeError(f"No hay grabación en {har}; ejecuta primero con {ENV_HAR}=grabar")
+    patron = patron_api()
+    # Las rutas se evalúan de la última registrada a la primera: HAR primero, stub si no coincide
+    context.route(patron, _responder_con_stub)
+    context.route_from_har(har, url=patron, not_found="fallback")
+
+
+# -------------------------------------------------------------------
+# Peticiones directas a la API
+# -------------------------------------------------------------------
+class GrabacionApi:
+    """Respuestas de ApiBackend de un test, en el orden en que se pidieron."""
+
+    def __init__(self, ruta: Path, reproduciendo: bool):
+        self.ruta = ruta
+        self.reproduciendo = reproduciendo
+        self._lock = threading.Lock()
+        self.datos = {"usuario_id": None, "respuestas": []}
+        if reproduciendo:
+            if not ruta.exists():
+                raise RuntimeError(f"No hay grabación en {ruta}; ejecuta primero con {ENV_HAR}=grabar")
+            self.datos = json.loads(ruta.read_text(encoding="utf-8"))
+
+    @classmethod
+    def desde_entorno(cls) -> Optional["GrabacionApi"]:
+        actual = modo()
+        if actual is None:
+            return None
+        return cls(ruta_api(), reproduciendo=actual == "reproducir")
+
+    @property
+    def usuario_id(self):
+        return self.datos.get("usuario_id")
+
+    def registrar(self, metodo: str, ruta: str, cuerpo, usuario_id=None) -> None:
+        with self._lock:
+            self.datos["usuario_id"] = usuario_id
+            self.datos["respuestas"].append({"metodo": metodo, "ruta": ruta, "cuerpo": cuerpo})
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            self.ruta.write_text(json.dumps(self.datos, ensure_ascii=False), encoding="utf-8")
+
+    def responder(self, metodo: str, ruta: str):
+        """Consume la primera respuesta grabada para la petición; si no hay, responde el stub."""
+        with self._lock:
+            for i, grabada in enumerate(self.datos["respuestas"]):
+                if grabada["metodo"] == metodo and grabada["ruta"] == ruta:
+                    return self.datos["respuestas"].pop(i)["cuerpo"]
+        try:
+            return respuesta_stub(metodo, ruta)
+        except LookupError as e:
+            raise RuntimeError(str(e))
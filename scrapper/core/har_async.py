@@ -0,0 +1,28 @@
+"""
+Variante asyncio de core.har (solo la parte del navegador).
+Mismo HAR y mismo stub de respaldo; opciones_contexto se usa tal cual desde core.har.
+"""
+
+import random
+
+from core.har import ENV_HAR, modo, nombre_test, patron_api, respuesta_de_stub, ruta_har
+
+
+async def _responder_con_stub(route) -> None:
+    estado, cuerpo = respuesta_de_stub(route.request)
+    await route.fulfill(status=estado, json=cuerpo)
+
+
+async def preparar_contexto(context) -> None:
+    actual = modo()
+    if actual is None:
+        return
+    random.seed(nombre_test())
+    if actual != "reproducir":
+        return
+    har = ruta_har()
+    if not har.exists():
+        raise RuntimeError(f"No hay grabación en {har}; ejecuta primero con {ENV_HAR}=grabar")
+    patron = patron_api()
+    await context.route(patron, _responder_con_stub)
+    await context.route_from_har(har, url=patron, not_found="fallback")
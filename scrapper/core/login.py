@@ -1,6 +1,23 @@
 from playwright.sync_api import sync_playwright
 from dotenv import load_dotenv
+from pathlib import Path
+import base64
+import json
 import os
+import time
+
+from core.metricas import instrumentar_modulo
+from core.selectores import localizar
+from core.vitales import medir_ruta
+
+# sesión autenticada cacheada (cookies + localStorage del contexto)
+RUTA_SESION = Path(__file__).resolve().parent.parent / ".auth" / "storage_state.json"
+COOKIE_TOKEN = "jwt_token"
+# no reutilizar un token al que le quede menos de este margen (segundos)
+MARGEN_EXPIRACION = 120
+# sessionStorage: la pestaña ya recibió el localStorage de la sesión cacheada
+MARCA_SESION_RESTAURADA = "__scrapper_sesion_restaurada"
+
 
 # cargar .env
 def load_env():
@@ -13,25 +30,165 @@ def load_env():
     return base_url, username, password
 
 
-# función transversal de login
-def login(page):
-    base_url, username, password = load_env()
+# ------------------------------------------------------------
+# Cache de sesión
+# ------------------------------------------------------------
+def expiracion_token(token: str):
+    """Devuelve el claim exp (epoch en segundos) del JWT, o None si no se puede leer."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except Exception:
+        return None
+
+
+def token_de_estado(estado: dict):
+    """Busca el JWT dentro de un storage_state de Playwright."""
+    for cookie in estado.get("cookies", []):
+        if cookie.get("name") == COOKIE_TOKEN:
+            return cookie.get("value")
+    for origen in estado.get("origins", []):
+        for item in origen.get("localStorage", []):
+            if item.get("name") == COOKIE_TOKEN:
+                return item.get("value")
+    return None
+
+
+def cargar_sesion(base_url: str, username: str):
+    """Retorna el storage_state cacheado si pertenece a este entorno/usuario y su token sigue vigente."""
+    try:
+        datos = json.loads(RUTA_SESION.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if datos.get("base_url") != base_url or datos.get("username") != username:
+        return None
+
+    estado = datos.get("storage_state") or {}
+    token = token_de_estado(estado)
+    exp = expiracion_token(token) if token else None
+    if exp is None or exp - MARGEN_EXPIRACION <= time.time():
+        return None
+    return estado
+
+
+def escribir_sesion(storage_state: dict, base_url: str, username: str) -> None:
+    datos = {
+        "base_url": base_url,
+        "username": username,
+        "storage_state": storage_state,
+    }
+    RUTA_SESION.parent.mkdir(parents=True, exist_ok=True)
+    # escritura atómica: varios tests en paralelo pueden refrescar la sesión a la vez
+    tmp = RUTA_SESION.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(datos), encoding="utf-8")
+    os.replace(tmp, RUTA_SESION)
+
+
+def guardar_sesion(context, base_url: str, username: str) -> None:
+    escribir_sesion(context.storage_state(), base_url, username)
+
+
+def invalidar_sesion() -> None:
+    try:
+        RUTA_SESION.unlink()
+    except FileNotFoundError:
+        pass
+
 
+def aplicar_sesion_script(estado: dict) -> list:
+    """
+    Scripts de inicio que restauran el localStorage de cada origen del storage_state.
+    Se aplican una sola vez por pestaña (marca en sessionStorage): un init script corre en cada
+    navegación, y sin la marca pisaría con la sesión cacheada un logout o un login posterior.
+    """
+    scripts = []
+    for origen in estado.get("origins", []):
+        items = origen.get("localStorage", [])
+        if not items:
+            continue
+        scripts.append(
+            """
+            (([origen, items, marca]) => {
+                if (window.location.origin !== origen) return;
+                if (sessionStorage.getItem(marca)) return;
+                sessionStorage.setItem(marca, "1");
+                for (const { name, value } of items) localStorage.setItem(name, value);
+            })(%s)
+            """ % json.dumps([origen["origin"], items, MARCA_SESION_RESTAURADA])
+        )
+    return scripts
+
+
+def claves_sesion(estado: dict) -> list:
+    """Claves de localStorage que restaura aplicar_sesion_script."""
+    return [item["name"] for origen in estado.get("origins", []) for item in origen.get("localStorage", [])]
+
+
+# Borra del localStorage lo restaurado desde la cache; la marca queda para que no se vuelva a aplicar
+JS_DESCARTAR_SESION = "(claves) => claves.forEach(clave => localStorage.removeItem(clave))"
+
+
+def aplicar_sesion(context, estado: dict) -> None:
+    """Restaura cookies y localStorage de un storage_state sobre un contexto ya creado."""
+    if estado.get("cookies"):
+        context.add_cookies(estado["cookies"])
+    for script in aplicar_sesion_script(estado):
+        context.add_init_script(script)
+
+
+def descartar_sesion(page, estado: dict) -> None:
+    """Invalida la sesión cacheada y quita de la página lo que se restauró de ella."""
+    invalidar_sesion()
+    page.context.clear_cookies()
+    page.evaluate(JS_DESCARTAR_SESION, claves_sesion(estado))
+
+
+# ------------------------------------------------------------
+# Login
+# ------------------------------------------------------------
+def login_ui(page, base_url: str, username: str, password: str) -> None:
     page.goto(f"{base_url}/login")
 
-    page.fill("#username", username)
-    page.fill("#password", password)
+    campo_usuario = localizar(page, "login", "usuario")
+    campo_clave = localizar(page, "login", "clave")
+    campo_usuario.fill(username)
+    campo_clave.fill(password)
 
     # angular necesita disparo de eventos para activar el botón
-    page.dispatch_event("#username", "input")
-    page.dispatch_event("#password", "input")
+    campo_usuario.dispatch_event("input")
+    campo_clave.dispatch_event("input")
 
-    page.click("#btn-iniciar-sesion")
+    localizar(page, "login", "ingresar").click()
 
     # validar navegación correcta
     page.wait_for_url(f"{base_url}/app/principal")
 
 
+# función transversal de login
+# reutiliza la sesión cacheada mientras el token siga vigente; si no, hace login por UI y la guarda
+def login(page):
+    base_url, username, password = load_env()
+
+    with medir_ruta(page, "/app/principal"):
+        estado = cargar_sesion(base_url, username)
+        if estado is not None:
+            aplicar_sesion(page.context, estado)
+            page.goto(f"{base_url}/app/principal")
+            # si el backend rechaza el token, el interceptor de angular redirige a /login
+            page.wait_for_load_state("networkidle")
+            if "/login" not in page.url:
+                return
+            descartar_sesion(page, estado)
+
+        login_ui(page, base_url, username, password)
+        guardar_sesion(page.context, base_url, username)
+
+
+instrumentar_modulo(__name__)
+
+
 # ejemplo de uso
 if __name__ == "__main__":
     with sync_playwright() as p:
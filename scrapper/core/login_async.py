@@ -0,0 +1,72 @@
+from core.login import (
+    JS_DESCARTAR_SESION,
+    aplicar_sesion_script,
+    cargar_sesion,
+    claves_sesion,
+    escribir_sesion,
+    invalidar_sesion,
+    load_env,
+)
+from core.metricas import instrumentar_modulo
+from core.selectores_async import localizar
+from core.vitales_async import medir_ruta
+
+
+# variante asyncio de core.login (misma cache de sesión en disco)
+
+async def aplicar_sesion(context, estado: dict) -> None:
+    if estado.get("cookies"):
+        await context.add_cookies(estado["cookies"])
+    for script in aplicar_sesion_script(estado):
+        await context.add_init_script(script)
+
+
+async def descartar_sesion(page, estado: dict) -> None:
+    invalidar_sesion()
+    await page.context.clear_cookies()
+    await page.evaluate(JS_DESCARTAR_SESION, claves_sesion(estado))
+
+
+async def guardar_sesion(context, base_url: str, username: str) -> None:
+    escribir_sesion(await context.storage_state(), base_url, username)
+
+
+async def login_ui(page, base_url: str, username: str, password: str) -> None:
+    await page.goto(f"{base_url}/login")
+
+    campo_usuario = await localizar(page, "login", "usuario")
+    campo_clave = await localizar(page, "login", "clave")
+    await campo_usuario.fill(username)
+    await campo_clave.fill(password)
+
+    # angular necesita disparo de eventos para activar el botón
+    await campo_usuario.dispatch_event("input")
+    await campo_clave.dispatch_event("input")
+
+    await (await localizar(page, "login", "ingresar")).click()
+
+    # validar navegación correcta
+    await page.wait_for_url(f"{base_url}/app/principal")
+
+
+# función transversal de login
+# reutiliza la sesión cacheada mientras el token siga vigente; si no, hace login por UI y la guarda
+async def login(page):
+    base_url, username, password = load_env()
+
+    async with medir_ruta(page, "/app/principal"):
+        estado = cargar_sesion(base_url, username)
+        if estado is not None:
+            await aplicar_sesion(page.context, estado)
+            await page.goto(f"{base_url}/app/principal")
+            # si el backend rechaza el token, el interceptor de angular redirige a /login
+            await page.wait_for_load_state("networkidle")
+            if "/login" not in page.url:
+                return
+            await descartar_sesion(page, estado)
+
+        await login_ui(page, base_url, username, password)
+        await guardar_sesion(page.context, base_url, username)
+
+
+instrumentar_modulo(__name__)
@@ -0,0 +1,275 @@
+"""
+Medición por paso de las acciones.
+Cada función instrumentada registra, al terminar, una línea JSON con su tiempo total,
+las llamadas a Playwright que hizo, el tiempo gastado en pausas fijas (wait_for_timeout)
+y las peticiones de red que hizo la página mientras se ejecutaba.
+
+Los conteos son inclusivos: un paso incluye lo hecho por los pasos que llama
+(ver el campo `padre` para reconstruir el árbol).
+
+Todas las líneas de una ejecución van a .metricas/<SCRAPPER_RUN_ID>.jsonl;
+run_tests define SCRAPPER_RUN_ID para que todos sus tests escriban en el mismo archivo.
+Los pasos se acumulan además en el historial SQLite (core.almacen).
+Con SCRAPPER_METRICAS=0 no se registra nada.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import sys
+import threading
+import time
+import weakref
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Iterable
+
+from playwright import async_api, sync_api
+
+from core import almacen
+from core.ejecucion import DIR_METRICAS, ENV_METRICAS, ENV_RUN_ID, habilitadas, run_id, test_actual
+
+__all__ = ["DIR_METRICAS", "ENV_METRICAS", "ENV_RUN_ID", "habilitadas", "run_id"]
+
+# Clases de Playwright cuyos métodos públicos cuentan como una llamada
+_CLASES_PLAYWRIGHT = ("Page", "Locator", "Keyboard", "Mouse", "ElementHandle", "BrowserContext")
+
+# Pila de pasos activos del hilo o tarea asyncio actual
+_pasos_activos = contextvars.ContextVar("pasos_activos", default=())
+_lock_archivo = threading.Lock()
+# Horas (perf_counter) de las peticiones vistas por cada página
+_peticiones_por_pagina = weakref.WeakKeyDictionary()
+# Nombre del primer parámetro de las acciones que instrumentar_modulo mide por defecto
+_PARAMETROS_DE_PAGINA = ("page",)
+_lock_instrumentacion = threading.Lock()
+_playwright_instrumentado = False
+# Pasos de primer nivel terminados en este proceso, para el resultado del test (core.resultados)
+_pasos_raiz = []
+
+
+def ruta_metricas(id_ejecucion: str = None) -> Path:
+    return DIR_METRICAS / f"{id_ejecucion or run_id()}.jsonl"
+
+
+def _escribir(registro: dict) -> None:
+    ruta = ruta_metricas()
+    linea = json.dumps(registro, ensure_ascii=False) + "\n"
+    with _lock_archivo:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with ruta.open("a", encoding="utf-8") as f:
+            f.write(linea)
+
+
+# -------------------------------------------------------------------
+# Contadores de Playwright
+# -------------------------------------------------------------------
+def _contar_llamada() -> None:
+    for paso in _pasos_activos.get():
+        paso["llamadas_playwright"] += 1
+
+
+def _sumar_espera(segundos: float) -> None:
+    for paso in _pasos_activos.get():
+        paso["espera_fija_s"] += segundos
+
+
+def _envolver_llamada(metodo):
+    @functools.wraps(metodo)
+    def envoltura(*args, **kwargs):
+        _contar_llamada()
+        return metodo(*args, **kwargs)
+    return envoltura
+
+
+def _envolver_espera_sync(metodo):
+    @functools.wraps(metodo)
+    def envoltura(*args, **kwargs):
+        _contar_llamada()
+        inicio = time.perf_counter()
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            _sumar_espera(time.perf_counter() - inicio)
+    return envoltura
+
+
+def _envolver_espera_async(metodo):
+    @functools.wraps(metodo)
+    async def envoltura(*args, **kwargs):
+        _contar_llamada()
+        inicio = time.perf_counter()
+        try:
+            return await metodo(*args, **kwargs)
+        finally:
+            _sumar_espera(time.perf_counter() - inicio)
+    return envoltura
+
+
+def _instrumentar_playwright() -> None:
+    """Envuelve los métodos públicos de las clases de Playwright (API sync y async) con el contador."""
+    for api, envolver_espera in ((sync_api, _envolver_espera_sync), (async_api, _envolver_espera_async)):
+        for nombre_clase in _CLASES_PLAYWRIGHT:
+            clase = getattr(api, nombre_clase)
+            for nombre, metodo in list(vars(clase).items()):
+                if nombre.startswith("_") or not inspect.isfunction(metodo):
+                    continue
+                if nombre == "wait_for_timeout":
+                    setattr(clase, nombre, envolver_espera(metodo))
+                else:
+                    setattr(clase, nombre, _envolver_llamada(metodo))
+
+
+# -------------------------------------------------------------------
+# Peticiones de red
+# -------------------------------------------------------------------
+def _es_pagina(objeto) -> bool:
+    return isinstance(objeto, (sync_api.Page, async_api.Page))
+
+
+def _peticiones_de(page) -> list:
+    """Lista de horas de petición de la página; engancha el listener la primera vez."""
+    try:
+        horas = _peticiones_por_pagina.get(page)
+    except TypeError:
+        return None
+    if horas is None:
+        horas = []
+        _peticiones_por_pagina[page] = horas
+        page.on("request", lambda _request: horas.append(time.perf_counter()))
+    return horas
+
+
+def _contar_peticiones(horas: list, inicio: float, fin: float) -> int:
+    return bisect_right(horas, fin) - bisect_left(horas, inicio)
+
+
+# -------------------------------------------------------------------
+# Pasos
+# -------------------------------------------------------------------
+def _iniciar_paso(nombre: str, args) -> tuple:
+    pila = _pasos_activos.get()
+    paso = {
+        "run": run_id(),
+        "test": test_actual(),
+        "paso": nombre,
+        "padre": pila[-1]["paso"] if pila else None,
+        "profundidad": len(pila),
+        "inicio": time.time(),
+        "llamadas_playwright": 0,
+        "espera_fija_s": 0.0,
+    }
+    page = args[0] if args and _es_pagina(args[0]) else None
+    horas = _peticiones_de(page) if page is not None else None
+    token = _pasos_activos.set(pila + (paso,))
+    return paso, horas, token, time.perf_counter()
+
+
+def _cerrar_paso(paso: dict, horas, token, inicio: float, error) -> None:
+    fin = time.perf_counter()
+    _pasos_activos.reset(token)
+    paso["duracion_s"] = round(fin - inicio, 4)
+    paso["espera_fija_s"] = round(paso["espera_fija_s"], 4)
+    paso["peticiones"] = _contar_peticiones(horas, inicio, fin) if horas is not None else None
+    paso["ok"] = error is None
+    paso["error"] = f"{type(error).__name__}: {error}".splitlines()[0] if error is not None else None
+    if paso["profundidad"] == 0:
+        _pasos_raiz.append({k: paso[k] for k in ("paso", "duracion_s", "ok", "error")})
+    try:
+        _escribir(paso)
+    except OSError as e:
+        print(f"⚠ No se pudo registrar la métrica de {paso['paso']}: {e}")
+    almacen.registrar("pasos", paso)
+
+
+def pasos_raiz() -> list:
+    """Pasos de primer nivel (los que llama el test directamente) terminados en este proceso, en orden."""
+    return list(_pasos_raiz)
+
+
+def medir_paso(funcion):
+    """Decorador que registra las métricas de cada llamada a la función (sync o async)."""
+    if getattr(funcion, "__medido__", False):
+        return funcion
+    nombre = f"{funcion.__module__}.{funcion.__qualname__}"
+
+    if inspect.iscoroutinefunction(funcion):
+        @functools.wraps(funcion)
+        async def envoltura(*args, **kwargs):
+            paso, horas, token, inicio = _iniciar_paso(nombre, args)
+            error = None
+            try:
+                return await funcion(*args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                _cerrar_paso(paso, horas, token, inicio, error)
+    else:
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            paso, horas, token, inicio = _iniciar_paso(nombre, args)
+            error = None
+            try:
+                return funcion(*args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                _cerrar_paso(paso, horas, token, inicio, error)
+
+    envoltura.__medido__ = True
+    return envoltura
+
+
+def _maneja_pagina(funcion) -> bool:
+    """True si el primer parámetro (sin contar self) es la página: la función es una acción de UI."""
+    try:
+        parametros = [p for p in inspect.signature(funcion).parameters if p != "self"]
+    except (TypeError, ValueError):
+        return False
+    return bool(parametros) and parametros[0] in _PARAMETROS_DE_PAGINA
+
+
+def _instrumentar_playwright_una_vez() -> None:
+    global _playwright_instrumentado
+    with _lock_instrumentacion:
+        if not _playwright_instrumentado:
+            _instrumentar_playwright()
+            _playwright_instrumentado = True
+
+
+def instrumentar_modulo(nombre_modulo: str, pasos: Iterable[str] = None) -> None:
+    """
+    Aplica medir_paso a las acciones del módulo. Se llama al final del módulo:
+
+        instrumentar_modulo(__name__)
+
+    Sin `pasos` se miden las funciones públicas (y los métodos públicos de sus clases) que
+    reciben la página como primer parámetro; los helpers puros (generar_datos_*, payload_*, ...)
+    quedan fuera para no ensuciar las estadísticas por paso. Los módulos que no manejan la página
+    (seed, fábrica) nombran sus pasos explícitamente: pasos=["sembrar_cliente", "FabricaDatos.limpiar"].
+
+    Como las llamadas internas del módulo resuelven el nombre global, también quedan medidas.
+    Los métodos de Playwright se envuelven con el contador la primera vez que se instrumenta un módulo.
+    """
+    if not habilitadas():
+        return
+    _instrumentar_playwright_una_vez()
+    modulo = sys.modules[nombre_modulo]
+    explicitos = set(pasos) if pasos is not None else None
+
+    def medir(nombre: str, funcion) -> bool:
+        return nombre in explicitos if explicitos is not None else _maneja_pagina(funcion)
+
+    for nombre, objeto in list(vars(modulo).items()):
+        if nombre.startswith("_") or getattr(objeto, "__module__", None) != nombre_modulo:
+            continue
+        if inspect.isfunction(objeto):
+            if medir(nombre, objeto):
+                setattr(modulo, nombre, medir_paso(objeto))
+        elif inspect.isclass(objeto):
+            for nombre_metodo, metodo in list(vars(objeto).items()):
+                if (not nombre_metodo.startswith("_") and inspect.isfunction(metodo)
+                        and medir(f"{nombre}.{nombre_metodo}", metodo)):
+                    setattr(objeto, nombre_metodo, medir_paso(metodo))
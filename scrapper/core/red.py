@@ -0,0 +1,147 @@
+"""
+Grabador opcional del tráfico XHR/fetch de la app (SCRAPPER_RED=1 o run_tests.py --red).
+
+Cada petición terminada o fallida agrega una línea a .metricas/<SCRAPPER_RUN_ID>.red.jsonl
+con método, endpoint normalizado (IDs como {id}), estado, fases de tiempo y tamaños
+(y una fila en la tabla red del historial, core.almacen).
+imprimir_red agrega esas líneas por endpoint: cantidad de llamadas, latencia y bytes.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+from core import almacen
+from core.endpoints import normalizar_endpoint
+from core.estadisticas import percentil
+from core.ejecucion import DIR_METRICAS, leer_jsonl, run_id, test_actual
+
+ENV_RED = "SCRAPPER_RED"
+
+# Solo las llamadas de la app al backend; se ignoran documentos, scripts, estilos e imágenes
+_TIPOS_GRABADOS = ("xhr", "fetch")
+
+_lock_archivo = threading.Lock()
+
+
+def habilitado() -> bool:
+    return os.getenv(ENV_RED) == "1"
+
+
+def ruta_red(id_ejecucion: str = None) -> Path:
+    return DIR_METRICAS / f"{id_ejecucion or run_id()}.red.jsonl"
+
+
+def _fase(timing: dict, desde: str, hasta: str):
+    """Duración en ms entre dos marcas de request.timing (-1 significa que la fase no ocurrió)."""
+    inicio, fin = timing.get(desde, -1), timing.get(hasta, -1)
+    if inicio < 0 or fin < 0:
+        return None
+    return round(fin - inicio, 2)
+
+
+def registro_de_peticion(request, estado, error=None, tamanos: dict = None) -> dict:
+    """Registro de una petición; con la API async, `tamanos` es el resultado ya esperado de request.sizes()."""
+    timing = request.timing
+    if tamanos is None:
+        try:
+            tamanos = request.sizes()
+        except Exception:
+            tamanos = {}
+    return {
+        "run": run_id(),
+        "test": test_actual(),
+        "metodo": request.method,
+        "endpoint": normalizar_endpoint(request.url),
+        "url": request.url,
+        "estado": estado,
+        "error": error,
+        "dns_ms": _fase(timing, "domainLookupStart", "domainLookupEnd"),
+        "conexion_ms": _fase(timing, "connectStart", "connectEnd"),
+        "tls_ms": _fase(timing, "secureConnectionStart", "connectEnd"),
+        "espera_ms": _fase(timing, "requestStart", "responseStart"),
+        "descarga_ms": _fase(timing, "responseStart", "responseEnd"),
+        "total_ms": round(timing["responseEnd"], 2) if timing.get("responseEnd", -1) >= 0 else None,
+        "bytes_enviados": tamanos.get("requestBodySize"),
+        "bytes_recibidos": tamanos.get("responseBodySize"),
+    }
+
+
+def _escribir(registro: dict) -> None:
+    ruta = ruta_red()
+    with _lock_archivo:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with ruta.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    almacen.registrar("red", registro)
+
+
+def _al_terminar(request) -> None:
+    if request.resource_type not in _TIPOS_GRABADOS:
+        return
+    try:
+        respuesta = request.response()
+        _escribir(registro_de_peticion(request, respuesta.status if respuesta else None))
+    except Exception as e:
+        print(f"⚠ No se pudo grabar {request.method} {request.url}: {e}")
+
+
+def _al_fallar(request) -> None:
+    if request.resource_type not in _TIPOS_GRABADOS:
+        return
+    try:
+        _escribir(registro_de_peticion(request, None, request.failure))
+    except Exception as e:
+        print(f"⚠ No se pudo grabar {request.method} {request.url}: {e}")
+
+
+def instalar_grabador(context) -> None:
+    """Graba las peticiones XHR/fetch de todas las páginas del contexto si el grabador está habilitado."""
+    if not habilitado():
+        return
+    context.on("requestfinished", _al_terminar)
+    context.on("requestfailed", _al_fallar)
+
+
+# -------------------------------------------------------------------
+# Reporte
+# -------------------------------------------------------------------
+def leer_peticiones(id_ejecucion: str = None) -> list:
+    return leer_jsonl(ruta_red(id_ejecucion))
+
+
+def imprimir_red(id_ejecucion: str = None) -> None:
+    """Imprime por endpoint: llamadas, errores, llamadas por test, p50/p95 de latencia y bytes recibidos."""
+    peticiones = leer_peticiones(id_ejecucion)
+    if not peticiones:
+        return
+    grupos = defaultdict(list)
+    for peticion in peticiones:
+        grupos[(peticion["metodo"], peticion["endpoint"])].append(peticion)
+
+    print("\n" + "=" * 104)
+    print("TRÁFICO POR ENDPOINT")
+    print("=" * 104)
+    print(f"{'Endpoint':<46}{'llamadas':>9}{'errores':>8}{'x test':>8}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'KB total':>11}{'KB/llam.':>10}")
+    filas = []
+    for (metodo, endpoint), grupo in grupos.items():
+        tiempos = [p["total_ms"] for p in grupo if p["total_ms"] is not None]
+        recibidos = sum(p["bytes_recibidos"] or 0 for p in grupo)
+        errores = sum(1 for p in grupo if p["estado"] is None or p["estado"] >= 400)
+        tests = len({p["test"] for p in grupo})
+        filas.append((recibidos, f"{metodo} {endpoint}", len(grupo), errores, len(grupo) / tests, tiempos))
+
+    # Los endpoints que más bytes descargan primero
+    for recibidos, nombre, llamadas, errores, por_test, tiempos in sorted(filas, reverse=True):
+        print(
+            f"{nombre[:45]:<46}{llamadas:>9}{errores:>8}{por_test:>8.1f}"
+            f"{percentil(tiempos, 50):>9.0f}{percentil(tiempos, 95):>9.0f}"
+            f"{recibidos / 1024:>11.1f}{recibidos / 1024 / llamadas:>10.1f}"
+        )
+    total = sum(f[0] for f in filas)
+    print("-" * 104)
+    print(f"{'Total':<46}{len(peticiones):>9}{'':>34}{total / 1024:>11.1f}")
+    print("=" * 104)
@@ -0,0 +1,41 @@
+"""
+Variante asyncio de core.red.
+Mismo archivo y mismo formato de registro, con los handlers de playwright.async_api
+(request.response() y request.sizes() son corrutinas).
+"""
+
+from core.red import _TIPOS_GRABADOS, _escribir, habilitado, registro_de_peticion
+
+
+async def _tamanos(request) -> dict:
+    try:
+        return await request.sizes()
+    except Exception:
+        return {}
+
+
+async def _al_terminar(request) -> None:
+    if request.resource_type not in _TIPOS_GRABADOS:
+        return
+    try:
+        respuesta = await request.response()
+        _escribir(registro_de_peticion(request, respuesta.status if respuesta else None,
+                                       tamanos=await _tamanos(request)))
+    except Exception as e:
+        print(f"⚠ No se pudo grabar {request.method} {request.url}: {e}")
+
+
+async def _al_fallar(request) -> None:
+    if request.resource_type not in _TIPOS_GRABADOS:
+        return
+    try:
+        _escribir(registro_de_peticion(request, None, request.failure, tamanos=await _tamanos(request)))
+    except Exception as e:
+        print(f"⚠ No se pudo grabar {request.method} {request.url}: {e}")
+
+
+def instalar_grabador(context) -> None:
+    if not habilitado():
+        return
+    context.on("requestfinished", _al_terminar)
+    context.on("requestfailed", _al_fallar)
@@ -0,0 +1,241 @@
+"""
+Resultado estructurado de cada test y reportes de la ejecución (JSON y JUnit XML).
+
+Cada script de test termina con:
+
+    if __name__ == "__main__":
+        ejecutar_test(main)
+
+ejecutar_test mide el test, agrega una línea a .metricas/<SCRAPPER_RUN_ID>.resultados.jsonl
+con estado, duración, pasos de primer nivel (core.metricas) y motivo de la falla,
+y termina el proceso con código 0 solo si el test pasó.
+Un test falla llamando a fallar(motivo); cualquier otra excepción cuenta como error.
+
+run_tests.py junta esas líneas con lo que observó de cada subproceso (timeouts,
+procesos que murieron sin reportar) y escribe los reportes con escribir_reportes.
+"""
+
+import json
+import sys
+import threading
+import time
+import traceback
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional, TypedDict
+
+from core.ejecucion import DIR_METRICAS, leer_jsonl, run_id, test_actual
+
+PASO = "paso"
+FALLO = "fallo"
+ERROR = "error"
+OMITIDO = "omitido"  # no se ejecutó o se cortó (run_tests --fail-fast)
+
+_lock_archivo = threading.Lock()
+
+
+class PasoResultado(TypedDict):
+    paso: str
+    duracion_s: float
+    ok: bool
+    error: Optional[str]
+
+
+class Resultado(TypedDict):
+    """Resultado de un test."""
+    run: str
+    test: str  # ruta relativa a scrapper/, p. ej. test/venta/test_crear_venta.py
+    estado: str  # paso | fallo | error | omitido
+    inicio: float
+    duracion_s: float
+    motivo: Optional[str]
+    detalle: Optional[str]  # traceback de un error
+    pasos: List[PasoResultado]
+
+
+class FalloTest(AssertionError):
+    """El flujo terminó pero no cumplió lo esperado."""
+
+
+def fallar(motivo: str):
+    """Marca el test como fallido con el motivo indicado."""
+    raise FalloTest(motivo)
+
+
+def ruta_resultados(id_ejecucion: str = None) -> Path:
+    return DIR_METRICAS / f"{id_ejecucion or run_id()}.resultados.jsonl"
+
+
+def escribir_resultado(resultado: Resultado) -> None:
+    ruta = ruta_resultados(resultado["run"])
+    with _lock_archivo:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with ruta.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+
+
+def ejecutar_test(main) -> None:
+    """Ejecuta la función principal de un test, registra su resultado y sale con 0 (pasó) o 1."""
+    # Import diferido: los reportes de run_tests no dependen de Playwright, el test sí
+    from core.metricas import pasos_raiz
+
+    inicio = time.time()
+    inicio_perf = time.perf_counter()
+    estado, motivo, detalle = PASO, None, None
+    try:
+        main()
+    except FalloTest as e:
+        estado, motivo = FALLO, str(e)
+    except AssertionError as e:
+        estado, motivo = FALLO, str(e) or "assert falló"
+        detalle = traceback.format_exc()
+    except Exception as e:
+        estado, motivo = ERROR, f"{type(e).__name__}: {e}".splitlines()[0]
+        detalle = traceback.format_exc()
+
+    resultado: Resultado = {
+        "run": run_id(),
+        "test": test_actual(),
+        "estado": estado,
+        "inicio": inicio,
+        "duracion_s": round(time.perf_counter() - inicio_perf, 3),
+        "motivo": motivo,
+        "detalle": detalle,
+        "pasos": pasos_raiz(),
+    }
+    try:
+        escribir_resultado(resultado)
+    except OSError as e:
+        print(f"⚠ No se pudo registrar el resultado del test: {e}")
+
+    if detalle:
+        print(detalle, end="")
+    if estado == PASO:
+        print(f"✓ TEST PASÓ ({resultado['duracion_s']:.1f}s)")
+    else:
+        print(f"✗ TEST {'FALLÓ' if estado == FALLO else 'CON ERROR'}: {motivo}")
+    sys.exit(0 if estado == PASO else 1)
+
+
+# -------------------------------------------------------------------
+# Reportes de la ejecución
+# -------------------------------------------------------------------
+def leer_resultados(id_ejecucion: str = None) -> List[Resultado]:
+    return leer_jsonl(ruta_resultados(id_ejecucion))
+
+
+def consolidar(id_ejecucion: str, tests: List[str], observados: Dict[str, dict]) -> List[Resultado]:
+    """
+    Un resultado por test, en el orden de `tests`. Usa el que reportó el propio test;
+    si no reportó (timeout, proceso muerto, error al importar) arma uno con lo que observó
+    el runner: observados[test] = {"ok", "omitido", "motivo", "duracion_s", "inicio"}.
+    """
+    reportados = {r["test"]: r for r in leer_resultados(id_ejecucion)}
+    resultados = []
+    for test in tests:
+        observado = observados.get(test, {})
+        resultado = reportados.get(test)
+        if observado.get("omitido"):
+            resultado = {
+                "run": id_ejecucion,
+                "test": test,
+                "estado": OMITIDO,
+                "inicio": observado.get("inicio"),
+                "duracion_s": round(observado.get("duracion_s", 0.0), 3),
+                "motivo": observado.get("motivo"),
+                "detalle": None,
+                "pasos": [],
+            }
+        elif resultado is None:
+            resultado = {
+                "run": id_ejecucion,
+                "test": test,
+                "estado": PASO if observado.get("ok") else ERROR,
+                "inicio": observado.get("inicio"),
+                "duracion_s": round(observado.get("duracion_s", 0.0), 3),
+                "motivo": None if observado.get("ok") else (observado.get("motivo") or "el test no reportó resultado"),
+                "detalle": None,
+                "pasos": [],
+            }
+        elif observado.get("motivo") and resultado["estado"] == PASO:
+            # El test reportó éxito pero el proceso terminó mal (p. ej. al cerrar el navegador)
+            resultado = {**resultado, "estado": ERROR, "motivo": observado["motivo"]}
+        resultados.append(resultado)
+    return resultados
+
+
+def escribir_json(resultados: List[Resultado], ruta: Path, id_ejecucion: str) -> None:
+    resumen = {
+        "run": id_ejecucion,
+        "total": len(resultados),
+        "pasaron": sum(r["estado"] == PASO for r in resultados),
+        "fallaron": sum(r["estado"] == FALLO for r in resultados),
+        "errores": sum(r["estado"] == ERROR for r in resultados),
+        "omitidos": sum(r["estado"] == OMITIDO for r in resultados),
+        "duracion_s": round(sum(r["duracion_s"] for r in resultados), 3),
+        "tests": resultados,
+    }
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_text(json.dumps(resumen, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def escribir_junit(resultados: List[Resultado], ruta: Path, id_ejecucion: str) -> None:
+    """JUnit XML con una testsuite por carpeta de tests (cliente, producto, venta...)."""
+    suites = {}
+    for resultado in resultados:
+        carpeta = Path(resultado["test"]).parent
+        suites.setdefault(carpeta.name or "test", []).append(resultado)
+
+    raiz = ET.Element("testsuites", name=f"scrapper {id_ejecucion}")
+    for nombre, grupo in suites.items():
+        suite = ET.SubElement(
+            raiz, "testsuite",
+            name=nombre,
+            tests=str(len(grupo)),
+            failures=str(sum(r["estado"] == FALLO for r in grupo)),
+            errors=str(sum(r["estado"] == ERROR for r in grupo)),
+            skipped=str(sum(r["estado"] == OMITIDO for r in grupo)),
+            time=f"{sum(r['duracion_s'] for r in grupo):.3f}",
+        )
+        for resultado in grupo:
+            caso = ET.SubElement(
+                suite, "testcase",
+                classname=Path(resultado["test"]).parent.as_posix().replace("/", "."),
+                name=Path(resultado["test"]).stem,
+                file=resultado["test"],
+                time=f"{resultado['duracion_s']:.3f}",
+            )
+            if resultado["estado"] == OMITIDO:
+                ET.SubElement(caso, "skipped", message=resultado["motivo"] or "")
+            elif resultado["estado"] != PASO:
+                etiqueta = "failure" if resultado["estado"] == FALLO else "error"
+                falla = ET.SubElement(caso, etiqueta, message=resultado["motivo"] or "")
+                falla.text = resultado.get("detalle") or resultado["motivo"] or ""
+            if resultado["pasos"]:
+                ET.SubElement(caso, "system-out").text = "\n".join(
+                    f"{'✓' if p['ok'] else '✗'} {p['paso']} {p['duracion_s']:.2f}s"
+                    + (f" — {p['error']}" if p["error"] else "")
+                    for p in resultado["pasos"]
+                )
+
+    ET.indent(raiz)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(raiz).write(ruta, encoding="utf-8", xml_declaration=True)
+
+
+def escribir_reportes(id_ejecucion: str, tests: List[str], observados: Dict[str, dict],
+                      ruta_json: Path = None, ruta_junit: Path = None) -> List[Resultado]:
+    """
+    Consolida los resultados de la ejecución y escribe el JSON y el JUnit XML.
+    El JSON queda además en .metricas/, de donde run_tests toma los fallos recientes para ordenar.
+    """
+    resultados = consolidar(id_ejecucion, tests, observados)
+    ruta_historial = DIR_METRICAS / f"{id_ejecucion}.resultados.json"
+    ruta_json = ruta_json or ruta_historial
+    ruta_junit = ruta_junit or DIR_METRICAS / f"{id_ejecucion}.junit.xml"
+    escribir_json(resultados, ruta_json, id_ejecucion)
+    if ruta_json.resolve() != ruta_historial.resolve():
+        escribir_json(resultados, ruta_historial, id_ejecucion)
+    escribir_junit(resultados, ruta_junit, id_ejecucion)
+    print(f"Resultados: {ruta_json} | JUnit: {ruta_junit}")
+    return resultados
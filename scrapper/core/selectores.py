@@ -0,0 +1,163 @@
+"""
+Registro de selectores por pantalla (cliente, producto, venta, lista-ventas, login).
+
+Cada elemento tiene una cadena de alternativas, porque la UI no siempre usa el mismo marcado.
+Las alternativas se esperan todas a la vez y, de las visibles, gana la más barata
+(id o atributo, luego clase o etiqueta, al final coincidencias por texto como :has-text('❌')).
+La alternativa elegida se recuerda para la sesión y las búsquedas siguientes la prueban sola;
+si el marcado cambia y deja de aparecer, tras una espera corta se vuelve a la carrera entre todas.
+
+    localizar(page, "venta", "finalizar").click()
+    fila.locator(...)  ->  localizar(fila, "cliente", "editar_fila").click()
+
+La sesión es el proceso: cada test arranca con el registro vacío.
+"""
+
+from typing import Dict, Tuple
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from core.esperas import TIMEOUT_UI, primero_de
+
+SELECTORES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "login": {
+        "usuario": ("#username",),
+        "clave": ("#password",),
+        "ingresar": ("#btn-iniciar-sesion",),
+    },
+    "cliente": {
+        "editar_fila": ("button.editar", "button:has-text('✏️')", "button:has-text('Editar')"),
+    },
+    "producto": {
+        "editar_fila": ("button.editar", "button:has-text('✏️')", "button:has-text('Editar')"),
+        "agregar_forma": ("button[title*='Agregar']", "button:has-text('Agregar forma')", "button:has-text('Agregar')"),
+    },
+    "venta": {
+        "cliente": (
+            "input[placeholder*='Cliente' i]",
+            "input[formcontrolname='cliente']",
+            "input[placeholder*='Cédula' i]",
+        ),
+        "sugerencia": ("mat-option", "li.suggestion"),
+        "producto": (
+            "input[placeholder*='Escanear' i]",
+            "input[placeholder*='Código' i]",
+            "input[placeholder*='Producto' i]",
+        ),
+        "cantidad": ("input[formcontrolname='cantidad']", "input[placeholder*='Cantidad' i]"),
+        "finalizar": ("button#finalizar", "button#cobrar", "button:has-text('Finalizar')", "button:has-text('Cobrar')"),
+        "pago_efectivo": ("input[value='efectivo']", "button:has-text('Efectivo')", "label:has-text('Efectivo')"),
+        "pago_tarjeta": ("input[value='tarjeta']", "button:has-text('Tarjeta')", "label:has-text('Tarjeta')"),
+        "confirmar": (".swal2-confirm", "button#confirmar", "button:has-text('Confirmar')"),
+        "factura_electronica": (
+            "input[value='electronica']",
+            "label:has-text('Electrónica')",
+            "button:has-text('Electrónica')",
+        ),
+        "factura_fisica": ("input[value='fisica']", "label:has-text('Física')", "button:has-text('Física')"),
+    },
+    "lista-ventas": {
+        "buscar": ("input[placeholder*='Buscar' i]",),
+        "filas": ("tbody tr", "table tr"),
+        "eliminar_fila": ("button.eliminar", "button:has-text('❌')", "button:has-text('Eliminar')"),
+    },
+}
+
+# Espera de la alternativa recordada antes de volver a probar todas (ms)
+TIMEOUT_RECORDADO = 1000
+
+# (pantalla, elemento) -> alternativa que coincidió en esta sesión
+_resueltos: Dict[Tuple[str, str], str] = {}
+
+
+def alternativas(pantalla: str, elemento: str) -> Tuple[str, ...]:
+    try:
+        return SELECTORES[pantalla][elemento]
+    except KeyError:
+        raise KeyError(f"No hay selector registrado para {pantalla}.{elemento}")
+
+
+def costo(selector: str) -> int:
+    """0: id o atributo; 1: clase o etiqueta; 2: texto (recorre el contenido de cada candidato)."""
+    if ":has-text(" in selector or "text=" in selector:
+        return 2
+    if "#" in selector or "[" in selector:
+        return 0
+    return 1
+
+
+def por_costo(opciones: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Alternativas de la más barata a la más cara; a igual costo, en el orden registrado."""
+    return tuple(sorted(opciones, key=costo))
+
+
+def combinado(opciones: Tuple[str, ...]) -> str:
+    return ", ".join(opciones)
+
+
+def resueltos() -> Dict[str, str]:
+    """Alternativa elegida para cada elemento usado en la sesión ("pantalla.elemento" -> selector)."""
+    return {f"{pantalla}.{elemento}": selector for (pantalla, elemento), selector in _resueltos.items()}
+
+
+def olvidar() -> None:
+    """Vacía el registro: cada elemento vuelve a preferir su alternativa más barata."""
+    _resueltos.clear()
+
+
+# -------------------------------------------------------------------
+# Búsqueda
+# -------------------------------------------------------------------
+def candidatos(opciones: Tuple[str, ...], recordado: str = None) -> Dict[str, str]:
+    """Alternativas en orden de preferencia: la recordada primero y luego de la más barata a la más cara."""
+    orden = por_costo(opciones)
+    if recordado in orden:
+        orden = (recordado,) + tuple(a for a in orden if a != recordado)
+    return {alternativa: alternativa for alternativa in orden}
+
+
+def _visible(raiz, selector: str):
+    return raiz.locator(f"{selector} >> visible=true").first
+
+
+def _buscar(raiz, pantalla: str, elemento: str, timeout: int):
+    """
+    (selector, locator visible) del elemento. La alternativa recordada se prueba sola con una
+    espera corta; solo si no aparece (la UI cambió o todavía no terminó de pintar) se corre
+    la carrera entre todas las alternativas.
+    """
+    opciones = alternativas(pantalla, elemento)
+    clave = (pantalla, elemento)
+    recordado = _resueltos.get(clave)
+    if recordado is not None:
+        locator = _visible(raiz, recordado)
+        try:
+            locator.wait_for(state="visible", timeout=min(TIMEOUT_RECORDADO, timeout))
+            return recordado, locator
+        except PlaywrightTimeoutError:
+            pass
+    elegida = primero_de(raiz, candidatos(opciones, recordado), timeout)
+    if elegida is None:
+        raise PlaywrightTimeoutError(f"{pantalla}.{elemento} no apareció en {timeout} ms: {combinado(opciones)}")
+    _resueltos[clave] = elegida
+    return elegida, _visible(raiz, elegida)
+
+
+def resolver(raiz, pantalla: str, elemento: str, timeout: int = TIMEOUT_UI) -> str:
+    """
+    Selector de un elemento ya visible bajo `raiz` (página o locator).
+    Si hay una alternativa recordada y está visible, se usa sin mirar las demás; si no,
+    todas se esperan a la vez (core.esperas.primero_de) y gana la más barata de las visibles,
+    que pasa a ser la recordada. Lanza el TimeoutError de Playwright si ninguna aparece a tiempo.
+    """
+    return _buscar(raiz, pantalla, elemento, timeout)[0]
+
+
+def localizar(raiz, pantalla: str, elemento: str, timeout: int = TIMEOUT_UI):
+    """Locator (primera coincidencia visible) del elemento registrado, ya visible bajo `raiz`."""
+    return _buscar(raiz, pantalla, elemento, timeout)[1]
+
+
+def cadena(pantalla: str, elemento: str) -> str:
+    """Todas las alternativas de un elemento en un solo selector, para usarlo como candidato de primero_de."""
+    return combinado(alternativas(pantalla, elemento))
@@ -0,0 +1,46 @@
+"""
+Variante asyncio de core.selectores.
+Mismo registro y misma memoria de alternativas elegidas, sobre playwright.async_api.
+"""
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from core.esperas import TIMEOUT_UI
+from core.esperas_async import primero_de
+from core.selectores import (
+    TIMEOUT_RECORDADO,
+    _resueltos,
+    _visible,
+    alternativas,
+    cadena,
+    candidatos,
+    combinado,
+)
+
+__all__ = ["cadena"]
+
+
+async def _buscar(raiz, pantalla: str, elemento: str, timeout: int):
+    opciones = alternativas(pantalla, elemento)
+    clave = (pantalla, elemento)
+    recordado = _resueltos.get(clave)
+    if recordado is not None:
+        locator = _visible(raiz, recordado)
+        try:
+            await locator.wait_for(state="visible", timeout=min(TIMEOUT_RECORDADO, timeout))
+            return recordado, locator
+        except PlaywrightTimeoutError:
+            pass
+    elegida = await primero_de(raiz, candidatos(opciones, recordado), timeout)
+    if elegida is None:
+        raise PlaywrightTimeoutError(f"{pantalla}.{elemento} no apareció en {timeout} ms: {combinado(opciones)}")
+    _resueltos[clave] = elegida
+    return elegida, _visible(raiz, elegida)
+
+
+async def resolver(raiz, pantalla: str, elemento: str, timeout: int = TIMEOUT_UI) -> str:
+    return (await _buscar(raiz, pantalla, elemento, timeout))[0]
+
+
+async def localizar(raiz, pantalla: str, elemento: str, timeout: int = TIMEOUT_UI):
+    return (await _buscar(raiz, pantalla, elemento, timeout))[1]
@@ -0,0 +1,237 @@
+"""
+Copia local (SQLite) de los catálogos de clientes y productos, sincronizada de forma incremental.
+
+    with Snapshot(ruta) as snapshot:
+        resumen = sincronizar(api, snapshot, "producto")
+
+El backend expone /clientes/verificar-cambios y /productos/verificar-cambios, que responden
+solo un booleano: si hubo altas, ediciones o bajas desde la última consulta (de cualquier
+consumidor). No dicen qué registros cambiaron, así que la sincronización es por catálogo:
+    - sin cambios (y el total de registros coincide con la copia): no se descarga nada;
+    - con cambios: se recorren las páginas de la API, ordenadas por la clave, y solo se escriben
+      las filas nuevas o modificadas (se comparan por huella); las que ya no aparecen se borran
+      de la copia. Si el total de registros cambia durante el recorrido, un alta o una baja pudo
+      correr las páginas: no se borra nada y el catálogo queda pendiente para la próxima vez.
+La consulta a verificar-cambios consume el aviso, por eso el catálogo queda "pendiente" hasta
+que su recorrido termina: si la sincronización se corta, la siguiente vuelve a recorrerlo.
+El frontend también puede consumir el aviso; el total de registros cubre altas y bajas en ese
+caso, y --completo fuerza el recorrido para las ediciones.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TypedDict
+
+from core.endpoints import (
+    CLIENTES_PAGINA,
+    CLIENTES_VERIFICAR_CAMBIOS,
+    PRODUCTOS_PAGINA,
+    PRODUCTOS_VERIFICAR_CAMBIOS,
+)
+
+# Registros por página al recorrer la API (la tabla de la UI pide de a 10)
+TAMANO_PAGINA_API = 200
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS filas (
+    entidad TEXT NOT NULL,
+    clave TEXT NOT NULL,
+    datos TEXT NOT NULL,
+    huella TEXT NOT NULL,
+    version INTEGER NOT NULL,  -- última sincronización en la que apareció
+    actualizado REAL NOT NULL,
+    PRIMARY KEY (entidad, clave)
+);
+CREATE TABLE IF NOT EXISTS estado (
+    entidad TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    pendiente INTEGER NOT NULL,  -- 1: se consumió el aviso de cambios y el recorrido no terminó
+    sincronizado REAL
+);
+"""
+
+
+class Entidad(TypedDict):
+    pagina: str  # endpoint paginado (Page<T> de Spring)
+    cambios: str  # endpoint verificar-cambios
+    clave: str  # campo que identifica el registro
+
+
+ENTIDADES: Dict[str, Entidad] = {
+    "cliente": {"pagina": CLIENTES_PAGINA, "cambios": CLIENTES_VERIFICAR_CAMBIOS, "clave": "cedula"},
+    "producto": {"pagina": PRODUCTOS_PAGINA, "cambios": PRODUCTOS_VERIFICAR_CAMBIOS, "clave": "codigo"},
+}
+
+
+class ResumenSync(TypedDict):
+    entidad: str
+    recorrido: bool  # False: no hubo cambios y no se descargó nada
+    paginas: int
+    nuevos: int
+    modificados: int
+    eliminados: int
+    total: int
+    inestable: bool  # el total cambió durante el recorrido: no se borró nada y quedó pendiente
+
+
+def huella(datos: dict) -> str:
+    return hashlib.sha1(json.dumps(datos, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+# -------------------------------------------------------------------
+# Copia local
+# -------------------------------------------------------------------
+class Snapshot:
+    """Base SQLite con las filas de cada entidad y el estado de su última sincronización."""
+
+    def __init__(self, ruta: Path):
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.executescript(_ESQUEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        self.conexion.close()
+
+    def estado(self, entidad: str) -> Optional[dict]:
+        fila = self.conexion.execute(
+            "SELECT version, total, pendiente, sincronizado FROM estado WHERE entidad = ?", (entidad,)
+        ).fetchone()
+        if fila is None:
+            return None
+        return {"version": fila[0], "total": fila[1], "pendiente": bool(fila[2]), "sincronizado": fila[3]}
+
+    def marcar_pendiente(self, entidad: str) -> int:
+        """Abre una sincronización y retorna su número de versión."""
+        anterior = self.estado(entidad)
+        # Un recorrido que no cerró pudo marcar filas con su versión: la nueva tiene que superarla
+        vista = self.conexion.execute(
+            "SELECT COALESCE(MAX(version), 0) FROM filas WHERE entidad = ?", (entidad,)
+        ).fetchone()[0]
+        version = max(anterior["version"] if anterior else 0, vista) + 1
+        with self.conexion:
+            self.conexion.execute(
+                "INSERT INTO estado (entidad, version, total, pendiente, sincronizado) VALUES (?, ?, ?, 1, ?) "
+                "ON CONFLICT(entidad) DO UPDATE SET pendiente = 1",
+                (entidad, version - 1, anterior["total"] if anterior else 0, anterior and anterior["sincronizado"]),
+            )
+        return version
+
+    def guardar_pagina(self, entidad: str, clave: str, registros: List[dict], version: int) -> Dict[str, int]:
+        """Inserta o actualiza las filas de una página; las que no cambiaron solo se marcan como vistas."""
+        claves = [str(r[clave]) for r in registros]
+        marcas = ",".join("?" * len(claves))
+        previas = dict(self.conexion.execute(
+            f"SELECT clave, huella FROM filas WHERE entidad = ? AND clave IN ({marcas})", (entidad, *claves)
+        )) if claves else {}
+        cuenta = {"nuevos": 0, "modificados": 0}
+        ahora = time.time()
+        escribir, vistas = [], []
+        for registro, clave_registro in zip(registros, claves):
+            actual = huella(registro)
+            anterior = previas.get(clave_registro)
+            if anterior == actual:
+                vistas.append((version, entidad, clave_registro))
+                continue
+            cuenta["nuevos" if anterior is None else "modificados"] += 1
+            escribir.append((entidad, clave_registro, json.dumps(registro, ensure_ascii=False), actual, version, ahora))
+        with self.conexion:
+            self.conexion.executemany("UPDATE filas SET version = ? WHERE entidad = ? AND clave = ?", vistas)
+            self.conexion.executemany(
+                "INSERT INTO filas (entidad, clave, datos, huella, version, actualizado) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(entidad, clave) DO UPDATE SET datos = excluded.datos, huella = excluded.huella, "
+                "version = excluded.version, actualizado = excluded.actualizado",
+                escribir,
+            )
+        return cuenta
+
+    def cerrar_version(self, entidad: str, version: int) -> int:
+        """Termina la sincronización: borra las filas que no aparecieron y retorna cuántas eran."""
+        with self.conexion:
+            eliminados = self.conexion.execute(
+                "DELETE FROM filas WHERE entidad = ? AND version < ?", (entidad, version)
+            ).rowcount
+            total = self.total(entidad)
+            self.conexion.execute(
+                "UPDATE estado SET version = ?, total = ?, pendiente = 0, sincronizado = ? WHERE entidad = ?",
+                (version, total, time.time(), entidad),
+            )
+        return eliminados
+
+    def total(self, entidad: str) -> int:
+        return self.conexion.execute("SELECT COUNT(*) FROM filas WHERE entidad = ?", (entidad,)).fetchone()[0]
+
+    def filas(self, entidad: str) -> Iterator[dict]:
+        """Registros de la copia, ordenados por clave, sin cargarlos todos en memoria."""
+        for (datos,) in self.conexion.execute(
+            "SELECT datos FROM filas WHERE entidad = ? ORDER BY clave", (entidad,)
+        ):
+            yield json.loads(datos)
+
+
+# -------------------------------------------------------------------
+# Sincronización
+# -------------------------------------------------------------------
+def _pagina_api(api, endpoint: str, numero: int, tamano: int, clave: str) -> dict:
+    # Sin orden explícito la base no garantiza el mismo orden entre páginas (filas repetidas u omitidas).
+    # La query va en la ruta para que las grabaciones HAR distingan las páginas
+    return api.get(f"{endpoint}?page={numero}&size={tamano}&sort={clave},asc") or {}
+
+
+def sincronizar(api, snapshot: Snapshot, entidad: str, completo: bool = False,
+                tamano: int = TAMANO_PAGINA_API) -> ResumenSync:
+    """
+    Pone al día la copia de una entidad (cliente, producto) con la API del backend.
+    Solo recorre el catálogo si verificar-cambios avisa, si el total cambió, si quedó
+    pendiente una sincronización cortada o si se pide `completo`.
+    """
+    config = ENTIDADES[entidad]
+    estado = snapshot.estado(entidad)
+    hubo_cambios = bool(api.get(config["cambios"]))
+    total_api = _pagina_api(api, config["pagina"], 0, 1, config["clave"]).get("totalElements")
+    resumen: ResumenSync = {
+        "entidad": entidad, "recorrido": False, "paginas": 0,
+        "nuevos": 0, "modificados": 0, "eliminados": 0, "total": estado["total"] if estado else 0,
+        "inestable": False,
+    }
+    al_dia = (
+        estado is not None
+        and not estado["pendiente"]
+        and not hubo_cambios
+        and total_api == estado["total"]
+    )
+    if al_dia and not completo:
+        return resumen
+
+    version = snapshot.marcar_pendiente(entidad)
+    numero = 0
+    totales = set()
+    while True:
+        pagina = _pagina_api(api, config["pagina"], numero, tamano, config["clave"])
+        registros = pagina.get("content") or []
+        totales.add(pagina.get("totalElements"))
+        cuenta = snapshot.guardar_pagina(entidad, config["clave"], registros, version)
+        resumen["nuevos"] += cuenta["nuevos"]
+        resumen["modificados"] += cuenta["modificados"]
+        numero += 1
+        if pagina.get("last", True) or not registros:
+            break
+    resumen["recorrido"] = True
+    resumen["paginas"] = numero
+    if len(totales) > 1:
+        # Las filas que faltan pueden ser de una página corrida, no bajas: se dejan para la próxima
+        resumen["inestable"] = True
+    else:
+        resumen["eliminados"] = snapshot.cerrar_version(entidad, version)
+    resumen["total"] = snapshot.total(entidad)
+    return resumen
@@ -0,0 +1,802 @@
+"""
+Backend local en memoria con los endpoints que usan los flujos del scrapper
+(/usuarios/login, /clientes/*, /productos/*, /venta/*, /factura/guardar, /efactura/*).
+
+Sirve para ejecutar los flujos sin el backend real y para medir cómo se comportan
+la UI y el scrapper ante un endpoint lento o que falla. La latencia y las fallas se
+configuran por endpoint al iniciar el servidor o en caliente con PUT /__stub/config
+(que reemplaza la configuración completa):
+
+    latencias: {"POST /venta/guardar": "800"}                   # ms fijos
+               {"/productos/todos": "200-1500"}                 # ms al azar en el rango
+    fallas:    {"DELETE /productos/eliminar": "500"}            # siempre 500
+               {"/venta/guardar": "503@0.3"}                    # 503 en el 30% de las llamadas
+
+La clave es "[MÉTODO ]ruta"; la ruta cubre también sus subrutas
+("/productos/eliminar" aplica a /productos/eliminar/<código>). Si varias claves
+aplican, gana la más larga.
+
+La app Angular tiene la URL del backend compilada (API_URL). Con SCRAPPER_STUB=<url del stub>
+get_page desvía esas peticiones al stub y ApiBackend lo usa en lugar de API_URL.
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from base64 import urlsafe_b64encode
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, TypedDict
+from urllib.parse import parse_qs, unquote, urlparse
+
+ENV_STUB = "SCRAPPER_STUB"
+
+TIPOS_IMPUESTOS = ["IVA", "Excento de IVA"]
+TAMANO_PAGINA = 10
+# Vigencia del token que entrega el login del stub
+DURACION_TOKEN = 8 * 3600
+USUARIO_STUB = {"id": 1, "nombre": "Cajero stub"}
+
+# Ruta de administración del propio stub (no existe en el backend real)
+RUTA_CONFIG = "/__stub/config"
+RUTA_REINICIAR = "/__stub/reiniciar"
+
+
+class Falla(TypedDict):
+    """Respuesta de error inyectada en un endpoint."""
+    estado: int
+    probabilidad: float
+
+
+class ErrorStub(Exception):
+    """Respuesta de error de un endpoint del stub, con el cuerpo {"mensaje": ...} del backend real."""
+
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def url_stub() -> Optional[str]:
+    """URL del stub al que deben ir las peticiones de la API, o None para usar el backend real."""
+    valor = os.getenv(ENV_STUB)
+    return valor.rstrip("/") if valor else None
+
+
+def _ahora() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+# -------------------------------------------------------------------
+# Configuración de latencia y fallas
+# -------------------------------------------------------------------
+def _separar_clave(texto: str):
+    """'POST /venta/guardar=800' -> ('POST /venta/guardar', '800')."""
+    clave, separador, valor = texto.rpartition("=")
+    if not separador or not clave.strip() or not valor.strip():
+        raise ValueError(f"Formato esperado '[MÉTODO ]ruta=valor', no {texto!r}")
+    return clave.strip(), valor.strip()
+
+
+def parsear_latencia(valor: str):
+    """'800' -> (800, 800); '200-1500' -> (200, 1500). En milisegundos."""
+    minimo, _, maximo = str(valor).partition("-")
+    minimo = float(minimo)
+    maximo = float(maximo) if maximo else minimo
+    if minimo < 0 or maximo < minimo:
+        raise ValueError(f"Latencia inválida: {valor!r}")
+    return minimo, maximo
+
+
+def parsear_falla(valor: str) -> Falla:
+    """'500' -> siempre 500; '503@0.3' -> 503 con probabilidad 0.3."""
+    estado, _, probabilidad = str(valor).partition("@")
+    falla: Falla = {"estado": int(estado), "probabilidad": float(probabilidad) if probabilidad else 1.0}
+    if not 400 <= falla["estado"] <= 599 or not 0 <= falla["probabilidad"] <= 1:
+        raise ValueError(f"Falla inválida: {valor!r}")
+    return falla
+
+
+def _coincide(clave: str, metodo: str, ruta: str) -> bool:
+    metodo_clave, _, ruta_clave = clave.rpartition(" ")
+    if metodo_clave and metodo_clave.upper() != metodo:
+        return False
+    ruta_clave = ruta_clave.rstrip("/")
+    return ruta == ruta_clave or ruta.startswith(ruta_clave + "/")
+
+
+def _mas_especifica(tabla: dict, metodo: str, ruta: str):
+    claves = [c for c in tabla if _coincide(c, metodo, ruta)]
+    return tabla[max(claves, key=len)] if claves else None
+
+
+class ConfigStub:
+    """Latencias y fallas por endpoint; se puede reemplazar con el servidor en marcha."""
+
+    def __init__(self, latencias: Dict[str, str] = None, fallas: Dict[str, str] = None):
+        self._lock = threading.Lock()
+        self.latencias = {}
+        self.fallas = {}
+        self.reemplazar(latencias or {}, fallas or {})
+
+    def reemplazar(self, latencias: Dict[str, str], fallas: Dict[str, str]) -> None:
+        # Se valida todo antes de tocar la configuración vigente
+        nuevas_latencias = {clave: parsear_latencia(valor) for clave, valor in latencias.items()}
+        nuevas_fallas = {clave: parsear_falla(valor) for clave, valor in fallas.items()}
+        with self._lock:
+            self.latencias = nuevas_latencias
+            self.fallas = nuevas_fallas
+
+    def como_dict(self) -> dict:
+        with self._lock:
+            return {
+                "latencias": {c: f"{a:g}-{b:g}" if a != b else f"{a:g}" for c, (a, b) in self.latencias.items()},
+                "fallas": {c: f"{f['estado']}@{f['probabilidad']:g}" for c, f in self.fallas.items()},
+            }
+
+    def latencia(self, metodo: str, ruta: str) -> float:
+        """Segundos a esperar antes de responder."""
+        with self._lock:
+            rango = _mas_especifica(self.latencias, metodo, ruta)
+        return random.uniform(*rango) / 1000 if rango else 0.0
+
+    def falla(self, metodo: str, ruta: str) -> Optional[int]:
+        """Estado de error a responder, o None si la petición debe atenderse normalmente."""
+        with self._lock:
+            falla = _mas_especifica(self.fallas, metodo, ruta)
+        if falla and random.random() < falla["probabilidad"]:
+            return falla["estado"]
+        return None
+
+
+# -------------------------------------------------------------------
+# Estado en memoria
+# -------------------------------------------------------------------
+def _pagina(items: list, numero: int, tamano: int) -> dict:
+    """Page<T> de Spring Data con los campos que lee el frontend."""
+    total = len(items)
+    total_paginas = (total + tamano - 1) // tamano
+    contenido = items[numero * tamano:(numero + 1) * tamano]
+    orden = {"empty": True, "sorted": False, "unsorted": True}
+    return {
+        "content": contenido,
+        "pageable": {"pageNumber": numero, "pageSize": tamano, "offset": numero * tamano,
+                     "paged": True, "unpaged": False, "sort": orden},
+        "totalPages": total_paginas,
+        "totalElements": total,
+        "last": numero >= total_paginas - 1,
+        "first": numero == 0,
+        "sort": orden,
+        "number": numero,
+        "numberOfElements": len(contenido),
+        "size": tamano,
+        "empty": not contenido,
+    }
+
+
+def _token(email: str) -> str:
+    """JWT sin firmar; el frontend y core.login solo leen el claim exp."""
+    def parte(datos: dict) -> str:
+        return urlsafe_b64encode(json.dumps(datos).encode()).rstrip(b"=").decode()
+    return f"{parte({'alg': 'none', 'typ': 'JWT'})}.{parte({'sub': email, 'exp': int(time.time()) + DURACION_TOKEN})}.stub"
+
+
+class EstadoStub:
+    """Clientes, productos, ventas y facturas del stub. Los borrados son lógicos, como en el backend."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self.clientes = {}  # cédula -> cliente
+            self.productos = {}  # código -> producto
+            self.ventas = {}  # id -> venta
+            self.facturas = []
+            self.efacturas = []
+            self._ids = {"cliente": 0, "venta": 0, "factura": 0, "efactura": 0}
+            # Entidades modificadas desde la última consulta a /<entidad>/verificar-cambios
+            self._cambios = {"clientes": False, "productos": False}
+
+    def _siguiente(self, entidad: str) -> int:
+        self._ids[entidad] += 1
+        return self._ids[entidad]
+
+    def verificar_cambios(self, entidad: str) -> bool:
+        with self._lock:
+            hubo, self._cambios[entidad] = self._cambios[entidad], False
+            return hubo
+
+    # ----------------------------------------------------------- clientes
+    @staticmethod
+    def _cliente_dto(cliente: dict) -> dict:
+        return {k: cliente[k] for k in ("id", "cedula", "nombre", "direccion", "correo", "fechaCreacion")}
+
+    def _cliente_activo(self, cedula: str) -> dict:
+        cliente = self.clientes.get(cedula)
+        if cliente is None or cliente["eliminado"]:
+            raise ErrorStub(404, f"No existe el cliente con cédula {cedula}")
+        return cliente
+
+    def _cliente_por_id(self, id_cliente: int) -> dict:
+        for cliente in self.clientes.values():
+            if cliente["id"] == id_cliente and not cliente["eliminado"]:
+                return cliente
+        raise ErrorStub(404, f"No existe el cliente con id {id_cliente}")
+
+    def clientes_activos(self) -> list:
+        with self._lock:
+            return [self._cliente_dto(c) for c in self.clientes.values() if not c["eliminado"]]
+
+    def obtener_cliente(self, cedula: str) -> dict:
+        with self._lock:
+            return self._cliente_dto(self._cliente_activo(cedula))
+
+    def guardar_cliente(self, datos: dict) -> dict:
+        cedula = str(datos.get("cedula") or "").strip()
+        if not cedula or not datos.get("nombre"):
+            raise ErrorStub(400, "La cédula y el nombre son obligatorios")
+        with self._lock:
+            existente = self.clientes.get(cedula)
+            if existente is not None and not existente["eliminado"]:
+                raise ErrorStub(400, f"Ya existe un cliente con cédula {cedula}")
+            cliente = {
+                "id": self._siguiente("cliente"),
+                "cedula": cedula,
+                "nombre": datos["nombre"],
+                "direccion": datos.get("direccion", ""),
+                "correo": datos.get("correo", ""),
+                "fechaCreacion": _ahora(),
+                "eliminado": False,
+            }
+            self.clientes[cedula] = cliente
+            self._cambios["clientes"] = True
+            return self._cliente_dto(cliente)
+
+    def actualizar_cliente(self, id_cliente: int, datos: dict) -> dict:
+        with self._lock:
+            cliente = self._cliente_por_id(id_cliente)
+            for campo in ("nombre", "direccion", "correo"):
+                if datos.get(campo) is not None:
+                    cliente[campo] = datos[campo]
+            self._cambios["clientes"] = True
+            return self._cliente_dto(cliente)
+
+    def eliminar_cliente(self, id_cliente: int) -> None:
+        with self._lock:
+            self._cliente_por_id(id_cliente)["eliminado"] = True
+            self._cambios["clientes"] = True
+
+    def estado_cliente(self, cedula: str):
+        """(existe, eliminado)."""
+        with self._lock:
+            cliente = self.clientes.get(cedula)
+            return cliente is not None, bool(cliente and cliente["eliminado"])
+
+    def recuperar_cliente(self, cedula: str) -> None:
+        with self._lock:
+            cliente = self.clientes.get(cedula)
+            if cliente is None:
+                raise ErrorStub(404, f"No existe el cliente con cédula {cedula}")
+            cliente["eliminado"] = False
+            self._cambios["clientes"] = True
+
+    # ---------------------------------------------------------- productos
+    @staticmethod
+    def _producto_dto(producto: dict) -> dict:
+        return {k: producto[k] for k in ("codigo", "nombre", "activo", "fechaCreacion")}
+
+    @staticmethod
+    def _producto_completo(producto: dict) -> dict:
+        dto = {k: producto[k] for k in ("codigo", "nombre", "impuesto", "fechaVencimiento", "lote", "fechaCreacion")}
+        dto["formaVentas"] = [dict(f) for f in producto["formasVenta"]]
+        return dto
+
+    def _producto_activo(self, codigo: str) -> dict:
+        producto = self.productos.get(codigo)
+        if producto is None or not producto["activo"]:
+            raise ErrorStub(404, f"No existe el producto con código {codigo}")
+        return producto
+
+    @staticmethod
+    def _forma(producto: dict, nombre: str) -> dict:
+        for forma in producto["formasVenta"]:
+            if forma["nombre"] == nombre:
+                return forma
+        raise ErrorStub(404, f"El producto {producto['codigo']} no tiene la forma de venta {nombre}")
+
+    def productos_activos(self) -> list:
+        with self._lock:
+            return [self._producto_dto(p) for p in self.productos.values() if p["activo"]]
+
+    def obtener_producto(self, codigo: str, completo: bool = False) -> dict:
+        with self._lock:
+            producto = self._producto_activo(codigo)
+            return self._producto_completo(producto) if completo else self._producto_dto(producto)
+
+    def formas_venta(self, codigo: str) -> list:
+        with self._lock:
+            return [dict(f) for f in self._producto_activo(codigo)["formasVenta"]]
+
+    def guardar_producto(self, datos: dict) -> dict:
+        codigo = str(datos.get("codigo") or "").strip()
+        if not codigo or not datos.get("nombre"):
+            raise ErrorStub(400, "El código y el nombre son obligatorios")
+        with self._lock:
+            existente = self.productos.get(codigo)
+            if existente is not None and existente["activo"]:
+                raise ErrorStub(400, f"Ya existe un producto con código {codigo}")
+            producto = {
+                "codigo": codigo,
+                "nombre": datos["nombre"],
+                "impuesto": datos.get("impuesto") or TIPOS_IMPUESTOS[0],
+                "fechaVencimiento": datos.get("fechaVencimiento"),
+                "lote": datos.get("lote"),
+                "minimoStock": datos.get("minimoStock", 0),
+                "fechaCreacion": _ahora(),
+                "activo": True,
+                "formasVenta": [dict(f) for f in datos.get("formasVenta") or []],
+            }
+            self.productos[codigo] = producto
+            self._cambios["productos"] = True
+            return self._producto_dto(producto)
+
+    def actualizar_producto(self, datos: dict) -> dict:
+        with self._lock:
+            producto = self._producto_activo(str(datos.get("codigo")))
+            for campo in ("nombre", "impuesto", "fechaVencimiento", "lote", "minimoStock"):
+                if campo in datos:
+                    producto[campo] = datos[campo]
+            self._cambios["productos"] = True
+            return self._producto_dto(producto)
+
+    def eliminar_producto(self, codigo: str) -> None:
+        with self._lock:
+            self._producto_activo(codigo)["activo"] = False
+            self._cambios["productos"] = True
+
+    def estado_producto(self, codigo: str):
+        """(existe, eliminado)."""
+        with self._lock:
+            producto = self.productos.get(codigo)
+            return producto is not None, bool(producto and not producto["activo"])
+
+    def recuperar_producto(self, codigo: str) -> bool:
+        with self._lock:
+            producto = self.productos.get(codigo)
+            if producto is None:
+                return False
+            producto["activo"] = True
+            self._cambios["productos"] = True
+            return True
+
+    def hay_existencias(self, codigo: str, nombre_forma: str, cantidad: float) -> bool:
+        with self._lock:
+            try:
+                return self._forma(self._producto_activo(codigo), nombre_forma)["cantidad"] >= cantidad
+            except ErrorStub:
+                return False
+
+    def guardar_forma_venta(self, codigo: str, forma: dict) -> None:
+        with self._lock:
+            producto = self._producto_activo(codigo)
+            if any(f["nombre"] == forma.get("nombre") for f in producto["formasVenta"]):
+                raise ErrorStub(400, f"El producto {codigo} ya tiene la forma de venta {forma.get('nombre')}")
+            producto["formasVenta"].append(dict(forma))
+            self._cambios["productos"] = True
+
+    def actualizar_forma_venta(self, codigo: str, nombre: str, datos: dict) -> None:
+        with self._lock:
+            forma = self._forma(self._producto_activo(codigo), nombre)
+            forma.update({k: v for k, v in datos.items() if v is not None})
+            self._cambios["productos"] = True
+
+    def eliminar_forma_venta(self, codigo: str, nombre: str) -> None:
+        with self._lock:
+            producto = self._producto_activo(codigo)
+            producto["formasVenta"].remove(self._forma(producto, nombre))
+            self._cambios["productos"] = True
+
+    # ------------------------------------------------------------- ventas
+    @staticmethod
+    def _venta_dto(venta: dict) -> dict:
+        return {k: venta[k] for k in ("id", "fecha", "total", "cliente", "usuario")}
+
+    def _venta_activa(self, id_venta: int) -> dict:
+        venta = self.ventas.get(id_venta)
+        if venta is None or venta["cancelada"]:
+            raise ErrorStub(404, f"No existe la venta {id_venta}")
+        return venta
+
+    def siguiente_id_venta(self) -> int:
+        with self._lock:
+            return self._ids["venta"] + 1
+
+    def ventas_activas(self) -> list:
+        with self._lock:
+            return [self._venta_dto(v) for v in self.ventas.values() if not v["cancelada"]]
+
+    def guardar_venta(self, datos: dict) -> int:
+        detalles_pedidos = datos.get("listDetalleVenta") or []
+        if not detalles_pedidos:
+            raise ErrorStub(400, "La venta no tiene productos")
+        with self._lock:
+            cliente = self._cliente_activo(str(datos.get("cliente")))
+            # Se valida todo el carrito antes de descontar existencias
+            lineas = []
+            for detalle in detalles_pedidos:
+                producto = self._producto_activo(str(detalle.get("codigoProducto")))
+                forma = self._forma(producto, detalle.get("nombreformaVenta"))
+                cantidad = detalle.get("cantidad") or 0
+                if cantidad <= 0 or forma["cantidad"] < cantidad:
+                    raise ErrorStub(400, f"No hay existencias suficientes de {producto['codigo']}")
+                lineas.append((producto, forma, cantidad))
+
+            detalles = []
+            for numero, (producto, forma, cantidad) in enumerate(lineas, start=1):
+                forma["cantidad"] -= cantidad
+                detalles.append({
+                    "id": numero,
+                    "cantidad": cantidad,
+                    "precio": forma["precioVenta"],
+                    "total": forma["precioVenta"] * cantidad,
+                    "producto": producto["nombre"],
+                    "codigoProducto": producto["codigo"],
+                    "formaVenta": forma["nombre"],
+                })
+            venta = {
+                "id": self._siguiente("venta"),
+                "fecha": _ahora(),
+                "total": sum(d["total"] for d in detalles) - (datos.get("descuento") or 0),
+                "cliente": cliente["cedula"],
+                "usuario": datos.get("usuario"),
+                "dineroRecibido": datos.get("dineroRecibido") or 0,
+                "cambio": datos.get("cambio") or 0,
+                "descuento": datos.get("descuento") or 0,
+                "detalles": detalles,
+                "cancelada": False,
+            }
+            self.ventas[venta["id"]] = venta
+            self._cambios["productos"] = True
+            return venta["id"]
+
+    def detalle_venta(self, id_venta: int) -> dict:
+        """FullVentaDTO."""
+        with self._lock:
+            venta = self._venta_activa(id_venta)
+            cliente = self.clientes.get(venta["cliente"], {})
+            return {
+                **self._venta_dto(venta),
+                "nombreCliente": cliente.get("nombre"),
+                "cedulaCliente": venta["cliente"],
+                "direccionCliente": cliente.get("direccion"),
+                "correoCliente": cliente.get("correo"),
+                "dineroRecibido": venta["dineroRecibido"],
+                "cambio": venta["cambio"],
+                "descuento": venta["descuento"],
+                "detalleVentaList": [
+                    {k: d[k] for k in ("id", "cantidad", "precio", "total", "producto", "formaVenta")}
+                    for d in venta["detalles"]
+                ],
+            }
+
+    def cancelar_venta(self, id_venta: int) -> bool:
+        with self._lock:
+            venta = self._venta_activa(id_venta)
+            # Devuelve las existencias de las formas de venta que sigan existiendo
+            for detalle in venta["detalles"]:
+                producto = self.productos.get(detalle["codigoProducto"])
+                try:
+                    self._forma(producto, detalle["formaVenta"])["cantidad"] += detalle["cantidad"]
+                except (ErrorStub, TypeError):
+                    pass
+            venta["cancelada"] = True
+            self._cambios["productos"] = True
+            return True
+
+    def total_ventas(self, fecha: str) -> float:
+        with self._lock:
+            return sum(v["total"] for v in self.ventas.values() if not v["cancelada"] and v["fecha"].startswith(fecha))
+
+    def facturar(self, id_venta: int, electronica: bool) -> dict:
+        """FacturaDTO / EFacturaDTO."""
+        with self._lock:
+            venta = self._venta_activa(id_venta)
+            factura = {
+                "id": self._siguiente("efactura" if electronica else "factura"),
+                "fecha": _ahora(),
+                "total": venta["total"],
+                "cliente": venta["cliente"],
+                "usuario": str(venta["usuario"]),
+                "idVenta": id_venta,
+            }
+            (self.efacturas if electronica else self.facturas).append(factura)
+            return factura
+
+
+# -------------------------------------------------------------------
+# Endpoints
+# -------------------------------------------------------------------
+# (método, patrón de la ruta, función(estado, grupos, cuerpo, query) -> cuerpo de la respuesta)
+# Se prueban en orden: las rutas fijas van antes que las que terminan en un parámetro libre.
+def _pagina_de(items: list, query: dict) -> dict:
+    # sort=campo,asc|desc como el Pageable de Spring
+    if query.get("sort"):
+        campo, _, direccion = query["sort"][0].partition(",")
+        items = sorted(items, key=lambda item: str(item.get(campo, "")), reverse=direccion.lower() == "desc")
+    numero = int(query.get("page", ["0"])[0])
+    tamano = int(query.get("size", [str(TAMANO_PAGINA)])[0])
+    return _pagina(items, numero, tamano)
+
+
+def _login(estado, grupos, cuerpo, query):
+    if not cuerpo.get("email") or not cuerpo.get("contrasena"):
+        raise ErrorStub(400, "Usuario y contraseña son obligatorios")
+    return {**USUARIO_STUB, "email": cuerpo["email"], "token": _token(cuerpo["email"])}
+
+
+_RUTAS = [
+    # Usuarios
+    ("POST", r"/usuarios/login", _login),
+    ("GET", r"/usuarios/(\d+)", lambda e, g, c, q: {**USUARIO_STUB, "id": int(g[0])}),
+
+    # Clientes
+    ("GET", r"/clientes", lambda e, g, c, q: _pagina_de(e.clientes_activos(), q)),
+    ("GET", r"/clientes/todos", lambda e, g, c, q: e.clientes_activos()),
+    ("GET", r"/clientes/verificar-cambios", lambda e, g, c, q: e.verificar_cambios("clientes")),
+    ("POST", r"/clientes/guardar", lambda e, g, c, q: e.guardar_cliente(c)),
+    ("PUT", r"/clientes/actualizar/(\d+)", lambda e, g, c, q: e.actualizar_cliente(int(g[0]), c)),
+    ("DELETE", r"/clientes/eliminar/(\d+)", lambda e, g, c, q: e.eliminar_cliente(int(g[0]))),
+    ("GET", r"/clientes/verificar-cliente/([^/]+)",
+     lambda e, g, c, q: e.estado_cliente(g[0]) == (True, False)),
+    ("GET", r"/clientes/verificar-eliminado/([^/]+)", lambda e, g, c, q: e.estado_cliente(g[0])[1]),
+    ("GET", r"/clientes/recuperar-cliente/([^/]+)", lambda e, g, c, q: e.recuperar_cliente(g[0])),
+    ("GET", r"/clientes/([^/]+)", lambda e, g, c, q: e.obtener_cliente(g[0])),
+
+    # Productos
+    ("GET", r"/productos", lambda e, g, c, q: _pagina_de(e.productos_activos(), q)),
+    ("GET", r"/productos/todos", lambda e, g, c, q: e.productos_activos()),
+    ("GET", r"/productos/tipos-impuestos", lambda e, g, c, q: list(TIPOS_IMPUESTOS)),
+    ("GET", r"/productos/verificar-cambios", lambda e, g, c, q: e.verificar_cambios("productos")),
+    ("POST", r"/productos/guardar", lambda e, g, c, q: e.guardar_producto(c)),
+    ("PUT", r"/productos/actualizar", lambda e, g, c, q: e.actualizar_producto(c)),
+    ("DELETE", r"/productos/eliminar/([^/]+)", lambda e, g, c, q: e.eliminar_producto(g[0])),
+    ("GET", r"/productos/verificar-cod-producto/([^/]+)",
+     lambda e, g, c, q: e.estado_producto(g[0]) == (True, False)),
+    ("GET", r"/productos/verificar-cantidad/([^/]+)/([^/]+)/([^/]+)",
+     lambda e, g, c, q: e.hay_existencias(g[1], g[2], float(g[0]))),
+    ("GET", r"/productos/fue-eliminado/([^/]+)", lambda e, g, c, q: e.estado_producto(g[0])[1]),
+    ("GET", r"/productos/recuperar-producto/([^/]+)", lambda e, g, c, q: e.recuperar_producto(g[0])),
+    ("GET", r"/productos/obtener-producto/([^/]+)", lambda e, g, c, q: e.obtener_producto(g[0])),
+    ("GET", r"/productos/obtener-producto-completo/([^/]+)",
+     lambda e, g, c, q: e.obtener_producto(g[0], completo=True)),
+    ("GET", r"/productos/obtener-formas-venta/([^/]+)", lambda e, g, c, q: e.formas_venta(g[0])),
+    ("POST", r"/productos/guardar-forma-venta",
+     lambda e, g, c, q: e.guardar_forma_venta(str(c.get("codigo")), c.get("formaVentaDTO") or {})),
+    ("PUT", r"/productos/actualizar-forma-venta",
+     lambda e, g, c, q: e.actualizar_forma_venta(str(c.get("codigo")), c.get("nombreFormaVenta"),
+                                                 c.get("formaVentaDTO") or {})),
+    ("DELETE", r"/productos/eliminar-forma-venta/([^/]+)/([^/]+)",
+     lambda e, g, c, q: e.eliminar_forma_venta(g[0], g[1])),
+
+    # Ventas y facturas
+    ("GET", r"/venta/siguiente-id", lambda e, g, c, q: e.siguiente_id_venta()),
+    ("GET", r"/venta/obtener-ventas", lambda e, g, c, q: e.ventas_activas()),
+    ("GET", r"/venta/obtener-ventas-completadas", lambda e, g, c, q: _pagina_de(e.ventas_activas(), q)),
+    ("GET", r"/venta/total-ventas", lambda e, g, c, q: e.total_ventas(q.get("fecha", [""])[0])),
+    ("POST", r"/venta/guardar", lambda e, g, c, q: e.guardar_venta(c)),
+    ("DELETE", r"/venta/cancelar/(\d+)", lambda e, g, c, q: e.cancelar_venta(int(g[0]))),
+    ("GET", r"/venta/(\d+)", lambda e, g, c, q: e.detalle_venta(int(g[0]))),
+    ("POST", r"/factura/guardar", lambda e, g, c, q: e.facturar(int(c.get("idVenta") or 0), electronica=False)),
+    ("POST", r"/efactura/guardar", lambda e, g, c, q: e.facturar(int(c.get("idVenta") or 0), electronica=True)),
+    ("GET", r"/efactura/obtener-efacturas", lambda e, g, c, q: _pagina_de(list(e.efacturas), q)),
+
+    # Pantalla principal: sin datos, pero sin errores que abran alertas en la UI
+    ("GET", r"/dashboard/estadisticas", lambda e, g, c, q: {}),
+]
+_RUTAS = [(metodo, re.compile(patron + "/?"), funcion) for metodo, patron, funcion in _RUTAS]
+
+
+def atender(estado: EstadoStub, metodo: str, ruta: str, cuerpo, query: dict):
+    """Ejecuta el endpoint que corresponde a la petición. Lanza ErrorStub si no existe o falla."""
+    for metodo_ruta, patron, funcion in _RUTAS:
+        if metodo_ruta != metodo:
+            continue
+        coincidencia = patron.fullmatch(ruta)
+        if coincidencia:
+            grupos = [unquote(g) for g in coincidencia.groups()]
+            return funcion(estado, grupos, cuerpo if isinstance(cuerpo, dict) else {}, query)
+    raise ErrorStub(404, f"El stub no implementa {metodo} {ruta}")
+
+
+# -------------------------------------------------------------------
+# Servidor HTTP
+# -------------------------------------------------------------------
+class _Manejador(BaseHTTPRequestHandler):
+    server_version = "ScrapperStub/1.0"
+
+    def log_message(self, formato, *args):
+        if self.server.verbose:
+            super().log_message(formato, *args)
+
+    def _enviar(self, estado: int, cuerpo=None) -> None:
+        datos = b"" if cuerpo is None else json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(estado)
+        # La app corre en otro origen (BASE_URL): el navegador exige CORS
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+        self.send_header("Access-Control-Allow-Credentials", "true")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Authorization, Content-Type")
+        if datos:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def _leer_cuerpo(self):
+        largo = int(self.headers.get("Content-Length") or 0)
+        if not largo:
+            return None
+        try:
+            return json.loads(self.rfile.read(largo))
+        except ValueError:
+            raise ErrorStub(400, "El cuerpo no es JSON válido")
+
+    def _administrar(self, metodo: str, ruta: str, cuerpo) -> None:
+        config = self.server.config
+        if ruta == RUTA_CONFIG and metodo == "PUT":
+            try:
+                config.reemplazar((cuerpo or {}).get("latencias", {}), (cuerpo or {}).get("fallas", {}))
+            except (TypeError, ValueError) as e:
+                raise ErrorStub(400, str(e))
+        elif ruta == RUTA_REINICIAR and metodo == "POST":
+            self.server.estado.reiniciar()
+        elif not (ruta == RUTA_CONFIG and metodo == "GET"):
+            raise ErrorStub(404, f"El stub no implementa {metodo} {ruta}")
+        self._enviar(200, config.como_dict())
+
+    def _atender(self, metodo: str) -> None:
+        url = urlparse(self.path)
+        ruta = url.path.rstrip("/") or "/"
+        try:
+            cuerpo = self._leer_cuerpo()
+            if ruta.startswith("/__stub/"):
+                self._administrar(metodo, ruta, cuerpo)
+                return
+
+            config = self.server.config
+            espera = config.latencia(metodo, ruta)
+            if espera:
+                time.sleep(espera)
+            estado_falla = config.falla(metodo, ruta)
+            if estado_falla is not None:
+                raise ErrorStub(estado_falla, f"Falla inyectada por el stub en {metodo} {ruta}")
+
+            respuesta = atender(self.server.estado, metodo, ruta, cuerpo, parse_qs(url.query))
+            self._enviar(200, respuesta)
+        except ErrorStub as e:
+            self._enviar(e.estado, {"mensaje": str(e)})
+        except Exception as e:
+            self._enviar(500, {"mensaje": f"Error interno del stub: {e}"})
+
+    def do_OPTIONS(self):
+        self._enviar(204)
+
+    def do_GET(self):
+        self._atender("GET")
+
+    def do_POST(self):
+        self._atender("POST")
+
+    def do_PUT(self):
+        self._atender("PUT")
+
+    def do_DELETE(self):
+        self._atender("DELETE")
+
+
+class ServidorStub(ThreadingHTTPServer):
+    """
+    Backend en memoria en un hilo propio:
+
+        with ServidorStub(latencias={"POST /venta/guardar": "800"}) as stub:
+            os.environ[ENV_STUB] = stub.url
+            ...
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", puerto: int = 0, latencias: Dict[str, str] = None,
+                 fallas: Dict[str, str] = None, verbose: bool = False):
+        super().__init__((host, puerto), _Manejador)
+        self.estado = EstadoStub()
+        self.config = ConfigStub(latencias, fallas)
+        self.verbose = verbose
+        self._hilo = None
+
+    @property
+    def url(self) -> str:
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def iniciar(self) -> "ServidorStub":
+        self._hilo = threading.Thread(target=self.serve_forever, name="stub-backend", daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self) -> None:
+        if self._hilo is not None:
+            self.shutdown()
+            self._hilo.join()
+            self._hilo = None
+        self.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
+
+
+# -------------------------------------------------------------------
+# Integración con los scripts y el navegador
+# -------------------------------------------------------------------
+def parsear_pares(valores) -> Dict[str, str]:
+    """['POST /venta/guardar=800', ...] -> {'POST /venta/guardar': '800', ...}."""
+    return dict(_separar_clave(v) for v in valores or [])
+
+
+def agregar_opciones_config(parser) -> None:
+    """Opciones --latencia y --falla (repetibles) para configurar el stub desde la línea de comandos."""
+    parser.add_argument("--latencia", action="append", metavar="'[MÉTODO ]ruta=ms'",
+                        help="Latencia del stub para un endpoint, p. ej. 'POST /venta/guardar=800' o '/productos=100-400'")
+    parser.add_argument("--falla", action="append", metavar="'[MÉTODO ]ruta=estado[@prob]'",
+                        help="Error del stub para un endpoint, p. ej. 'DELETE /productos/eliminar=500@0.5'")
+
+
+def agregar_argumentos(parser) -> None:
+    """Opciones de línea de comandos para levantar el stub desde un script."""
+    parser.add_argument("--stub", action="store_true",
+                        help="Usa un backend local en memoria en lugar de la API real")
+    agregar_opciones_config(parser)
+
+
+def servidor_desde_args(args, puerto: int = 0) -> Optional[ServidorStub]:
+    """
+    Si se pidió --stub, levanta el servidor y publica su URL en SCRAPPER_STUB
+    (la heredan los subprocesos). Quien lo recibe debe llamar a detener().
+    """
+    if not args.stub:
+        return None
+    servidor = ServidorStub(puerto=puerto, latencias=parsear_pares(args.latencia),
+                            fallas=parsear_pares(args.falla)).iniciar()
+    os.environ[ENV_STUB] = servidor.url
+    return servidor
+
+
+def patron_redireccion() -> Optional[str]:
+    """Patrón de las peticiones de la app que hay que desviar al stub, o None si no hay nada que desviar."""
+    # Import diferido: core.api (ApiBackend) importa este módulo
+    from core.api import load_api_url
+
+    destino = url_stub()
+    if destino is None or destino == load_api_url():
+        return None
+    return f"{load_api_url()}/**"
+
+
+def url_redirigida(url: str) -> str:
+    """URL equivalente en el stub para una petición de la app a API_URL."""
+    from core.api import load_api_url
+
+    return url_stub() + url[len(load_api_url()):]
+
+
+def redirigir_api(context) -> None:
+    """Desvía al stub (SCRAPPER_STUB) las peticiones de la app a API_URL."""
+    patron = patron_redireccion()
+    if patron is not None:
+        context.route(patron, lambda route: route.continue_(url=url_redirigida(route.request.url)))
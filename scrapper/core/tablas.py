@@ -0,0 +1,220 @@
+"""
+Lectura de las tablas de la app (cliente, producto, lista-ventas, movimientos) en una sola
+evaluación del DOM.
+
+    filas = leer_tabla(page, "cliente")                    # filas del tbody de la página actual
+    hay_fila(filas, cedula="1234567890")                    # la validación se resuelve en memoria
+    for numero, filas in paginas(page, "producto"): ...     # recorre la paginación del backend
+
+Cada fila es un dict con las columnas de la tabla (FilaCliente, FilaProducto, FilaVenta, FilaMovimiento);
+la columna de acciones (botones) no se lee. Se usa textContent, así que las columnas
+ocultas en pantallas angostas (correo, fecha de creación) también se leen.
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Tuple, TypedDict
+
+from core.esperas import esperar_angular_estable
+
+# Filas del tbody de la primera tabla que coincide con el selector, como listas de textos por celda
+_JS_LEER_TABLA = """
+(selector) => {
+    const tabla = document.querySelector(selector);
+    if (!tabla) return null;
+    return Array.from(tabla.querySelectorAll(':scope > tbody > tr')).map(fila =>
+        Array.from(fila.cells).map(celda => celda.textContent.replace(/\\s+/g, ' ').trim())
+    );
+}
+"""
+
+# Tope de páginas al recorrer una tabla paginada, por si el botón "Siguiente" nunca se deshabilita
+MAX_PAGINAS = 500
+
+
+class FilaCliente(TypedDict):
+    cedula: str
+    nombre: str
+    direccion: str
+    correo: str
+    fecha_creacion: str
+
+
+class FilaProducto(TypedDict):
+    codigo: str
+    nombre: str
+
+
+class FilaVenta(TypedDict):
+    cliente: str  # lo que manda el backend en VentaDTO.cliente: la cédula o el nombre
+    fecha: str  # yyyy-MM-dd HH:mm:ss
+    total: Optional[int]
+
+
+class FilaMovimiento(TypedDict):
+    fecha_hora: str
+    motivo: str
+    valor: Optional[int]
+    tipo: str  # ingreso | egreso
+
+
+class Tabla(TypedDict):
+    selector: str  # tabla principal de la pantalla
+    columnas: Tuple[str, ...]  # en el orden de las celdas; las celdas sobrantes (acciones) se ignoran
+    paginacion: Optional[str]  # <ul class="pagination"> de la tabla (None: sin paginación)
+
+
+def _entero(texto: str) -> Optional[int]:
+    """'$ 12.500' -> 12500 (la app muestra los montos sin decimales)."""
+    digitos = re.sub(r"\D", "", texto)
+    return int(digitos) if digitos else None
+
+
+TABLAS: Dict[str, Tabla] = {
+    "cliente": {
+        "selector": "app-home-cliente .table-container table",
+        "columnas": ("cedula", "nombre", "direccion", "correo", "fecha_creacion"),
+        "paginacion": "app-home-cliente ul.pagination",
+    },
+    "producto": {
+        "selector": "app-home-producto .table-container table",
+        "columnas": ("codigo", "nombre"),
+        "paginacion": "app-home-producto ul.pagination",
+    },
+    "lista-ventas": {
+        "selector": "app-lista-ventas .table-container table",
+        "columnas": ("cliente", "fecha", "total"),
+        "paginacion": "app-lista-ventas ul.pagination",
+    },
+    "movimientos": {
+        "selector": "app-movimientos .table-container table",
+        "columnas": ("fecha_hora", "motivo", "valor", "tipo"),
+        # Sin paginación: la pantalla trae todos los movimientos de la fecha filtrada
+        "paginacion": None,
+    },
+}
+
+CONVERSIONES: Dict[str, Callable[[str], object]] = {
+    "total": _entero,
+    "valor": _entero,
+}
+
+
+def tabla(nombre: str) -> Tabla:
+    if nombre not in TABLAS:
+        raise KeyError(f"Tabla desconocida {nombre!r}; opciones: {', '.join(TABLAS)}")
+    return TABLAS[nombre]
+
+
+def convertir_filas(nombre: str, celdas: Optional[List[List[str]]]) -> List[dict]:
+    """
+    Arma los dicts de cada fila a partir de los textos de sus celdas.
+    Las filas con menos celdas que columnas (p. ej. un "sin resultados" con colspan) se descartan.
+    """
+    columnas = tabla(nombre)["columnas"]
+    filas = []
+    for fila in celdas or []:
+        if len(fila) < len(columnas):
+            continue
+        filas.append({
+            columna: CONVERSIONES.get(columna, str)(texto)
+            for columna, texto in zip(columnas, fila)
+        })
+    return filas
+
+
+def hay_fila(filas: List[dict], **valores) -> bool:
+    """Si alguna fila tiene exactamente esos valores, p. ej. hay_fila(filas, cedula=..., nombre=...)."""
+    return any(all(fila.get(columna) == valor for columna, valor in valores.items()) for fila in filas)
+
+
+def hay_fila_que_contiene(filas: List[dict], **valores) -> bool:
+    """
+    Como hay_fila, pero basta con que cada valor aparezca dentro del texto de su columna
+    (sin distinguir mayúsculas), igual que el buscador de la app.
+    """
+    return any(
+        all(str(valor).lower() in str(fila.get(columna, "")).lower() for columna, valor in valores.items())
+        for fila in filas
+    )
+
+
+# -------------------------------------------------------------------
+# Lectura
+# -------------------------------------------------------------------
+def leer_tabla(page, nombre: str) -> List[dict]:
+    """Filas de la página actual de la tabla, en un único evaluate. Lista vacía si la tabla no está."""
+    return convertir_filas(nombre, page.evaluate(_JS_LEER_TABLA, tabla(nombre)["selector"]))
+
+
+def _boton_siguiente(page, nombre: str):
+    """Botón "Siguiente" habilitado, o None si la tabla no pagina o ya está en la última página."""
+    paginacion = tabla(nombre)["paginacion"]
+    if paginacion is None:
+        return None
+    # "Siguiente" es el último elemento de la paginación; la app lo deshabilita en la última página
+    item = page.locator(f"{paginacion} > li.page-item:last-child").first
+    if not item.is_visible() or "disabled" in (item.get_attribute("class") or "").split():
+        return None
+    return item.locator("button")
+
+
+def pagina_actual(page, nombre: str) -> int:
+    """Página que muestra la tabla, desde 0 (siempre 0 si no pagina)."""
+    paginacion = tabla(nombre)["paginacion"]
+    if paginacion is None:
+        return 0
+    activa = page.locator(f"{paginacion} > li.page-item.active button").first
+    if not activa.is_visible():
+        return 0
+    return int(activa.inner_text().strip()) - 1
+
+
+def _boton_numero(page, paginacion: str, numero: int):
+    """Botón de la paginación cuyo texto es exactamente el número de página (desde 1)."""
+    return page.locator(f"{paginacion} > li.page-item button", has_text=re.compile(rf"^\s*{numero}\s*$")).first
+
+
+def ir_a_pagina(page, nombre: str, destino: int) -> int:
+    """
+    Avanza la tabla hasta la página `destino` (desde 0) saltando con los números de página visibles,
+    sin leer las intermedias. Retorna la página en la que quedó (menor si la tabla tiene menos páginas).
+    """
+    paginacion = tabla(nombre)["paginacion"]
+    actual = pagina_actual(page, nombre)
+    while paginacion is not None and actual < destino:
+        numeros = page.locator(f"{paginacion} > li.page-item:not(.disabled) button").all_inner_texts()
+        visibles = [int(n) - 1 for n in numeros if n.strip().isdigit()]
+        salto = max((n for n in visibles if actual < n <= destino), default=None)
+        if salto is None:
+            break
+        _boton_numero(page, paginacion, salto + 1).click()
+        esperar_angular_estable(page)
+        actual = pagina_actual(page, nombre)
+    return actual
+
+
+def paginas(page, nombre: str, max_paginas: int = MAX_PAGINAS):
+    """
+    Genera (número de página, filas) de cada página de la tabla, desde la actual hasta la última.
+    Avanza con "Siguiente" y espera a que Angular pinte la página pedida al backend;
+    se detiene si una página llega igual a la anterior (el botón no avanzó).
+    """
+    anterior = None
+    numero = pagina_actual(page, nombre)
+    for _ in range(max_paginas):
+        filas = leer_tabla(page, nombre)
+        if filas == anterior:
+            return
+        yield numero, filas
+        anterior = filas
+        boton = _boton_siguiente(page, nombre)
+        if boton is None:
+            return
+        boton.click()
+        esperar_angular_estable(page)
+        numero += 1
+
+
+def leer_todas(page, nombre: str, max_paginas: int = MAX_PAGINAS) -> List[dict]:
+    """Filas de todas las páginas de la tabla, desde la actual."""
+    return [fila for _, filas in paginas(page, nombre, max_paginas) for fila in filas]
@@ -0,0 +1,79 @@
+"""
+Variante asyncio de core.tablas.
+Misma lectura de tablas (script, columnas y conversiones compartidos) sobre playwright.async_api.
+"""
+
+from typing import List
+
+from core.esperas_async import esperar_angular_estable
+from core.tablas import (
+    MAX_PAGINAS,
+    _JS_LEER_TABLA,
+    _boton_numero,
+    convertir_filas,
+    hay_fila,
+    hay_fila_que_contiene,
+    tabla,
+)
+
+__all__ = ["hay_fila", "hay_fila_que_contiene"]
+
+
+async def leer_tabla(page, nombre: str) -> List[dict]:
+    return convertir_filas(nombre, await page.evaluate(_JS_LEER_TABLA, tabla(nombre)["selector"]))
+
+
+async def _boton_siguiente(page, nombre: str):
+    paginacion = tabla(nombre)["paginacion"]
+    if paginacion is None:
+        return None
+    item = page.locator(f"{paginacion} > li.page-item:last-child").first
+    if not await item.is_visible() or "disabled" in (await item.get_attribute("class") or "").split():
+        return None
+    return item.locator("button")
+
+
+async def pagina_actual(page, nombre: str) -> int:
+    paginacion = tabla(nombre)["paginacion"]
+    if paginacion is None:
+        return 0
+    activa = page.locator(f"{paginacion} > li.page-item.active button").first
+    if not await activa.is_visible():
+        return 0
+    return int((await activa.inner_text()).strip()) - 1
+
+
+async def ir_a_pagina(page, nombre: str, destino: int) -> int:
+    paginacion = tabla(nombre)["paginacion"]
+    actual = await pagina_actual(page, nombre)
+    while paginacion is not None and actual < destino:
+        numeros = await page.locator(f"{paginacion} > li.page-item:not(.disabled) button").all_inner_texts()
+        visibles = [int(n) - 1 for n in numeros if n.strip().isdigit()]
+        salto = max((n for n in visibles if actual < n <= destino), default=None)
+        if salto is None:
+            break
+        await _boton_numero(page, paginacion, salto + 1).click()
+        await esperar_angular_estable(page)
+        actual = await pagina_actual(page, nombre)
+    return actual
+
+
+async def paginas(page, nombre: str, max_paginas: int = MAX_PAGINAS):
+    anterior = None
+    numero = await pagina_actual(page, nombre)
+    for _ in range(max_paginas):
+        filas = await leer_tabla(page, nombre)
+        if filas == anterior:
+            return
+        yield numero, filas
+        anterior = filas
+        boton = await _boton_siguiente(page, nombre)
+        if boton is None:
+            return
+        await boton.click()
+        await esperar_angular_estable(page)
+        numero += 1
+
+
+async def leer_todas(page, nombre: str, max_paginas: int = MAX_PAGINAS) -> List[dict]:
+    return [fila async for _, filas in paginas(page, nombre, max_paginas) for fila in filas]
@@ -0,0 +1,174 @@
+"""
+Métricas de carga del lado del navegador (Web Vitals y Navigation Timing) por ruta.
+
+instalar_vitales(context) agrega al contexto un script de inicio con PerformanceObserver
+para LCP, CLS y tareas largas. medir_ruta(page, ruta) lee esos contadores antes y después
+de navegar y registra una línea por visita en .metricas/<SCRAPPER_RUN_ID>.vitales.jsonl
+(y en la tabla vitales del historial, core.almacen).
+
+La app es una SPA: solo la primera carga del documento (tipo "carga") tiene
+Navigation Timing, FCP y LCP propios. En las navegaciones del router (tipo "spa")
+se registran la duración, el CLS y las tareas largas ocurridas durante la navegación
+y el heap de JS al terminar.
+"""
+
+import json
+import statistics
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from core import almacen
+from core.ejecucion import DIR_METRICAS, habilitadas, leer_jsonl, run_id, test_actual
+
+# Se ejecuta en cada documento antes que los scripts de la app
+_JS_OBSERVADORES = """
+(() => {
+    if (window.__vitales) return;
+    const v = window.__vitales = { lcp: null, cls: 0, tareasLargas: 0, msTareasLargas: 0 };
+    const observar = (tipo, alRegistrar) => {
+        try {
+            new PerformanceObserver(lista => lista.getEntries().forEach(alRegistrar))
+                .observe({ type: tipo, buffered: true });
+        } catch (e) { /* tipo no soportado por el navegador */ }
+    };
+    observar('largest-contentful-paint', e => { v.lcp = e.renderTime || e.startTime; });
+    observar('layout-shift', e => { if (!e.hadRecentInput) v.cls += e.value; });
+    observar('longtask', e => { v.tareasLargas += 1; v.msTareasLargas += e.duration; });
+})();
+"""
+
+_JS_LEER_VITALES = """
+() => {
+    const v = window.__vitales || {};
+    const nav = performance.getEntriesByType('navigation')[0];
+    const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+    const memoria = performance.memory;
+    return {
+        origen: performance.timeOrigin,
+        lcp: v.lcp ?? null,
+        cls: v.cls ?? 0,
+        tareas_largas: v.tareasLargas ?? 0,
+        ms_tareas_largas: v.msTareasLargas ?? 0,
+        fcp: fcp ? fcp.startTime : null,
+        navegacion: nav ? {
+            ttfb_ms: nav.responseStart,
+            dom_interactivo_ms: nav.domInteractive,
+            dom_cargado_ms: nav.domContentLoadedEventEnd,
+            carga_ms: nav.loadEventEnd,
+            bytes: nav.transferSize,
+        } : null,
+        heap_mb: memoria ? memoria.usedJSHeapSize / 1048576 : null,
+    };
+}
+"""
+
+# Métricas que se resumen en la tabla por ruta
+_COLUMNAS = ("duracion_s", "fcp_ms", "lcp_ms", "cls", "tareas_largas", "ms_tareas_largas", "heap_mb")
+
+_lock_archivo = threading.Lock()
+
+
+def ruta_vitales(id_ejecucion: str = None) -> Path:
+    return DIR_METRICAS / f"{id_ejecucion or run_id()}.vitales.jsonl"
+
+
+def instalar_vitales(context) -> None:
+    """Agrega los observadores de rendimiento a todas las páginas del contexto."""
+    if habilitadas():
+        context.add_init_script(_JS_OBSERVADORES)
+
+
+def registro_de_visita(ruta: str, antes, despues: dict, duracion: float) -> dict:
+    """Arma el registro de una visita a partir de las lecturas previa y posterior a navegar."""
+    # Si cambió el origen de tiempos hubo una carga completa del documento
+    carga = antes is None or antes["origen"] != despues["origen"]
+    base = {"cls": 0, "tareas_largas": 0, "ms_tareas_largas": 0} if carga else antes
+    return {
+        "run": run_id(),
+        "test": test_actual(),
+        "ruta": ruta,
+        "tipo": "carga" if carga else "spa",
+        "inicio": time.time() - duracion,
+        "duracion_s": round(duracion, 4),
+        "fcp_ms": despues["fcp"] if carga else None,
+        "lcp_ms": despues["lcp"] if carga else None,
+        "navegacion": despues["navegacion"] if carga else None,
+        "cls": round(despues["cls"] - base["cls"], 4),
+        "tareas_largas": despues["tareas_largas"] - base["tareas_largas"],
+        "ms_tareas_largas": round(despues["ms_tareas_largas"] - base["ms_tareas_largas"], 1),
+        "heap_mb": round(despues["heap_mb"], 2) if despues["heap_mb"] is not None else None,
+    }
+
+
+def escribir_visita(registro: dict) -> None:
+    ruta = ruta_vitales()
+    with _lock_archivo:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        with ruta.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    almacen.registrar("vitales", registro)
+
+
+def _leer(page):
+    try:
+        return page.evaluate(_JS_LEER_VITALES)
+    except Exception:
+        return None
+
+
+@contextmanager
+def medir_ruta(page, ruta: str):
+    """
+    Registra las métricas de la navegación ejecutada dentro del bloque:
+
+        with medir_ruta(page, "/app/cliente"):
+            page.click(...)
+            page.wait_for_selector("app-cliente")
+    """
+    if not habilitadas():
+        yield
+        return
+    antes = _leer(page)
+    inicio = time.perf_counter()
+    yield
+    duracion = time.perf_counter() - inicio
+    despues = _leer(page)
+    if despues is None:
+        return
+    try:
+        escribir_visita(registro_de_visita(ruta, antes, despues, duracion))
+    except OSError as e:
+        print(f"⚠ No se pudieron registrar las métricas de {ruta}: {e}")
+
+
+# -------------------------------------------------------------------
+# Reporte
+# -------------------------------------------------------------------
+def leer_visitas(id_ejecucion: str = None) -> list:
+    return leer_jsonl(ruta_vitales(id_ejecucion))
+
+
+def imprimir_vitales(id_ejecucion: str = None) -> None:
+    """Imprime la mediana de cada métrica por ruta y tipo de navegación de la ejecución."""
+    visitas = leer_visitas(id_ejecucion)
+    if not visitas:
+        return
+    grupos = defaultdict(list)
+    for visita in visitas:
+        grupos[(visita["ruta"], visita["tipo"])].append(visita)
+
+    print("\n" + "=" * 100)
+    print("RENDIMIENTO POR RUTA (medianas)")
+    print("=" * 100)
+    print(f"{'Ruta':<22}{'Tipo':<7}{'n':>4}" + "".join(f"{c:>10}" for c in ("dur s", "FCP ms", "LCP ms",
+                                                                           "CLS", "tareas", "ms tareas", "heap MB")))
+    for (ruta, tipo), grupo in sorted(grupos.items()):
+        celdas = []
+        for columna in _COLUMNAS:
+            valores = [v[columna] for v in grupo if v.get(columna) is not None]
+            celdas.append(f"{statistics.median(valores):>10.2f}" if valores else f"{'-':>10}")
+        print(f"{ruta:<22}{tipo:<7}{len(grupo):>4}" + "".join(celdas))
+    print("=" * 100)
@@ -0,0 +1,40 @@
+"""
+Variante asyncio de core.vitales (mismos scripts y mismo archivo de registro).
+"""
+
+import time
+from contextlib import asynccontextmanager
+
+from core.ejecucion import habilitadas
+from core.vitales import _JS_LEER_VITALES, _JS_OBSERVADORES, escribir_visita, registro_de_visita
+
+
+async def instalar_vitales(context) -> None:
+    if habilitadas():
+        await context.add_init_script(_JS_OBSERVADORES)
+
+
+async def _leer(page):
+    try:
+        return await page.evaluate(_JS_LEER_VITALES)
+    except Exception:
+        return None
+
+
+@asynccontextmanager
+async def medir_ruta(page, ruta: str):
+    """Registra las métricas de la navegación ejecutada dentro del bloque `async with`."""
+    if not habilitadas():
+        yield
+        return
+    antes = await _leer(page)
+    inicio = time.perf_counter()
+    yield
+    duracion = time.perf_counter() - inicio
+    despues = await _leer(page)
+    if despues is None:
+        return
+    try:
+        escribir_visita(registro_de_visita(ruta, antes, despues, duracion))
+    except OSError as e:
+        print(f"⚠ No se pudieron registrar las métricas de {ruta}: {e}")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Carga y limpieza de datos de prueba en lote por API.
+
+Uso:
+    python fixtures.py crear --clientes 1000 --productos 500 --ventas 200
+    python fixtures.py crear --productos 5000 --hilos 16
+    python fixtures.py limpiar              # Borra todo lo registrado por ejecuciones anteriores
+    python fixtures.py limpiar --registro .fixtures/registro-<run>-<pid>.jsonl   # solo esa ejecución
+
+Cada ejecución (y cada worker) registra lo que crea en su propio archivo de .fixtures/;
+limpiar sin --registro los recorre todos, así que conviene no correrlo mientras hay tests en curso.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from actions.fabrica_actions import HILOS_DEFAULT, FabricaDatos, registros_guardados
+
+
+def parse_args():
+    """Interpreta los argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Crea o elimina datos de prueba en lote.")
+    parser.add_argument("accion", choices=["crear", "limpiar"])
+    parser.add_argument("--clientes", type=int, default=0)
+    parser.add_argument("--productos", type=int, default=0)
+    parser.add_argument("--ventas", type=int, default=0)
+    parser.add_argument("--hilos", type=int, default=HILOS_DEFAULT,
+                        help=f"Peticiones concurrentes (por defecto {HILOS_DEFAULT})")
+    parser.add_argument("--registro", type=Path,
+                        help="limpiar: solo el registro indicado (por defecto, todos los de .fixtures/)")
+    return parser.parse_args()
+
+
+def main():
+    """Función principal."""
+    args = parse_args()
+    fabrica = FabricaDatos(hilos=args.hilos)
+
+    try:
+        inicio = time.perf_counter()
+        if args.accion == "limpiar":
+            rutas = [args.registro] if args.registro else registros_guardados()
+            borrados = sum(
+                FabricaDatos(api=fabrica.api, hilos=args.hilos, registro=ruta).limpiar() for ruta in rutas
+            )
+            print(f"✓ {borrados} registros eliminados de {len(rutas)} archivos "
+                  f"en {time.perf_counter() - inicio:.1f}s")
+            return
+
+        clientes = fabrica.crear_clientes(args.clientes)
+        print(f"✓ {len(clientes)}/{args.clientes} clientes creados")
+        productos = fabrica.crear_productos(args.productos)
+        print(f"✓ {len(productos)}/{args.productos} productos creados")
+        if args.ventas:
+            ventas = fabrica.crear_ventas(args.ventas, clientes, productos)
+            print(f"✓ {len(ventas)}/{args.ventas} ventas creadas")
+        print(f"Tiempo total: {time.perf_counter() - inicio:.1f}s")
+        print(f"Usa 'python fixtures.py limpiar --registro {fabrica.registro}' para eliminarlos "
+              "(o 'python fixtures.py limpiar' para borrar lo de todas las ejecuciones)")
+    except Exception as e:
+        print(f"✗ ERROR: {e}")
+        sys.exit(1)
+    finally:
+        fabrica.api.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,67 @@ Uso:
     python run_tests.py venta              # Ejecuta solo tests de venta
     python run_tests.py crud               # Ejecuta solo tests CRUD completos
     python run_tests.py --list             # Lista todos los tests disponibles
+    python run_tests.py --workers 4        # Ejecuta los tests en paralelo (4 a la vez)
+    python run_tests.py --browser-server   # Comparte un único Chromium entre todos los tests
+    python run_tests.py --red              # Graba las llamadas al backend y muestra un resumen por endpoint
+    python run_tests.py --har grabar       # Graba las respuestas del backend de cada test (.har/)
+    python run_tests.py --har reproducir   # Ejecuta los tests contra lo grabado, sin backend
+    python run_tests.py --stub --latencia 'POST /venta/guardar=800'   # Backend local en memoria
+    python run_tests.py --filtro crud-only # No descarga imágenes, fuentes ni scripts de terceros
+    python run_tests.py --shard 2/4        # Solo la 2.ª de 4 partes, balanceadas por duración
+    python run_tests.py --actualizar-duraciones   # Guarda las duraciones en test/duraciones.json
+    python run_tests.py --fail-fast        # Si falla el login, no ejecuta (o corta) el resto
+    python run_tests.py --orden original   # Sin reordenar por historial
+    python run_tests.py --junit reportes/junit.xml --json reportes/resultados.json
 """
 
+import os
 import sys
+import json
+import argparse
+import statistics
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, List, Optional, Tuple
+
+
+TIMEOUT_TEST = 300  # 5 minutos máximo por test
+
+# Todos los tests de una ejecución escriben sus métricas por paso en el mismo archivo (ver core.metricas)
+ENV_RUN_ID = "SCRAPPER_RUN_ID"
+# Activa el grabador de tráfico de core.red en los tests
+ENV_RED = "SCRAPPER_RED"
+# Modo de grabación/reproducción del backend de core.har
+ENV_HAR = "SCRAPPER_HAR"
+# Preset de core.filtros con el que los tests abren el navegador
+ENV_FILTRO = "SCRAPPER_FILTRO"
+
+# Duraciones con las que --shard balancea las partes. Todas las máquinas deben leer el mismo
+# archivo: se versiona junto con los tests y solo cambia con --actualizar-duraciones.
+RUTA_DURACIONES = Path(__file__).resolve().parent / "test" / "duraciones.json"
+# Historial local de duraciones: lo actualiza cada ejecución y solo se usa para ordenar
+RUTA_HISTORIAL_DURACIONES = Path(__file__).resolve().parent / ".metricas" / "duraciones.json"
+# Ejecuciones exitosas que se conservan por test; la estimación es su mediana
+HISTORIAL_DURACIONES = 5
+# Estimación para un test sin historial cuando no hay ningún otro dato
+DURACION_POR_DEFECTO = 60.0
+
+# Resúmenes de ejecuciones anteriores (core.resultados); de ahí salen los tests que fallaron hace poco
+DIR_METRICAS = Path(__file__).resolve().parent / ".metricas"
+# Ejecuciones anteriores que se revisan al ordenar
+HISTORIAL_FALLOS = 5
+
+# Pruebas rápidas de las que dependen todas las demás: se ejecutan primero y,
+# con --fail-fast, si una falla el resto se cancela en lugar de agotar su timeout
+CRITICOS = [
+    "test/test_login.py",
+]
+
+# Serializa la escritura en consola cuando varios tests imprimen a la vez
+_lock_salida = threading.Lock()
 
 
 # Configuración de tests
@@ -94,10 +149,150 @@ def list_tests():
     print("=" * 70)
 
 
-def run_test(test_path: str) -> bool:
+# ---------------------------------------------------------------------------
+# Duraciones y shards
+# ---------------------------------------------------------------------------
+def leer_duraciones(ruta: Path = RUTA_DURACIONES) -> Dict[str, List[float]]:
+    """Últimas duraciones (segundos) de cada test que pasó, de la más antigua a la más reciente."""
+    try:
+        return json.loads(ruta.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"⚠ No se pudo leer {ruta}: {e}")
+        return {}
+
+
+def guardar_duraciones(nuevas: Dict[str, float], ruta: Path = RUTA_HISTORIAL_DURACIONES) -> None:
+    """Agrega las duraciones de esta ejecución al historial de cada test."""
+    if not nuevas:
+        return
+    duraciones = leer_duraciones(ruta)
+    for test, segundos in nuevas.items():
+        duraciones[test] = (duraciones.get(test, []) + [round(segundos, 2)])[-HISTORIAL_DURACIONES:]
+    try:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        # Escritura atómica: dos ejecuciones en la misma máquina no dejan el archivo a medias
+        temporal = ruta.with_name(f"{ruta.name}.{os.getpid()}.tmp")
+        temporal.write_text(json.dumps(duraciones, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(temporal, ruta)
+    except OSError as e:
+        print(f"⚠ No se pudieron guardar las duraciones en {ruta}: {e}")
+
+
+def estimar_duraciones(tests: List[str], duraciones: Dict[str, List[float]]) -> Dict[str, float]:
+    """Duración esperada de cada test; los que no tienen historial reciben la mediana de los demás."""
+    conocidas = {t: statistics.median(duraciones[t]) for t in tests if duraciones.get(t)}
+    por_defecto = statistics.median(conocidas.values()) if conocidas else DURACION_POR_DEFECTO
+    return {t: conocidas.get(t, por_defecto) for t in tests}
+
+
+def parse_shard(valor: str):
+    """'2/4' -> (2, 4)."""
+    try:
+        indice, total = (int(parte) for parte in valor.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"formato esperado i/N, no {valor!r}")
+    if not 1 <= indice <= total:
+        raise argparse.ArgumentTypeError(f"se requiere 1 <= i <= N, no {valor!r}")
+    return indice, total
+
+
+def repartir_en_shards(tests: List[str], total: int, estimadas: Dict[str, float]) -> List[List[str]]:
+    """
+    Reparte los tests en `total` partes de duración parecida: del más largo al más corto,
+    cada test va a la parte con menos tiempo acumulado. Es determinista, así que cada máquina
+    calcula el mismo reparto por su cuenta a partir del mismo archivo de duraciones.
+    Cada parte conserva el orden original de los tests.
+    """
+    cargas = [0.0] * total
+    asignados = [set() for _ in range(total)]
+    for test in sorted(tests, key=lambda t: (-estimadas[t], t)):
+        destino = min(range(total), key=lambda i: (cargas[i], i))
+        cargas[destino] += estimadas[test]
+        asignados[destino].add(test)
+    return [[t for t in tests if t in grupo] for grupo in asignados]
+
+
+# ---------------------------------------------------------------------------
+# Orden de ejecución
+# ---------------------------------------------------------------------------
+def fallos_recientes(directorio: Path = DIR_METRICAS, ejecuciones: int = HISTORIAL_FALLOS) -> Dict[str, int]:
+    """
+    Tests que fallaron en las últimas `ejecuciones`, con la antigüedad de su último fallo
+    (0 = la ejecución más reciente).
+    """
+    resumenes = sorted(directorio.glob("*.resultados.json"), key=lambda r: r.stat().st_mtime, reverse=True)
+    fallos = {}
+    for antiguedad, ruta in enumerate(resumenes[:ejecuciones]):
+        try:
+            resumen = json.loads(ruta.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"⚠ No se pudo leer {ruta}: {e}")
+            continue
+        for resultado in resumen.get("tests", []):
+            if resultado.get("estado") in ("fallo", "error"):
+                fallos.setdefault(resultado["test"], antiguedad)
+    return fallos
+
+
+def ordenar_tests(tests: List[str], estimadas: Dict[str, float], fallos: Dict[str, int]) -> List[str]:
+    """
+    Primero los críticos (login), luego los que fallaron hace poco (del fallo más reciente
+    al más antiguo) y después el resto del más largo al más corto: con varios workers los
+    flujos largos (venta) arrancan a la vez en workers distintos y los cortos rellenan al final.
+    """
+    posicion = {test: i for i, test in enumerate(tests)}
+    return sorted(tests, key=lambda t: (
+        t not in CRITICOS,
+        t not in fallos,
+        fallos.get(t, 0),
+        -estimadas[t],
+        posicion[t],
+    ))
+
+
+class Cancelacion:
+    """
+    Corte de la ejecución para --fail-fast: cancelar() mata los tests en curso
+    y los que todavía no empezaron ya no se lanzan.
+    """
+
+    def __init__(self):
+        self.motivo = None
+        self.interrumpidos = set()
+        self._procesos = {}
+        self._lock = threading.Lock()
+
+    def cancelada(self) -> bool:
+        return self.motivo is not None
+
+    def registrar(self, test: str, proceso) -> bool:
+        """Anota un test en curso. Retorna False si la ejecución ya se canceló."""
+        with self._lock:
+            if self.cancelada():
+                return False
+            self._procesos[test] = proceso
+            return True
+
+    def liberar(self, test: str) -> None:
+        with self._lock:
+            self._procesos.pop(test, None)
+
+    def cancelar(self, motivo: str) -> None:
+        with self._lock:
+            if self.cancelada():
+                return
+            self.motivo = motivo
+            for test, proceso in self._procesos.items():
+                self.interrumpidos.add(test)
+                proceso.kill()
+
+
+def run_test(test_path: str) -> Tuple[bool, Optional[str]]:
     """
     Ejecuta un test individual.
-    Retorna True si el test pasa, False si falla.
+    Retorna (True, None) si el test pasa, o (False, motivo) si falla.
     """
     print(f"\n{'=' * 70}")
     print(f"Ejecutando: {test_path}")
@@ -108,38 +303,174 @@ def run_test(test_path: str) -> bool:
             ["python", test_path],
             capture_output=False,
             text=True,
-            timeout=300  # 5 minutos máximo por test
+            timeout=TIMEOUT_TEST
         )
         
         if result.returncode == 0:
             print(f"✓ {test_path} PASÓ")
-            return True
+            return True, None
         else:
             print(f"✗ {test_path} FALLÓ (código: {result.returncode})")
-            return False
+            return False, f"código de salida {result.returncode}"
     except subprocess.TimeoutExpired:
         print(f"✗ {test_path} TIMEOUT (excedió 5 minutos)")
-        return False
+        return False, "timeout (excedió 5 minutos)"
     except Exception as e:
         print(f"✗ {test_path} ERROR: {e}")
-        return False
+        return False, f"no se pudo ejecutar: {e}"
+
 
+def _imprimir(linea: str) -> None:
+    with _lock_salida:
+        print(linea, flush=True)
 
-def run_tests(tests: List[str]):
-    """Ejecuta una lista de tests y muestra resumen."""
+
+def run_test_con_prefijo(test_path: str, cancelacion: Cancelacion = None) -> Tuple[bool, Optional[str]]:
+    """
+    Ejecuta un test individual en modo paralelo.
+    La salida del test se transmite línea a línea con el nombre del test como prefijo,
+    para que la salida de varios tests simultáneos siga siendo legible.
+    Si se indica `cancelacion`, el proceso queda registrado para que pueda cortarse.
+    Retorna (True, None) si el test pasa, o (False, motivo) si falla.
+    """
+    prefijo = f"[{Path(test_path).stem}]"
+    _imprimir(f"{prefijo} ▶ Iniciando {test_path}")
+
+    # Sin buffer para que la salida llegue mientras el test avanza
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+
+    try:
+        proceso = subprocess.Popen(
+            ["python", test_path],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            env=env,
+        )
+    except Exception as e:
+        _imprimir(f"{prefijo} ✗ {test_path} ERROR: {e}")
+        return False, f"no se pudo ejecutar: {e}"
+
+    if cancelacion is not None and not cancelacion.registrar(test_path, proceso):
+        proceso.kill()
+        proceso.wait()
+        return False, f"cancelado: {cancelacion.motivo}"
+
+    vencido = threading.Event()
+
+    def _matar_por_timeout():
+        vencido.set()
+        proceso.kill()
+
+    temporizador = threading.Timer(TIMEOUT_TEST, _matar_por_timeout)
+    temporizador.start()
+    try:
+        for linea in proceso.stdout:
+            _imprimir(f"{prefijo} {linea.rstrip()}")
+        proceso.wait()
+    finally:
+        temporizador.cancel()
+        if cancelacion is not None:
+            cancelacion.liberar(test_path)
+
+    if cancelacion is not None and test_path in cancelacion.interrumpidos:
+        _imprimir(f"{prefijo} ⊘ {test_path} CANCELADO")
+        return False, f"cancelado: {cancelacion.motivo}"
+    if vencido.is_set():
+        _imprimir(f"{prefijo} ✗ {test_path} TIMEOUT (excedió 5 minutos)")
+        return False, "timeout (excedió 5 minutos)"
+    if proceso.returncode == 0:
+        _imprimir(f"{prefijo} ✓ {test_path} PASÓ")
+        return True, None
+    _imprimir(f"{prefijo} ✗ {test_path} FALLÓ (código: {proceso.returncode})")
+    return False, f"código de salida {proceso.returncode}"
+
+
+def run_tests(tests: List[str], workers: int = 1, ruta_duraciones: Path = RUTA_HISTORIAL_DURACIONES,
+              ruta_json: Path = None, ruta_junit: Path = None, fail_fast: bool = False,
+              ruta_snapshot: Path = None):
+    """
+    Ejecuta una lista de tests y muestra resumen.
+    Con workers > 1 los tests se ejecutan simultáneamente, cada uno en su propio proceso.
+    Con fail_fast los tests CRITICOS se ejecutan antes que el resto; si uno falla, se
+    cortan los que estén en curso y los demás se marcan como omitidos sin lanzarlos.
+    La duración de los tests que pasan se agrega al historial local de ruta_duraciones
+    (y al archivo versionado ruta_snapshot, si se indica),
+    y el resultado de cada test se escribe en JSON y JUnit XML (ver core.resultados).
+    """
     total = len(tests)
     passed = 0
     failed = 0
+    omitted = 0
     
     print("\n" + "=" * 70)
-    print(f"EJECUTANDO {total} TESTS")
+    if workers > 1:
+        print(f"EJECUTANDO {total} TESTS ({workers} en paralelo)")
+    else:
+        print(f"EJECUTANDO {total} TESTS")
     print("=" * 70)
     
+    # True (pasó), False (falló) o None (omitido por --fail-fast)
     results = {}
-    for test in tests:
-        success = run_test(test)
-        results[test] = success
+    duraciones = {}
+    inicio_ejecucion = time.perf_counter()
+    # Lo que ve el runner de cada subproceso; cubre los tests que no alcanzan a reportar su resultado
+    observados = {}
+    cancelacion = Cancelacion()
+
+    def _cronometrar(ejecutar, test: str) -> Optional[bool]:
+        if cancelacion.cancelada():
+            observados[test] = {"ok": False, "omitido": True, "motivo": f"omitido: {cancelacion.motivo}",
+                                "duracion_s": 0.0, "inicio": None}
+            return None
+        inicio = time.time()
+        inicio_perf = time.perf_counter()
+        success, motivo = ejecutar(test)
+        duracion = time.perf_counter() - inicio_perf
+        omitido = test in cancelacion.interrumpidos
+        observados[test] = {"ok": success, "omitido": omitido, "motivo": motivo, "duracion_s": duracion, "inicio": inicio}
+        if omitido:
+            return None
+        # Un test que falla puede cortar antes de tiempo: no sirve para estimar su duración
         if success:
+            duraciones[test] = duracion
+        elif fail_fast and test in CRITICOS:
+            cancelacion.cancelar(f"falló {test}")
+        return success
+
+    # Con fail_fast los críticos forman una primera etapa: el resto no arranca hasta que pasen
+    etapas = [tests]
+    if fail_fast:
+        etapas = [[t for t in tests if t in CRITICOS], [t for t in tests if t not in CRITICOS]]
+
+    for etapa in etapas:
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                exitos = pool.map(lambda test: _cronometrar(lambda t: run_test_con_prefijo(t, cancelacion), test), etapa)
+                for test, success in zip(etapa, exitos):
+                    results[test] = success
+        else:
+            for test in etapa:
+                results[test] = _cronometrar(run_test, test)
+    # El resumen sigue el orden de ejecución, no depende de quién terminó primero
+    results = {test: results[test] for test in tests}
+    guardar_duraciones(duraciones, ruta_duraciones)
+    if ruta_snapshot is not None:
+        guardar_duraciones(duraciones, ruta_snapshot)
+    try:
+        motivos = escribir_reportes(tests, observados, ruta_json, ruta_junit,
+                                    duracion_s=time.perf_counter() - inicio_ejecucion)
+        reportes_ok = True
+    except OSError as e:
+        # Sin reportes la ejecución no sirve para CI: cuenta como fallida aunque los tests pasen
+        print(f"✗ No se pudieron escribir los reportes de resultados: {e}")
+        motivos = {test: o["motivo"] for test, o in observados.items() if o["motivo"]}
+        reportes_ok = False
+
+    for success in results.values():
+        if success is None:
+            omitted += 1
+        elif success:
             passed += 1
         else:
             failed += 1
@@ -151,32 +482,129 @@ def run_tests(tests: List[str]):
     print(f"Total:   {total}")
     print(f"Pasaron: {passed} ✓")
     print(f"Fallaron: {failed} ✗")
+    if omitted:
+        print(f"Omitidos: {omitted} ⊘")
     print("=" * 70)
     
     if failed > 0:
         print("\nTests que fallaron:")
         for test, success in results.items():
-            if not success:
-                print(f"  ✗ {test}")
+            if success is False:
+                motivo = motivos.get(test)
+                print(f"  ✗ {test}" + (f" — {motivo}" if motivo else ""))
+    if omitted:
+        print(f"\nTests omitidos ({cancelacion.motivo}):")
+        for test, success in results.items():
+            if success is None:
+                print(f"  ⊘ {test}")
     
     print("=" * 70)
     
-    return failed == 0
+    return failed == 0 and omitted == 0 and reportes_ok
+
+
+def escribir_reportes(tests: List[str], observados: Dict[str, dict],
+                      ruta_json: Path = None, ruta_junit: Path = None,
+                      duracion_s: float = None) -> Dict[str, str]:
+    """
+    Escribe los reportes JSON y JUnit de la ejecución y la guarda en el historial SQLite.
+    Retorna el motivo de falla de cada test; si no se pudo escribir algún reporte, lanza la excepción.
+    """
+    # core.resultados y core.almacen solo usan la biblioteca estándar
+    from core.almacen import guardar_ejecucion
+    from core.resultados import escribir_reportes as escribir
+
+    resultados = escribir(os.environ[ENV_RUN_ID], tests, observados, ruta_json, ruta_junit)
+    # Historial SQLite (core.almacen): la ejecución y sus tests en una sola transacción
+    guardar_ejecucion(os.environ[ENV_RUN_ID], resultados, duracion_s)
+    return {r["test"]: r["motivo"] for r in resultados if r["motivo"]}
+
+
+def run_tests_con_navegador_compartido(tests: List[str], workers: int = 1, **opciones):
+    """
+    Lanza un Chromium compartido, publica su endpoint a los tests mediante
+    una variable de entorno y ejecuta la lista de tests sobre él.
+    """
+    # Import diferido: --list y la ejecución normal no requieren Playwright en este proceso
+    from core.browser import ENV_BROWSER_ENDPOINT, lanzar_navegador_compartido
+
+    playwright, browser, endpoint = lanzar_navegador_compartido()
+    print(f"Navegador compartido escuchando en {endpoint}")
+    os.environ[ENV_BROWSER_ENDPOINT] = endpoint
+    try:
+        return run_tests(tests, workers=workers, **opciones)
+    finally:
+        os.environ.pop(ENV_BROWSER_ENDPOINT, None)
+        browser.close()
+        playwright.stop()
+
+
+def imprimir_rendimiento(run_id: str, red: bool = False) -> None:
+    """Imprime las Web Vitals por ruta y, si se grabó, el tráfico por endpoint de esta ejecución."""
+    from core.red import imprimir_red
+    from core.vitales import imprimir_vitales
+
+    imprimir_vitales(run_id)
+    if red:
+        imprimir_red(run_id)
+
+
+def parse_args():
+    """Interpreta los argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Ejecuta los tests de automatización.")
+    parser.add_argument("categoria", nargs="?", help="Entidad o categoría de tests a ejecutar")
+    parser.add_argument("--list", action="store_true", help="Lista todos los tests disponibles")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Cantidad de tests a ejecutar en paralelo (por defecto 1)")
+    parser.add_argument("--browser-server", action="store_true",
+                        help="Lanza Chromium una sola vez; cada test abre su propio contexto sobre él")
+    parser.add_argument("--red", action="store_true",
+                        help="Graba las peticiones XHR/fetch y muestra llamadas, p95 y bytes por endpoint")
+    parser.add_argument("--har", choices=["grabar", "reproducir"],
+                        help="Graba las respuestas del backend o ejecuta los tests contra la grabación")
+    parser.add_argument("--shard", type=parse_shard, metavar="i/N",
+                        help="Ejecuta solo la parte i de N (1..N), balanceadas por la duración registrada de cada test")
+    parser.add_argument("--orden", choices=["historial", "original"], default="historial",
+                        help="historial (por defecto): críticos, fallidos recientes y luego los más largos; "
+                             "original: el orden de la lista")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help=f"Ejecuta primero {', '.join(Path(t).name for t in CRITICOS)}; si falla, cancela el resto")
+    parser.add_argument("--duraciones", type=Path, default=RUTA_DURACIONES,
+                        help="Duraciones versionadas con las que --shard reparte (por defecto test/duraciones.json)")
+    parser.add_argument("--actualizar-duraciones", action="store_true",
+                        help="Agrega las duraciones de esta ejecución al archivo de --duraciones")
+    parser.add_argument("--json", type=Path, dest="ruta_json",
+                        help="Ruta del resumen JSON (por defecto .metricas/<run>.resultados.json)")
+    parser.add_argument("--junit", type=Path, dest="ruta_junit",
+                        help="Ruta del reporte JUnit XML (por defecto .metricas/<run>.junit.xml)")
+    parser.add_argument("--filtro", choices=["crud-only", "full-fidelity"],
+                        help="Peticiones que bloquea el navegador (por defecto full-fidelity: ninguna)")
+    # core.stub solo usa la biblioteca estándar; no requiere Playwright en este proceso
+    from core.stub import agregar_argumentos
+    agregar_argumentos(parser)
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers debe ser mayor o igual a 1")
+    if not args.stub and (args.latencia or args.falla):
+        parser.error("--latencia y --falla requieren --stub")
+    return args
 
 
 def main():
     """Función principal."""
-    if len(sys.argv) > 1 and sys.argv[1] == "--list":
+    args = parse_args()
+
+    if args.list:
         list_tests()
         return
     
     # Determinar qué tests ejecutar
-    if len(sys.argv) == 1:
+    if args.categoria is None:
         # Ejecutar todos los tests
         tests_to_run = get_all_tests()
         print("Ejecutando TODOS los tests...")
     else:
-        category = sys.argv[1].lower()
+        category = args.categoria.lower()
         
         # Buscar en entidades
         if category in TESTS:
@@ -191,9 +619,64 @@ def main():
             print("Usa --list para ver las categorías disponibles")
             sys.exit(1)
     
+    # El reparto en shards solo usa el archivo versionado, igual en todas las máquinas;
+    # para ordenar pesa más el historial local, si lo hay
+    versionadas = leer_duraciones(args.duraciones)
+    estimadas = estimar_duraciones(tests_to_run, versionadas)
+    if args.shard:
+        indice, total_shards = args.shard
+        sin_medir = [t for t in tests_to_run if not versionadas.get(t)]
+        if sin_medir:
+            # Sin duraciones versionadas todos pesan lo mismo y el reparto queda por cantidad de tests
+            print(f"⚠ {len(sin_medir)} de {len(tests_to_run)} tests sin duración en {args.duraciones}; "
+                  "el reparto no está balanceado. Ejecuta la suite con --actualizar-duraciones "
+                  "contra la app y versiona el archivo.")
+        tests_to_run = repartir_en_shards(tests_to_run, total_shards, estimadas)[indice - 1]
+        print(f"Shard {indice}/{total_shards}: {len(tests_to_run)} tests, "
+              f"~{sum(estimadas[t] for t in tests_to_run):.0f}s estimados de {sum(estimadas.values()):.0f}s")
+        if not tests_to_run:
+            print("Este shard no tiene tests asignados")
+            return
+
+    if args.orden == "historial":
+        fallos = fallos_recientes()
+        locales = {**versionadas, **leer_duraciones(RUTA_HISTORIAL_DURACIONES)}
+        tests_to_run = ordenar_tests(tests_to_run, estimar_duraciones(tests_to_run, locales), fallos)
+        primeros = [t for t in tests_to_run if t in CRITICOS or t in fallos]
+        if primeros:
+            print(f"Primero: {', '.join(Path(t).stem for t in primeros)}")
+
+    run_id = os.environ.setdefault(ENV_RUN_ID, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+    if args.red:
+        os.environ[ENV_RED] = "1"
+    if args.har:
+        os.environ[ENV_HAR] = args.har
+    if args.filtro:
+        os.environ[ENV_FILTRO] = args.filtro
+
+    from core.stub import servidor_desde_args
+    try:
+        stub = servidor_desde_args(args)
+    except (OSError, ValueError) as e:
+        print(f"✗ No se pudo iniciar el stub: {e}")
+        sys.exit(1)
+    if stub is not None:
+        print(f"Backend stub escuchando en {stub.url}")
+
     # Ejecutar tests
-    success = run_tests(tests_to_run)
-    
+    opciones = {"ruta_json": args.ruta_json, "ruta_junit": args.ruta_junit, "fail_fast": args.fail_fast,
+                "ruta_snapshot": args.duraciones if args.actualizar_duraciones else None}
+    try:
+        if args.browser_server:
+            success = run_tests_con_navegador_compartido(tests_to_run, workers=args.workers, **opciones)
+        else:
+            success = run_tests(tests_to_run, workers=args.workers, **opciones)
+    finally:
+        if stub is not None:
+            stub.detener()
+
+    imprimir_rendimiento(run_id, red=args.red)
+    print(f"Métricas por paso: .metricas/{run_id}.jsonl | Historial: .metricas/historial.db")
     sys.exit(0 if success else 1)
 
 
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Extracción completa de las tablas de la app (producto, cliente, lista-ventas, movimientos).
+
+Recorre todas las páginas de la tabla elegida y escribe las filas a CSV o JSONL a medida que
+las lee: en memoria solo está la página actual, así que un catálogo de decenas de miles de
+productos ocupa lo mismo que uno de diez. Después de cada página se guarda un checkpoint
+(<salida>.checkpoint.json) con la página siguiente y el tamaño del archivo; con --reanudar
+se recorta la salida a ese tamaño, se salta a esa página y se sigue agregando, sin filas
+repetidas ni perdidas.
+
+producto, cliente y lista-ventas paginan en el backend. movimientos es una sola página:
+muestra todos los movimientos de la fecha filtrada (--fecha, por defecto la del día).
+
+Con --incremental (producto, cliente) no se abre el navegador: se pone al día una copia SQLite
+(.scrape/snapshot.db) contra la API y solo se recorre el catálogo si el backend avisa cambios
+(core.snapshot).
+
+Uso:
+    python scrape.py producto                              # .scrape/producto.csv
+    python scrape.py cliente --formato jsonl               # .scrape/cliente.jsonl
+    python scrape.py producto --reanudar                   # Sigue desde el último checkpoint
+    python scrape.py movimientos --fecha 2024-05-01        # Filtra la tabla por fecha
+    python scrape.py producto --salida auditoria.csv --max-paginas 50 --headless
+    python scrape.py producto --incremental                # Sincroniza .scrape/snapshot.db
+    python scrape.py cliente --incremental --completo      # Recorre aunque no haya avisos
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypedDict
+
+from actions.cliente_actions import navegar_a_clientes
+from actions.producto_actions import navegar_a_productos
+from actions.venta_actions import navegar_a_lista_ventas
+from core.api import ApiBackend
+from core.browser import get_page
+from core.esperas import esperar_angular_estable
+from core.login import login
+from core.snapshot import ENTIDADES, Snapshot, sincronizar
+from core.tablas import MAX_PAGINAS, TABLAS, ir_a_pagina, paginas, tabla
+from core.vitales import medir_ruta
+
+DIR_SALIDA = Path(__file__).resolve().parent / ".scrape"
+RUTA_SNAPSHOT = DIR_SALIDA / "snapshot.db"
+FORMATOS = ("csv", "jsonl")
+
+
+class Checkpoint(TypedDict):
+    """Progreso de una extracción: lo escrito en la salida hasta la página `pagina` (excluida)."""
+    pantalla: str
+    pagina: int  # siguiente página a leer, desde 0
+    filas: int
+    bytes: int  # tamaño de la salida al terminar la última página completa
+
+
+# -------------------------------------------------------------------
+# Navegación
+# -------------------------------------------------------------------
+def navegar_a_movimientos(page) -> None:
+    """Navega a los movimientos de caja desde cualquier pantalla."""
+    with medir_ruta(page, "/app/movimientos"):
+        page.click("a.sidebar-link[routerlink='/app/movimientos']")
+        page.wait_for_url("**/app/movimientos", timeout=60000)
+        page.wait_for_selector("app-movimientos", timeout=10000)
+
+
+# pantalla -> (navegación, campo de filtro por fecha o None)
+PANTALLAS: Dict[str, Tuple[Callable, Optional[str]]] = {
+    "producto": (navegar_a_productos, None),
+    "cliente": (navegar_a_clientes, None),
+    "lista-ventas": (navegar_a_lista_ventas, "app-lista-ventas #dateInput"),
+    "movimientos": (navegar_a_movimientos, "app-movimientos #fechaFiltro"),
+}
+
+
+# -------------------------------------------------------------------
+# Extracción
+# -------------------------------------------------------------------
+def abrir_tabla(page, pantalla: str, fecha: str = None) -> None:
+    """Navega a la pantalla, aplica el filtro de fecha y espera a que la tabla termine de cargar."""
+    navegar, campo_fecha = PANTALLAS[pantalla]
+    navegar(page)
+    if fecha:
+        if campo_fecha is None:
+            raise ValueError(f"La pantalla {pantalla} no tiene filtro por fecha")
+        # input type=date: fill con yyyy-MM-dd dispara input/change y Angular vuelve a consultar
+        page.fill(campo_fecha, fecha)
+    page.wait_for_selector(tabla(pantalla)["selector"], timeout=10000)
+    esperar_angular_estable(page)
+
+
+def extraer(page, pantalla: str, desde: int = 0, max_paginas: int = MAX_PAGINAS) -> Iterator[Tuple[int, List[dict]]]:
+    """
+    Genera (número de página, filas) desde la página `desde` hasta la última, con la tabla ya abierta.
+    Si la tabla tiene menos páginas que `desde` no genera nada.
+    """
+    if desde and ir_a_pagina(page, pantalla, desde) != desde:
+        return
+    yield from paginas(page, pantalla, max_paginas)
+
+
+def filas(page, pantalla: str, desde: int = 0, max_paginas: int = MAX_PAGINAS) -> Iterator[dict]:
+    """Las filas de extraer(), una por una."""
+    for _, pagina in extraer(page, pantalla, desde, max_paginas):
+        yield from pagina
+
+
+# -------------------------------------------------------------------
+# Salida y checkpoint
+# -------------------------------------------------------------------
+class Salida:
+    """Archivo CSV o JSONL al que se agregan páginas; cada página queda en disco antes del checkpoint."""
+
+    def __init__(self, ruta: Path, formato: str, columnas: Tuple[str, ...], desde_bytes: int = 0):
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        modo = "r+" if desde_bytes and ruta.exists() else "w"
+        self.ruta = ruta
+        self.formato = formato
+        self.archivo = ruta.open(modo, encoding="utf-8", newline="")
+        if modo == "r+":
+            # Descarta lo escrito después del último checkpoint (una página a medias)
+            self.archivo.truncate(desde_bytes)
+            self.archivo.seek(desde_bytes)
+        self.csv = None
+        if formato == "csv":
+            self.csv = csv.DictWriter(self.archivo, fieldnames=columnas, extrasaction="ignore")
+            if modo == "w":
+                self.csv.writeheader()
+
+    def escribir(self, pagina: List[dict]) -> int:
+        """Agrega las filas de una página y retorna el tamaño del archivo con ellas ya en disco."""
+        if self.csv is not None:
+            self.csv.writerows(pagina)
+        else:
+            for fila in pagina:
+                self.archivo.write(json.dumps(fila, ensure_ascii=False) + "\n")
+        self.archivo.flush()
+        os.fsync(self.archivo.fileno())
+        return self.archivo.tell()
+
+    def cerrar(self) -> None:
+        self.archivo.close()
+
+
+def ruta_checkpoint(salida: Path) -> Path:
+    return salida.with_name(salida.name + ".checkpoint.json")
+
+
+def leer_checkpoint(salida: Path, pantalla: str) -> Optional[Checkpoint]:
+    ruta = ruta_checkpoint(salida)
+    if not ruta.exists() or not salida.exists():
+        return None
+    try:
+        checkpoint = json.loads(ruta.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"⚠ Checkpoint ilegible ({e}); se empieza de cero")
+        return None
+    if checkpoint.get("pantalla") != pantalla:
+        print(f"⚠ El checkpoint es de {checkpoint.get('pantalla')}, no de {pantalla}; se empieza de cero")
+        return None
+    if checkpoint["bytes"] > salida.stat().st_size:
+        print("⚠ La salida es más corta que el checkpoint; se empieza de cero")
+        return None
+    return checkpoint
+
+
+def guardar_checkpoint(salida: Path, checkpoint: Checkpoint) -> None:
+    """Escritura atómica: un corte a mitad de escritura deja el checkpoint anterior intacto."""
+    ruta = ruta_checkpoint(salida)
+    temporal = ruta.with_name(ruta.name + ".tmp")
+    temporal.write_text(json.dumps(checkpoint), encoding="utf-8")
+    os.replace(temporal, ruta)
+
+
+# -------------------------------------------------------------------
+# Sincronización incremental
+# -------------------------------------------------------------------
+def sincronizar_snapshot(pantalla: str, ruta: Path, completo: bool) -> None:
+    """Pone al día la copia SQLite de la pantalla contra la API, sin navegador."""
+    api = ApiBackend()
+    try:
+        with Snapshot(ruta) as snapshot:
+            resumen = sincronizar(api, snapshot, pantalla, completo=completo)
+    finally:
+        api.close()
+    if not resumen["recorrido"]:
+        print(f"✓ {pantalla}: sin cambios ({resumen['total']} registros en {ruta})")
+        return
+    print(f"✓ {pantalla}: {resumen['paginas']} páginas, {resumen['nuevos']} nuevos, "
+          f"{resumen['modificados']} modificados, {resumen['eliminados']} eliminados "
+          f"({resumen['total']} registros en {ruta})")
+    if resumen["inestable"]:
+        print(f"⚠ {pantalla}: el catálogo cambió durante el recorrido; las bajas quedan para la próxima sincronización")
+
+
+# -------------------------------------------------------------------
+# Main
+# -------------------------------------------------------------------
+def parse_args():
+    """Interpreta los argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Extrae todas las filas de una tabla de la app a CSV o JSONL.")
+    parser.add_argument("pantalla", choices=list(PANTALLAS), help="Tabla a extraer")
+    parser.add_argument("--formato", choices=FORMATOS, default="csv", help="Formato de salida (por defecto csv)")
+    parser.add_argument("--salida", type=Path, help="Archivo de salida (por defecto .scrape/<pantalla>.<formato>)")
+    parser.add_argument("--reanudar", action="store_true", help="Seguir desde el checkpoint de la salida")
+    parser.add_argument("--fecha", help="Filtrar por fecha yyyy-MM-dd (lista-ventas, movimientos)")
+    parser.add_argument("--max-paginas", type=int, default=MAX_PAGINAS,
+                        help=f"Páginas a leer como máximo en esta ejecución (por defecto {MAX_PAGINAS})")
+    parser.add_argument("--headless", action="store_true", help="Ejecutar sin mostrar el navegador")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Sincronizar la copia SQLite por API en lugar de escribir CSV/JSONL (producto, cliente)")
+    parser.add_argument("--snapshot", type=Path, default=RUTA_SNAPSHOT,
+                        help="Base SQLite de --incremental (por defecto .scrape/snapshot.db)")
+    parser.add_argument("--completo", action="store_true",
+                        help="Con --incremental, recorrer el catálogo aunque el backend no avise cambios")
+    args = parser.parse_args()
+    if args.incremental and args.pantalla not in ENTIDADES:
+        parser.error(f"--incremental solo está disponible para {', '.join(ENTIDADES)}")
+    if args.fecha and PANTALLAS[args.pantalla][1] is None:
+        parser.error(f"{args.pantalla} no tiene filtro por fecha")
+    if args.max_paginas < 1:
+        parser.error("--max-paginas debe ser al menos 1")
+    args.salida = args.salida or DIR_SALIDA / f"{args.pantalla}.{args.formato}"
+    return args
+
+
+def main():
+    """Función principal."""
+    args = parse_args()
+    if args.incremental:
+        try:
+            sincronizar_snapshot(args.pantalla, args.snapshot, args.completo)
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            sys.exit(1)
+        return
+
+    checkpoint = leer_checkpoint(args.salida, args.pantalla) if args.reanudar else None
+    if checkpoint is None:
+        checkpoint = {"pantalla": args.pantalla, "pagina": 0, "filas": 0, "bytes": 0}
+    else:
+        print(f"→ Reanudando {args.pantalla} desde la página {checkpoint['pagina'] + 1} "
+              f"({checkpoint['filas']} filas ya escritas)")
+
+    # Solo hacen falta las tablas: sin imágenes, fuentes ni analítica
+    playwright, browser, context, page = get_page(headless=args.headless, filtro="crud-only")
+    salida = Salida(args.salida, args.formato, TABLAS[args.pantalla]["columnas"], checkpoint["bytes"])
+    try:
+        login(page)
+        abrir_tabla(page, args.pantalla, args.fecha)
+        for numero, pagina in extraer(page, args.pantalla, checkpoint["pagina"], args.max_paginas):
+            checkpoint["bytes"] = salida.escribir(pagina)
+            checkpoint["pagina"] = numero + 1
+            checkpoint["filas"] += len(pagina)
+            guardar_checkpoint(args.salida, checkpoint)
+            print(f"  página {numero + 1}: {len(pagina)} filas ({checkpoint['filas']} en total)")
+    except KeyboardInterrupt:
+        print(f"\n⚠ Interrumpido; continúa con --reanudar desde la página {checkpoint['pagina'] + 1}")
+        sys.exit(130)
+    finally:
+        salida.cerrar()
+        browser.close()
+        playwright.stop()
+
+    print(f"✓ {checkpoint['filas']} filas de {args.pantalla} en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
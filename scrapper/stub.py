@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Levanta el backend local en memoria de core.stub.
+
+Uso:
+    python stub.py                                              # Escucha en el puerto de API_URL (.env)
+    python stub.py --puerto 8090 --latencia "POST /venta/guardar=800"
+    python stub.py --falla "DELETE /productos/eliminar=500" --falla "/venta/guardar=503@0.2"
+
+Con el stub en otro puerto, los tests lo usan con SCRAPPER_STUB=http://127.0.0.1:<puerto>.
+La configuración se puede cambiar con el servidor en marcha:
+    curl -X PUT localhost:8090/__stub/config -d '{"latencias": {"/productos/todos": "1000"}}'
+"""
+
+import argparse
+import sys
+from urllib.parse import urlparse
+
+from core.stub import ENV_STUB, ServidorStub, agregar_opciones_config, parsear_pares
+
+
+def puerto_de_api_url() -> int:
+    """Puerto de API_URL: escuchando ahí la app Angular usa el stub sin desviar peticiones."""
+    from core.api import load_api_url
+
+    try:
+        return urlparse(load_api_url()).port or 80
+    except RuntimeError:
+        return 8086
+
+
+def parse_args():
+    """Interpreta los argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Backend local en memoria para los flujos del scrapper.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, help="Puerto (por defecto el de API_URL)")
+    agregar_opciones_config(parser)
+    parser.add_argument("--verbose", action="store_true", help="Muestra cada petición atendida")
+    return parser.parse_args()
+
+
+def main():
+    """Función principal."""
+    args = parse_args()
+    try:
+        servidor = ServidorStub(
+            host=args.host,
+            puerto=args.puerto if args.puerto is not None else puerto_de_api_url(),
+            latencias=parsear_pares(args.latencia),
+            fallas=parsear_pares(args.falla),
+            verbose=args.verbose,
+        )
+    except (OSError, ValueError) as e:
+        print(f"✗ No se pudo iniciar el stub: {e}")
+        sys.exit(1)
+
+    print(f"✓ Stub escuchando en {servidor.url}")
+    print(f"  Para desviar la app y ApiBackend: {ENV_STUB}={servidor.url}")
+    for clave, valor in servidor.config.como_dict()["latencias"].items():
+        print(f"  Latencia {clave}: {valor} ms")
+    for clave, valor in servidor.config.como_dict()["fallas"].items():
+        print(f"  Falla {clave}: {valor}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStub detenido")
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Crea un cliente con datos aleatorios y valida su creación.
 
 from core.browser import get_page
 from core.login import login
+from core.resultados import ejecutar_test, fallar
 from actions.cliente_actions import crear_cliente, validar_cliente_existe
 
 
@@ -48,7 +49,8 @@ def main():
         login(page)
         
         # Ejecutar creación
-        ejecutar_crear_cliente(page)
+        if ejecutar_crear_cliente(page) is None:
+            fallar("El cliente creado no aparece en la lista")
 
     finally:
         context.close()
@@ -57,5 +59,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    ejecutar_test(main)
 
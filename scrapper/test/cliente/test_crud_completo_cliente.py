@@ -6,6 +6,7 @@ Encadena los scripts individuales llamando a sus funciones específicas.
 
 from core.browser import get_page
 from core.login import login
+from core.resultados import ejecutar_test, fallar
 
 # Importar funciones específicas de cada test
 from test.cliente.test_crear_cliente import ejecutar_crear_cliente
@@ -28,22 +29,19 @@ def main():
         print("→ [CREATE] Creando cliente...")
         cliente = ejecutar_crear_cliente(page)
         if not cliente:
-            print("✗ Error en CREATE - abortando flujo CRUD")
-            return
+            fallar("Error en CREATE - abortando flujo CRUD")
 
         # UPDATE: Llamar al script de editar
         print("\n→ [UPDATE] Editando cliente...")
         cliente_editado = ejecutar_editar_cliente(page, cliente)
         if not cliente_editado:
-            print("✗ Error en UPDATE - abortando flujo CRUD")
-            return
+            fallar("Error en UPDATE - abortando flujo CRUD")
 
         # DELETE: Llamar al script de eliminar
         print("\n→ [DELETE] Eliminando cliente...")
         eliminado = ejecutar_eliminar_cliente(page, cliente_editado)
         if not eliminado:
-            print("✗ Error en DELETE - flujo CRUD incompleto")
-            return
+            fallar("Error en DELETE - flujo CRUD incompleto")
 
         print("\n" + "="*60)
         print("✓ FLUJO CRUD COMPLETO FUNCIONÓ CORRECTAMENTE")
@@ -61,4 +59,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    ejecutar_test(main)
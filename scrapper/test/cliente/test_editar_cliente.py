@@ -5,9 +5,11 @@ Edita un cliente existente y valida los cambios.
 """
 
 from core.browser import get_page
+from core.api import ApiBackend
 from core.login import login
+from core.resultados import ejecutar_test, fallar
+from actions.seed_actions import sembrar_cliente
 from actions.cliente_actions import (
-    crear_cliente,
     validar_cliente_existe,
     editar_cliente
 )
@@ -47,24 +49,30 @@ def main():
     Este test es independiente: crea el cliente antes de editarlo.
     """
     playwright, browser, context, page = get_page(headless=False)
+    api = None
 
     try:
         # Autenticación
         login(page)
+        # Datos de precondición por API (no forman parte del flujo bajo prueba)
+        api = ApiBackend()
 
         # Paso 1: Crear cliente para luego editarlo
-        print("→ Creando cliente para prueba de edición...")
-        cliente = crear_cliente(page)
+        print("→ Creando cliente por API para prueba de edición...")
+        cliente = sembrar_cliente(api)
         print(f"✓ Cliente creado: {cliente}")
 
         # Paso 2: Ejecutar edición
-        ejecutar_editar_cliente(page, cliente)
+        if ejecutar_editar_cliente(page, cliente) is None:
+            fallar("No se encontró el cliente con los cambios")
 
     finally:
+        if api is not None:
+            api.close()
         context.close()
         browser.close()
         playwright.stop()
 
 
 if __name__ == "__main__":
-    main()
+    ejecutar_test(main)
@@ -5,9 +5,11 @@ Primero crea un cliente y luego lo elimina, validando ambas operaciones.
 """
 
 from core.browser import get_page
+from core.api import ApiBackend
 from core.login import login
+from core.resultados import ejecutar_test, fallar
+from actions.seed_actions import sembrar_cliente
 from actions.cliente_actions import (
-    crear_cliente,
     validar_cliente_existe,
     eliminar_cliente,
     validar_cliente_no_existe
@@ -20,21 +22,23 @@ def main():
     Este test es independiente: crea el cliente antes de eliminarlo.
     """
     playwright, browser, context, page = get_page(headless=False)
+    api = None
 
     try:
         # Autenticación
         login(page)
+        # Datos de precondición por API (no forman parte del flujo bajo prueba)
+        api = ApiBackend()
 
         # Paso 1: Crear cliente para luego eliminarlo
-        print("→ Creando cliente para prueba de eliminación...")
-        cliente = crear_cliente(page)
+        print("→ Creando cliente por API para prueba de eliminación...")
+        cliente = sembrar_cliente(api)
         
         # Validar que el cliente fue creado
         if validar_cliente_existe(page, cliente):
             print(f"✓ Cliente creado exitosamente: {cliente}")
         else:
-            print("✗ Error: No se pudo crear el cliente")
-            return
+            fallar("El cliente sembrado por API no aparece en la lista")
 
         # Paso 2: Eliminar el cliente
         print("→ Eliminando cliente...")
@@ -47,11 +51,15 @@ def main():
         else:
             print("✗ FALLÓ EL FLUJO ELIMINAR CLIENTE")
             print(f"✗ El cliente aún existe: {cliente}")
+            fallar(f"El cliente aún existe: {cliente['cedula']}")
 
     finally:
+        if api is not None:
+            api.close()
+        context.close()
         browser.close()
         playwright.stop()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    ejecutar_test(main)
\ No newline at end of file
@@ -6,6 +6,7 @@ Crea un producto con datos aleatorios y valida su creación.
 
 from core.browser import get_page
 from core.login import login
+from core.resultados import ejecutar_test, fallar
 from actions.producto_actions import crear_producto, validar_producto_existe
 
 
@@ -48,7 +49,8 @@ def main():
         login(page)
         
         # Ejecutar creación
-        ejecutar_crear_producto(page)
+        if ejecutar_crear_producto(page) is None:
+            fallar("El producto creado no aparece en la lista")
 
     finally:
         context.close()
@@ -57,4 +59,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    ejecutar_test(main)
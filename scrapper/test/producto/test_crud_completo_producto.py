@@ -6,6 +6,7 @@ Encadena los scripts individuales llamando a sus funciones específicas.
 
 from core.browser import get_page
 from core.login import login
+from core.resultados import ejecutar_test, fallar
 
 # Importar funciones específicas de cada test
 from test.producto.test_crear_producto import ejecutar_crear_producto
@@ -28,22 +29,19 @@ def main():
         print("→ [CREATE] Creando producto...")
         producto = ejecutar_crear_producto(page)
         if not producto:
-            print("✗ Error en CREATE - abortando flujo CRUD")
-            return
+            fallar("Error en CREATE - abortando flujo CRUD")
 
         # UPDATE: Llamar al script de editar
         print("\n→ [UPDATE] Editando producto...")
         producto_editado = ejecutar_editar_producto(page, producto)
         if not producto_editado:
-            print("✗ Error en UPDATE - abortando flujo CRUD")
-            return
+            fallar("Error en UPDATE - abortando flujo CRUD")
 
         # DELETE: Llamar al script de eliminar
         print("\n→ [DELETE] Eliminando producto...")
         eliminado = ejecutar_eliminar_producto(page, producto_editado)
         if not eliminado:
-            print("✗ Error en DELETE - flujo CRUD incompleto")
-            return
+            fallar("Error en DELETE - flujo CRUD incompleto")
 
         print("\n" + "="*60)
         print("✓ FLUJO CRUD COMPLETO FUNCIONÓ CORRECTAMENTE")
@@ -61,4 +59,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    ejecutar_test(main)
@@ -5,9 +5,11 @@ Edita un producto existente y valida los cambios.
 """
 
 from core.browser import get_page
+from core.api import ApiBackend
 from core.login import login
+from core.resultados import ejecutar_test, fallar
+from actions.seed_actions import sembrar_producto
 from actions.producto_actions import (
-    crear_producto,
     validar_producto_existe,
     editar_producto
 )
@@ -47,24 +49,30 @@ def main():
     Este test es independiente: crea el producto antes de editarlo.
     """
     playwright, browser, context, page = get_page(headless=False)
+    api = None
 
     try:
         # Autenticación
         login(page)
+        # Datos de precondición por API (no forman parte del flujo bajo prueba)
+        api = ApiBackend()
 
         # Paso 1: Crear producto para luego editarlo
-        print("→ Creando producto para prueba de edición...")
-        producto = crear_producto(page)
+        print("→ Creando producto por API para prueba de edición...")
+        producto = sembrar_producto(api)
         print(f"✓ Producto creado: {producto}")
 
         # Paso 2: Ejecutar edición
-        ejecutar_editar_producto(page, producto)
+        if ejecutar_editar_producto(page, producto) is None:
+            fallar("No se encontró el producto con los cambios")
 
     finally:
+        if api is not None:
+            api.close()
         context.close()
         browser.close()
         playwright.stop()
 
 
 if __name__ == "__main__":
-    main()
+    ejecutar_test(main)
@@ -5,9 +5,11 @@ Elimina un producto existente y valida la eliminación.
 """
 
 from core.browser import get_page
+from core.api import ApiBackend
 from core.login import login
+from core.resultados import ejecutar_test, fallar
+from actions.seed_actions import sembrar_producto
 from actions.producto_actions import (
-    crear_producto,
     validar_producto_existe,
     eliminar_producto,
     validar_producto_no_existe
@@ -47,30 +49,35 @@ def main():
     Este test es independiente: crea el producto antes de eliminarlo.
     """
     playwright, browser, context, page = get_page(headless=False)
+    api = None
 
     try:
         # Autenticación
         login(page)
+        # Datos de precondición por API (no forman parte del flujo bajo prueba)
+        api = ApiBackend()
 
         # Paso 1: Crear producto para luego eliminarlo
-        print("→ Creando producto para prueba de eliminación...")
-        producto = crear_producto(page)
+        print("→ Creando producto por API para prueba de eliminación...")
+        producto = sembrar_producto(api)
         
         # Validar que el producto fue creado
         if validar_producto_existe(page, producto):
             print(f"✓ Producto creado exitosamente: {producto}")
         else:
-            print("✗ Error: No se pudo crear el producto")
-            return
+            fallar("El producto sembrado por API no aparece en la lista")
 
         # Paso 2: Ejecutar eliminación
-        ejecutar_eliminar_producto(page, producto)
+        if not ejecutar_eliminar_producto(page, producto):
+            fallar(f"El producto aún existe: {producto['codigo']}")
 
     finally:
+        if api is not None:
+            api.close()
         context.close()
         browser.close()
         playwright.stop()
 
 
 if __name__ == "__main__":
-    main()
+    ejecutar_test(main)
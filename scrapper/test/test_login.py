@@ -1,15 +1,27 @@
 from core.browser import get_page
-from core.login import login
+from core.login import guardar_sesion, load_env, login_ui
+from core.resultados import ejecutar_test
 
 # smoke test de login
+# siempre pasa por el formulario (login() reutilizaría la sesión cacheada y no probaría la UI);
+# la sesión que obtiene se guarda para que los demás tests la reutilicen
 
-if __name__ == "__main__":
+
+def main():
     p, browser, context, page = get_page(headless=False)
+    try:
+        base_url, username, password = load_env()
+        login_ui(page, base_url, username, password)
+        guardar_sesion(context, base_url, username)
 
-    login(page)
+        print("LOGIN PASÓ CORRECTAMENTE")
 
-    print("LOGIN PASÓ CORRECTAMENTE")
+        page.wait_for_timeout(3000)
+    finally:
+        context.close()
+        browser.close()
+        p.stop()
 
-    page.wait_for_timeout(3000)
-    browser.close()
-    p.stop()
+
+if __name__ == "__main__":
+    ejecutar_test(main)
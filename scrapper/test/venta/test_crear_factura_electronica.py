@@ -5,9 +5,10 @@ Crea un cliente, un producto, y luego realiza una factura electrónica.
 """
 
 from core.browser import get_page
+from core.api import ApiBackend
 from core.login import login
-from actions.cliente_actions import crear_cliente
-from actions.producto_actions import crear_producto
+from core.resultados import ejecutar_test
+from actions.seed_actions import sembrar_cliente, sembrar_producto
 from actions.venta_actions import crear_factura_electronica
 
 
@@ -17,19 +18,22 @@ def main():
     Este test es independiente: crea el cliente y producto necesarios antes de la factura.
     """
     playwright, browser, context, page = get_page(headless=False)
+    api = None
 
     try:
         # Autenticación
         login(page)
+        # Datos de precondición por API (no forman parte del flujo bajo prueba)
+        api = ApiBackend()
 
         # Paso 1: Crear cliente para la factura
-        print("→ Creando cliente para la factura...")
-        cliente = crear_cliente(page)
+        print("→ Creando cliente por API para la factura...")
+        cliente = sembrar_cliente(api)
         print(f"✓ Cliente creado: {cliente['nombre']} - {cliente['cedula']}")
 
         # Paso 2: Crear producto para la factura
-        print("→ Creando producto para la factura...")
-        producto = crear_producto(page)
+        print("→ Creando producto por API para la factura...")
+        producto = sembrar_producto(api)
         print(f"✓ Producto creado: {producto['nombre']} - {producto['codigo']}")
 
         # Paso 3: Crear factura electrónica
@@ -49,9 +53,12 @@ def main():
         print("✓ FLUJO CREAR FACTURA ELECTRÓNICA FUNCIONÓ CORRECTAMENTE")
 
     finally:
+        if api is not None:
+            api.close()
+        context.close()
         browser.close()
         playwright.stop()
 
 
 if __name__ == "__main__":
-    main()
+    ejecutar_test(main)
@@ -5,9 +5,10 @@ Crea un cliente, un producto, y luego realiza una venta, validando todo el flujo
 """
 
 from core.browser import get_page
+from core.api import ApiBackend
 from core.login import login
-from actions.cliente_actions import crear_cliente
-from actions.producto_actions import crear_producto
+from core.resultados import ejecutar_test, fallar
+from actions.seed_actions import sembrar_cliente, sembrar_producto
 from actions.venta_actions import crear_venta, validar_venta_en_lista
 
 
@@ -17,19 +18,22 @@ def main():
     Este test es independiente: crea el cliente y producto necesarios antes de la venta.
     """
     playwright, browser, context, page = get_page(headless=False)
+    api = None
 
     try:
         # Autenticación
         login(page)
+        # Datos de precondición por API (no forman parte del flujo bajo prueba)
+        api = ApiBackend()
 
         # Paso 1: Crear cliente para la venta
-        print("→ Creando cliente para la venta...")
-        cliente = crear_cliente(page)
+        print("→ Creando cliente por API para la venta...")
+        cliente = sembrar_cliente(api)
         print(f"✓ Cliente creado: {cliente['nombre']} - {cliente['cedula']}")
 
         # Paso 2: Crear producto para la venta
-        print("→ Creando producto para la venta...")
-        producto = crear_producto(page)
+        print("→ Creando producto por API para la venta...")
+        producto = sembrar_producto(api)
         print(f"✓ Producto creado: {producto['nombre']} - {producto['codigo']}")
 
         # Paso 3: Crear venta
@@ -45,18 +49,21 @@ def main():
         print(f"✓ Venta creada - Total: ${venta['total']}")
 
         # Paso 4: Validar que la venta fue registrada
-        if validar_venta_en_lista(page, cliente["cedula"]):
+        if validar_venta_en_lista(page, cliente["cedula"], cliente["nombre"]):
             print("✓ FLUJO CREAR VENTA FUNCIONÓ CORRECTAMENTE")
             print(f"✓ Venta registrada para cliente: {cliente['cedula']}")
         else:
             print("✗ FALLÓ EL FLUJO CREAR VENTA")
             print(f"✗ No se encontró la venta en la lista")
+            fallar(f"No se encontró la venta del cliente {cliente['cedula']} en la lista")
 
     finally:
+        if api is not None:
+            api.close()
         context.close()
         browser.close()
         playwright.stop()
 
 
 if __name__ == "__main__":
-    main()
+    ejecutar_test(main)
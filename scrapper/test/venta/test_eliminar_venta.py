@@ -5,9 +5,10 @@ Crea un cliente, un producto, realiza una venta y luego la elimina.
 """
 
 from core.browser import get_page
+from core.api import ApiBackend
 from core.login import login
-from actions.cliente_actions import crear_cliente
-from actions.producto_actions import crear_producto
+from core.resultados import ejecutar_test, fallar
+from actions.seed_actions import sembrar_cliente, sembrar_producto
 from actions.venta_actions import crear_venta, validar_venta_en_lista, eliminar_venta
 
 
@@ -17,19 +18,22 @@ def main():
     Este test es independiente: crea el cliente, producto y venta antes de eliminarla.
     """
     playwright, browser, context, page = get_page(headless=False)
+    api = None
 
     try:
         # Autenticación
         login(page)
+        # Datos de precondición por API (no forman parte del flujo bajo prueba)
+        api = ApiBackend()
 
         # Paso 1: Crear cliente para la venta
-        print("→ Creando cliente para la venta...")
-        cliente = crear_cliente(page)
+        print("→ Creando cliente por API para la venta...")
+        cliente = sembrar_cliente(api)
         print(f"✓ Cliente creado: {cliente['nombre']} - {cliente['cedula']}")
 
         # Paso 2: Crear producto para la venta
-        print("→ Creando producto para la venta...")
-        producto = crear_producto(page)
+        print("→ Creando producto por API para la venta...")
+        producto = sembrar_producto(api)
         print(f"✓ Producto creado: {producto['nombre']} - {producto['codigo']}")
 
         # Paso 3: Crear venta
@@ -45,11 +49,10 @@ def main():
         print(f"✓ Venta creada - Total: ${venta['total']}")
 
         # Paso 4: Validar que la venta fue registrada
-        if validar_venta_en_lista(page, cliente["cedula"]):
+        if validar_venta_en_lista(page, cliente["cedula"], cliente["nombre"]):
             print(f"✓ Venta registrada para cliente: {cliente['cedula']}")
         else:
-            print("✗ Error: No se encontró la venta en la lista")
-            return
+            fallar("No se encontró la venta en la lista")
 
         # Paso 5: Eliminar la venta
         print("→ Eliminando venta...")
@@ -57,9 +60,12 @@ def main():
         print("✓ FLUJO ELIMINAR VENTA FUNCIONÓ CORRECTAMENTE")
 
     finally:
+        if api is not None:
+            api.close()
+        context.close()
         browser.close()
         playwright.stop()
 
 
 if __name__ == "__main__":
-    main()
+    ejecutar_test(main)